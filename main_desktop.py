@@ -27,7 +27,10 @@ from services.export_service import ExportService
 from services.git_service import GitService
 from services.llm_api_service import LlmApiService
 from services.file_service import FileService
+from services.secret_masking import MaskingExecutor
 from services.context_builder_service import ContextBuilderService
+from services.section_cache import SectionCache, CachedSection
+from services.scan_jobs import ScanJob
 
 # Définir le chemin de stockage des données persistantes
 DATA_DIR = appdirs.user_data_dir('WebAutomationDesktop', 'WebAutomationTools')
@@ -141,9 +144,13 @@ def load_service_configs():
     service_configs = {
         'file_service': CONFIG.copy(),  # FileService utilise la config globale
         'git_service': {},  # GitService utilise seulement le chemin git
-        'llm_service': {}   # LlmApiService aura sa propre config
+        'llm_service': {},  # LlmApiService aura sa propre config
+        'context_builder': {}  # Tokeniseur BPE ([Tokens]) et arbre des fichiers ([ContextTree])
     }
     
+    # Index de scan persistant, stocké à côté du cache de sélection
+    service_configs['file_service']['scan_index_dir'] = os.path.join(DATA_DIR, 'scan_index')
+    
     if os.path.exists(config_path):
         config.read(config_path, encoding='utf-8')
         
@@ -151,6 +158,45 @@ def load_service_configs():
         if 'Git' in config:
             service_configs['git_service']['executable_path'] = config.get('Git', 'executable_path', fallback='git')
         
+        # Configuration FileService
+        if 'FileService' in config:
+            service_configs['file_service']['scan_index_enabled'] = config.getboolean('FileService', 'scan_index_enabled', fallback=True)
+            service_configs['file_service']['scan_workers'] = safe_parse_config_value(config, 'FileService', 'scan_workers', int, 8)
+            service_configs['file_service']['hierarchical_gitignore'] = config.getboolean('FileService', 'hierarchical_gitignore', fallback=True)
+            service_configs['file_service']['scan_backend'] = config.get('FileService', 'scan_backend', fallback='auto')
+            service_configs['file_service']['scan_max_files'] = safe_parse_config_value(config, 'FileService', 'scan_max_files', int, 0)
+            service_configs['file_service']['scan_max_depth'] = safe_parse_config_value(config, 'FileService', 'scan_max_depth', int, 0)
+            service_configs['file_service']['scan_max_seconds'] = safe_parse_config_value(config, 'FileService', 'scan_max_seconds', float, 0.0)
+            service_configs['file_service']['scan_batch_size'] = safe_parse_config_value(config, 'FileService', 'scan_batch_size', int, 500)
+            service_configs['file_service']['read_workers'] = safe_parse_config_value(config, 'FileService', 'read_workers', int, 8)
+            service_configs['file_service']['max_read_bytes'] = safe_parse_config_value(config, 'FileService', 'max_read_bytes', int, 0)
+            service_configs['file_service']['mmap_threshold'] = safe_parse_config_value(config, 'FileService', 'mmap_threshold', int, 4194304)
+            service_configs['file_service']['max_file_bytes'] = safe_parse_config_value(config, 'FileService', 'max_file_bytes', int, 10485760)
+            service_configs['file_service']['large_file_mode'] = config.get('FileService', 'large_file_mode', fallback='excerpt')
+            service_configs['file_service']['excerpt_head_bytes'] = safe_parse_config_value(config, 'FileService', 'excerpt_head_bytes', int, 262144)
+            service_configs['file_service']['excerpt_tail_bytes'] = safe_parse_config_value(config, 'FileService', 'excerpt_tail_bytes', int, 65536)
+            service_configs['file_service']['watch_enabled'] = config.getboolean('FileService', 'watch_enabled', fallback=False)
+            service_configs['file_service']['watch_backend'] = config.get('FileService', 'watch_backend', fallback='auto')
+            service_configs['file_service']['watch_debounce_ms'] = safe_parse_config_value(config, 'FileService', 'watch_debounce_ms', int, 500)
+            service_configs['file_service']['watch_poll_interval'] = safe_parse_config_value(config, 'FileService', 'watch_poll_interval', float, 2.0)
+            service_configs['file_service']['secrets_cache_mb'] = safe_parse_config_value(config, 'FileService', 'secrets_cache_mb', int, 64)
+            service_configs['file_service']['masking_workers'] = safe_parse_config_value(config, 'FileService', 'masking_workers', int, 0)
+            service_configs['file_service']['masking_batch_size'] = safe_parse_config_value(config, 'FileService', 'masking_batch_size', int, 32)
+            service_configs['file_service']['masking_min_files'] = safe_parse_config_value(config, 'FileService', 'masking_min_files', int, 64)
+            service_configs['file_service']['secrets_precompute'] = config.getboolean('FileService', 'secrets_precompute', fallback=True)
+            service_configs['file_service']['context_cache_mb'] = safe_parse_config_value(config, 'FileService', 'context_cache_mb', int, 256)
+        
+        # Configuration du tokeniseur (vocabulaire BPE, sinon tiktoken, sinon estimation)
+        if 'Tokens' in config:
+            service_configs['context_builder']['tokenizer_vocab'] = config.get('Tokens', 'vocab_path', fallback='') or None
+            service_configs['context_builder']['tokenizer_encoding'] = config.get('Tokens', 'encoding', fallback='') or None
+            service_configs['context_builder']['token_cache_size'] = safe_parse_config_value(config, 'Tokens', 'cache_size', int, 4096)
+        
+        # Limites de l'arbre des fichiers du contexte (0 = illimité)
+        if 'ContextTree' in config:
+            service_configs['context_builder']['tree_max_depth'] = safe_parse_config_value(config, 'ContextTree', 'max_depth', int, 0)
+            service_configs['context_builder']['tree_max_files_per_dir'] = safe_parse_config_value(config, 'ContextTree', 'max_files_per_dir', int, 0)
+        
         # Configuration LLM - Nouvelle logique multi-modèles
         llm_models = {}
         default_llm_id = None
@@ -177,6 +223,7 @@ def load_service_configs():
                     'timeout_seconds': config.getint(section, 'timeout_seconds', fallback=300),
                     'temperature': safe_parse_config_value(config, section, 'temperature', float, None),
                     'max_tokens': safe_parse_config_value(config, section, 'max_tokens', int, None),
+                    'context_window': safe_parse_config_value(config, section, 'context_window', int, None),
                     'default': is_default,
                     # Configuration proxy
                     'proxy_http': config.get(section, 'proxy_http', fallback=None),
@@ -201,6 +248,7 @@ def load_service_configs():
                     'timeout_seconds': config.getint('LLMServer', 'timeout_seconds', fallback=300),
                     'temperature': safe_parse_config_value(config, 'LLMServer', 'temperature', float, None),
                     'max_tokens': safe_parse_config_value(config, 'LLMServer', 'max_tokens', int, None),
+                    'context_window': safe_parse_config_value(config, 'LLMServer', 'context_window', int, None),
                     'default': True,
                     # Configuration proxy
                     'proxy_http': config.get('LLMServer', 'proxy_http', fallback=None),
@@ -249,8 +297,13 @@ class Api:
         # Initialisation des services avec leurs configurations spécifiques
         self.git_service = GitService(SERVICE_CONFIGS['git_service'])
         self.llm_service = LlmApiService(SERVICE_CONFIGS['llm_service'])
-        self.file_service = FileService(SERVICE_CONFIGS['file_service'])
-        self.context_builder = ContextBuilderService({})
+        self.file_service = FileService(SERVICE_CONFIGS['file_service'], git_service=self.git_service)
+        self.masking_executor = MaskingExecutor.from_service(self.file_service, self.logger)
+        self.context_builder = ContextBuilderService(SERVICE_CONFIGS.get('context_builder', {}))
+        # Sections formatées du contexte, réutilisées pour les fichiers inchangés
+        self.section_cache = SectionCache(
+            SERVICE_CONFIGS['file_service'].get('context_cache_mb', 256) * 1024 * 1024, self.logger
+        )
         
         # Test pour vérifier que les logs du service LLM fonctionnent
         self.llm_service.logger.info("✅ Service LLM initialisé avec succès - Les logs fonctionnent !")
@@ -258,6 +311,9 @@ class Api:
         self.driver = None
         self.current_directory = None
         self.file_cache = []
+        self._scan_jobs = {}  # job_id -> ScanJob (scans progressifs)
+        self._scan_jobs_lock = threading.Lock()
+        self._findings_cancel = None  # Interrompt l'analyse des secrets en arrière-plan
         self.export_service = ExportService()
         
         # Enregistrer un callback pour les erreurs LLM
@@ -580,7 +636,12 @@ class Api:
     
     def scan_local_directory(self, directory_path):
         """Scanne un répertoire local et applique les règles .gitignore sans upload"""
+        self._cancel_secret_findings_scan()
         result = self.file_service.scan_local_directory(directory_path)
+        return self._finalize_scan(directory_path, result)
+    
+    def _finalize_scan(self, directory_path, result):
+        """Mémorise le résultat du scan et y ajoute la sélection sauvegardée du projet"""
         if result.get('success'):
             self.current_directory = result.get('directory')
             self.file_cache = result.get('file_cache', [])
@@ -611,33 +672,238 @@ class Api:
             response['saved_selection'] = saved_selection
             response['saved_selection_count'] = len(saved_selection)
             
+            # Surveiller le projet : un scan partiel ne sert pas de référence aux changements
+            if SERVICE_CONFIGS['file_service'].get('watch_enabled') and not response.get('truncated'):
+                try:
+                    response['watch_backend'] = self.file_service.start_watching(self._emit_file_changes)
+                except Exception as e:
+                    self.logger.warning(f"Surveillance du projet impossible: {e}")
+            
+            # Détecter les secrets en arrière-plan : la génération ignorera les fichiers sans secret
+            if SERVICE_CONFIGS['file_service'].get('secrets_precompute', True):
+                self._start_secret_findings_scan()
+            
             return response
         else:
             return {'success': False, 'error': result.get('error', 'Erreur inconnue')}
     
+    def _start_secret_findings_scan(self):
+        """Lance l'analyse des secrets du projet courant dans un thread, en interrompant la précédente."""
+        self._cancel_secret_findings_scan()
+        cancel_event = threading.Event()
+        self._findings_cancel = cancel_event
+        
+        def run():
+            try:
+                self.file_service.scan_secret_findings(cancel_event=cancel_event)
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la détection des secrets en arrière-plan: {e}")
+        
+        threading.Thread(target=run, name='secret-findings', daemon=True).start()
+    
+    def _cancel_secret_findings_scan(self):
+        if self._findings_cancel is not None:
+            self._findings_cancel.set()
+            self._findings_cancel = None
+    
+    def get_secret_findings_report(self, relative_paths=None):
+        """
+        Rapport d'audit des secrets détectés dans le projet scanné.
+        
+        Args:
+            relative_paths: Fichiers à inclure (défaut : tous les fichiers scannés)
+        
+        Returns:
+            Voir FileService.get_secret_findings
+        """
+        try:
+            return self.file_service.get_secret_findings(relative_paths)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la lecture des secrets détectés: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def start_scan(self, directory_path):
+        """
+        Démarre un scan progressif en arrière-plan et retourne son job_id.
+        
+        Les fichiers sont envoyés à la fenêtre principale par lots, avec les
+        compteurs courants, via window.onScanEvent(event, job_id, payload) :
+        'progress', 'files', puis 'complete' (réponse de scan_local_directory
+        sans la liste 'files', déjà transmise), 'cancelled' ou 'error'.
+        Un nouveau scan annule le scan en cours.
+        """
+        self._cancel_secret_findings_scan()
+        job = ScanJob(directory_path, self._emit_scan_event,
+                      batch_size=SERVICE_CONFIGS['file_service'].get('scan_batch_size', 500))
+        with self._scan_jobs_lock:
+            previous = [j for j in self._scan_jobs.values() if not j.finished]
+            for running in previous:
+                running.cancel()
+            # Ne conserver que les jobs en cours : les jobs terminés ne servent plus
+            self._scan_jobs = {j.job_id: j for j in previous}
+            self._scan_jobs[job.job_id] = job
+        
+        def on_success(result):
+            response = self._finalize_scan(directory_path, result)
+            response.pop('files', None)
+            return response
+        
+        job.start(
+            lambda progress: self.file_service.scan_local_directory(directory_path, progress=progress),
+            on_success=on_success,
+            wait_for=previous
+        )
+        self.logger.info(f"Scan progressif {job.job_id} démarré: {directory_path}")
+        return {'success': True, 'job_id': job.job_id}
+    
+    def cancel_scan(self, job_id):
+        """Annule un scan progressif"""
+        with self._scan_jobs_lock:
+            job = self._scan_jobs.get(job_id)
+        if not job:
+            return {'success': False, 'error': f'Scan inconnu: {job_id}'}
+        job.cancel()
+        return {'success': True, 'job_id': job_id}
+    
+    def get_scan_status(self, job_id):
+        """Retourne l'état et les compteurs d'un scan progressif"""
+        with self._scan_jobs_lock:
+            job = self._scan_jobs.get(job_id)
+        if not job:
+            return {'success': False, 'error': f'Scan inconnu: {job_id}'}
+        return {'success': True, **job.snapshot()}
+    
+    def _emit_scan_event(self, event, job_id, payload):
+        """Transmet un événement de scan progressif à la fenêtre principale"""
+        if not self._main_window:
+            return
+        self._main_window.evaluate_js(
+            f'window.onScanEvent && window.onScanEvent({json.dumps(event)}, {json.dumps(job_id)}, {json.dumps(payload)})'
+        )
+    
+    def _emit_file_changes(self, delta):
+        """Transmet à la fenêtre principale les fichiers ajoutés, modifiés ou retirés du projet"""
+        if not self._main_window:
+            return
+        self._main_window.evaluate_js(f'window.onFileChanges && window.onFileChanges({json.dumps(delta)})')
+    
     def get_file_content(self, relative_path):
         """Récupère le contenu d'un fichier depuis le cache local"""
         return self.file_service.get_file_content(relative_path, self.current_directory, self.file_cache)
     
-    def generate_context_from_selection(self, selected_files, instructions=""):
-        """Génère le contexte depuis une sélection de fichiers locaux"""
-        # Étape 1: Récupérer les contenus des fichiers
-        file_result = self.file_service.get_file_contents_batch(
-            selected_files,
-            self.current_directory,
-            self.file_cache
-        )
+    def generate_context_from_selection(self, selected_files, instructions="", masking_options=None, packing_options=None):
+        """
+        Génère le contexte depuis une sélection de fichiers locaux
+        
+        Args:
+            selected_files: Chemins relatifs des fichiers sélectionnés
+            instructions: Instructions ajoutées en fin de contexte
+            masking_options: {'enable_masking': bool, 'mask_mode': 'mask'|'remove'} (masquage actif par défaut)
+            packing_options: {'enabled': bool, 'llm_id': str, 'token_budget': int} pour ajuster
+                             le contexte au budget de tokens d'un modèle [LLM:*] (défaut : modèle
+                             par défaut ; token_budget remplace le budget déduit du modèle)
+        """
+        masking_options = masking_options or {}
+        packing_options = packing_options or {}
+        if not selected_files:
+            return {'success': False, 'error': 'Aucun fichier sélectionné'}
         
-        if not file_result.get('success'):
-            return file_result
+        token_budget = None
+        if packing_options.get('enabled'):
+            token_budget = packing_options.get('token_budget')
+            if not token_budget:
+                limits = self.llm_service.get_context_limits(packing_options.get('llm_id'))
+                if not limits['context_window']:
+                    return {'success': False,
+                            'error': "Aucune fenêtre de contexte (context_window) configurée pour le modèle"}
+                token_budget = self.context_builder.token_budget(limits['context_window'], limits['max_tokens'])
         
-        # Étape 2: Construire le contexte avec le ContextBuilderService
-        context_result = self.context_builder.build_context(
-            project_name=os.path.basename(self.current_directory),
-            directory_path=self.current_directory,
-            file_contents=file_result['file_contents'],
-            instructions=instructions
-        )
+        enable_masking = masking_options.get('enable_masking', True)
+        mask_mode = masking_options.get('mask_mode', 'mask')
+        
+        # Étape 1: Sections mémorisées des fichiers inchangés depuis la dernière génération.
+        # Les empreintes sont reprises de l'index de scan tant que la signature (taille,
+        # mtime, inode) d'un fichier est inchangée : ces fichiers ne sont ni relus ni masqués.
+        # Un contexte ajusté au budget de tokens n'utilise pas ce cache : tout est relu
+        sections = {}
+        if token_budget is None:
+            content_hashes = self.file_service.get_content_hashes(selected_files, self.current_directory)
+            for file_path in selected_files:
+                section = self._get_cached_section(file_path, content_hashes.get(file_path), enable_masking, mask_mode)
+                if section is not None:
+                    sections[file_path] = section
+        to_read = [file_path for file_path in selected_files if file_path not in sections]
+        
+        # Étape 2: Lire, masquer et mettre en forme les autres fichiers au fil des lectures
+        # concurrentes : chaque groupe de fichiers lus est masqué (résultats mémorisés par
+        # contenu, groupes analysés en parallèle) puis mis en forme pendant que les suivants
+        # sont lus ; seuls les contenus d'un groupe sont en mémoire à la fois
+        read_info = {}  # chemin -> (taille du contenu lu, nombre de lignes, empreinte des octets lus)
+        contents = self._iter_read_contents(to_read, read_info)
+        if enable_masking:
+            contents = self.masking_executor.mask_stream(contents, mask_mode)
+        else:
+            contents = ((file_path, content, 0) for file_path, content in contents)
+        
+        file_contents = []  # Contenus masqués, conservés pour l'ajustement au budget uniquement
+        secrets_counts = {}
+        try:
+            for file_path, content, secrets_count in contents:
+                if secrets_count:
+                    secrets_counts[file_path] = secrets_count
+                size, line_count, read_hash = read_info[file_path]
+                if token_budget is not None:
+                    file_contents.append({'path': file_path, 'content': content, 'size': size})
+                    continue
+                # Formater et mémoriser la section relue, sous l'empreinte des octets lus (et non
+                # celle calculée avant la lecture) ; le contenu n'est plus conservé
+                sections[file_path] = CachedSection(
+                    text=self.context_builder.format_section(file_path, content),
+                    size=size,
+                    line_count=line_count,
+                    secrets_count=secrets_count
+                )
+                if read_hash:
+                    self.section_cache.put((file_path, read_hash, mask_mode if enable_masking else None),
+                                           sections[file_path])
+        except Exception as e:
+            return {'success': False, 'error': f"Erreur lors de la récupération des contenus: {str(e)}"}
+        
+        # Étape 3: Construire le contexte avec le ContextBuilderService
+        if token_budget is not None:
+            # Fichiers complets, compactés, réduits à leurs signatures ou omis selon le budget
+            line_counts = {file_path: line_count for file_path, (_, line_count, _) in read_info.items()}
+            context_result = self.context_builder.build_packed_context(
+                project_name=os.path.basename(self.current_directory),
+                directory_path=self.current_directory,
+                file_contents=file_contents,
+                token_budget=token_budget,
+                instructions=instructions
+            )
+        else:
+            # Assembler toutes les sections, relues ou mémorisées
+            if read_info and len(sections) > len(read_info):
+                logging.info(f"Contexte régénéré : {len(read_info)} sections mises à jour, "
+                             f"{len(sections) - len(read_info)} réutilisées")
+            file_contents = [
+                {'path': file_path, 'size': sections[file_path].size, 'section': sections[file_path].text}
+                for file_path in selected_files if file_path in sections
+            ]
+            line_counts = {file_path: section.line_count for file_path, section in sections.items()}
+            secrets_counts = {file_path: section.secrets_count for file_path, section in sections.items()
+                              if section.secrets_count}
+            context_result = self.context_builder.build_context(
+                project_name=os.path.basename(self.current_directory),
+                directory_path=self.current_directory,
+                file_contents=file_contents,
+                instructions=instructions
+            )
+        
+        total_lines = sum(line_counts.values())
+        files_with_secrets = [file_path for file_path in selected_files if file_path in secrets_counts]
+        total_secrets_masked = sum(secrets_counts.values())
+        if total_secrets_masked:
+            logging.info(f"{total_secrets_masked} secrets masqués dans {len(files_with_secrets)} fichiers")
         
         if context_result.get('success'):
             # Stocker le contexte pour la Toolbox
@@ -647,11 +913,6 @@ class Api:
             self._save_selection_for_project(self.current_directory, selected_files)
             
             # Calculer les statistiques complètes pour le frontend
-            file_contents = file_result['file_contents']
-            
-            # Calculer le nombre total de lignes
-            total_lines = sum(content['content'].count('\n') + 1 for content in file_contents)
-            
             # Trier les fichiers par taille et prendre les 10 plus gros
             largest_files = sorted(file_contents, key=lambda f: f['size'], reverse=True)[:10]
             formatted_largest_files = [{'path': f['path'], 'size': f['size']} for f in largest_files]
@@ -672,14 +933,42 @@ class Api:
                     'total_chars': context_result['stats']['total_chars'],
                     'estimated_tokens': context_result['stats']['estimated_tokens'],
                     'largest_files': formatted_largest_files,
-                    'secrets_masked': 0,  # Le masquage n'est pas implémenté en local
-                    'files_with_secrets': []
+                    'secrets_masked': total_secrets_masked,
+                    'files_with_secrets': files_with_secrets,
+                    'packing': context_result.get('packing')
                 }
             }
         else:
             return context_result
     
     
+    def _iter_read_contents(self, file_paths, read_info):
+        """
+        (chemin, contenu) des fichiers lus avec succès, au fil des lectures concurrentes.
+        
+        read_info est complété avec (taille du contenu lu, nombre de lignes, empreinte des octets
+        lus, voir FileService.get_file_content) de chaque fichier ; les gros fichiers fournissent leur nombre de lignes réel (le
+        contenu peut être un extrait).
+        """
+        for file_path, read_result in self.file_service.iter_file_contents(
+            file_paths,
+            self.current_directory,
+            self.file_cache
+        ):
+            if not read_result['success']:
+                logging.warning(f"Échec lecture fichier: {file_path} ({read_result.get('error')})")
+                continue
+            content = read_result['content']
+            read_info[file_path] = (len(content), read_result.get('line_count', content.count('\n') + 1),
+                                    read_result.get('content_hash'))
+            yield file_path, content
+    
+    def _get_cached_section(self, file_path, content_hash, enable_masking, mask_mode):
+        """Section mémorisée d'un fichier pour ce contenu sur disque et ce masquage, ou None."""
+        if not content_hash:
+            return None
+        return self.section_cache.get((file_path, content_hash, mask_mode if enable_masking else None))
+    
     def open_toolbox_window(self, mode='api', target_url=None):
         """
         Ouvre une nouvelle fenêtre pour la Toolbox Développeur
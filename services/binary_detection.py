@@ -0,0 +1,106 @@
+"""Détection des fichiers binaires par lots d'échantillons."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+
+# Octets attendus dans un texte : caractères imprimables et contrôles usuels (\a \b \t \n \f \r ESC)
+TEXTCHARS = bytes(sorted({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f}))
+
+# Taille de l'échantillon lu en tête de fichier
+SAMPLE_SIZE = 8192
+
+
+def is_binary_string(bytes_to_check: bytes) -> bool:
+    """Indique si une chaîne d'octets contient des caractères de contrôle non textuels."""
+    return bool(bytes_to_check.translate(None, TEXTCHARS))
+
+
+def read_sample(path: str, size: int = SAMPLE_SIZE) -> bytes:
+    """Lit les premiers octets d'un fichier."""
+    with open(path, 'rb') as f:
+        return f.read(size)
+
+
+class BinaryClassifier:
+    """
+    Classe des échantillons d'octets en texte ou binaire, par lots.
+
+    Deux règles sont disponibles :
+    - 'utf8' (scan local) : binaire si l'échantillon contient un octet nul ou
+      n'est pas de l'UTF-8 valide ;
+    - 'textchars' (upload) : binaire si l'échantillon contient un caractère
+      de contrôle hors TEXTCHARS (règle de is_binary_string).
+
+    Chaque échantillon est classé avec les opérations natives de bytes
+    (recherche, isascii, translate), qui parcourent l'échantillon en C :
+    sur des échantillons de 8 Ko, elles sont plus rapides qu'une
+    concaténation du lot suivie de réductions vectorisées. Le gain du
+    classifieur vient de la lecture parallèle des échantillons, sensible
+    sur disque froid ou partage réseau (voir tests/manual/bench_binary_detection.py).
+    """
+
+    RULES = ('utf8', 'textchars')
+
+    def __init__(self, workers: int = 1, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            workers: Nombre de lectures d'échantillons simultanées
+            logger: Logger optionnel
+        """
+        self.workers = max(1, workers)
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+
+    def classify(self, samples: Sequence[bytes], rule: str = 'utf8') -> List[bool]:
+        """
+        Classe un lot d'échantillons.
+
+        Returns:
+            Un verdict par échantillon (True = binaire), dans l'ordre du lot
+        """
+        if rule not in self.RULES:
+            raise ValueError(f"Règle de détection inconnue: {rule}")
+        check = self._is_binary_utf8 if rule == 'utf8' else is_binary_string
+        return [check(sample) for sample in samples]
+
+    def classify_files(self, paths: Sequence[str], sample_size: int = SAMPLE_SIZE) -> List[Optional[bool]]:
+        """
+        Lit l'échantillon de chaque fichier (en parallèle) et classe le lot.
+
+        Returns:
+            Un verdict par fichier (True = binaire), None si le fichier est illisible
+        """
+        def read(path: str) -> Optional[bytes]:
+            try:
+                return read_sample(path, sample_size)
+            except OSError as e:
+                self.logger.warning(f"Lecture de l'échantillon impossible pour {path}: {e}")
+                return None
+
+        workers = min(self.workers, len(paths))
+        if workers > 1:
+            # Une tranche contiguë par thread : une seule tâche par thread, l'ordre est conservé
+            step = -(-len(paths) // workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parts = executor.map(lambda start: [read(p) for p in paths[start:start + step]],
+                                     range(0, len(paths), step))
+                samples = [sample for part in parts for sample in part]
+        else:
+            samples = [read(path) for path in paths]
+
+        readable = [sample for sample in samples if sample is not None]
+        verdicts = iter(self.classify(readable))
+        return [None if sample is None else next(verdicts) for sample in samples]
+
+    @staticmethod
+    def _is_binary_utf8(sample: bytes) -> bool:
+        if b'\x00' in sample:
+            return True
+        if sample.isascii():
+            return False
+        try:
+            sample.decode('utf-8')
+            return False
+        except UnicodeDecodeError:
+            return True
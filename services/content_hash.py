@@ -0,0 +1,43 @@
+"""Empreinte rapide du contenu des fichiers (non cryptographique)."""
+
+import hashlib
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+
+# Préfixe des empreintes : deux algorithmes ne produisent jamais la même clé
+HASH_ALGORITHM = 'xxh3_64' if HAS_XXHASH else 'blake2b_64'
+
+# Taille des blocs lus pour calculer l'empreinte
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _new_hasher():
+    if HAS_XXHASH:
+        return xxhash.xxh3_64()
+    return hashlib.blake2b(digest_size=8)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Empreinte d'un contenu en mémoire, au format '<algorithme>:<hex>'."""
+    hasher = _new_hasher()
+    hasher.update(data)
+    return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
+
+
+def hash_text(text: str) -> str:
+    """Empreinte d'un texte en mémoire (encodé en UTF-8) ; même format que hash_bytes."""
+    return hash_bytes(text.encode('utf-8', 'surrogatepass'))
+
+
+def hash_file(path: str) -> str:
+    """Empreinte du contenu d'un fichier, lu par blocs ; même format que hash_bytes."""
+    hasher = _new_hasher()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return f"{HASH_ALGORITHM}:{hasher.hexdigest()}"
@@ -1,9 +1,34 @@
 import os
 import logging
 import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from .base_service import BaseService
 from .exceptions import ServiceException
+from .tokenizer import DEFAULT_ENCODING, configure_tokenizer, get_tokenizer
+from .tree_renderer import render_tree
+
+
+# Niveaux d'inclusion d'un fichier dans un contexte ajusté au budget de tokens,
+# du moins au plus complet, avec la valeur attribuée à chacun pour le plan
+PACKING_LEVELS = ('omitted', 'outline', 'compact', 'full')
+_PACKING_VALUES = {'omitted': 0.0, 'outline': 1.0, 'compact': 3.0, 'full': 4.0}
+
+# Tokens réservés à l'en-tête et au pied de la section de chaque fichier
+# (couvre aussi le format du contexte uploadé, qui répète le chemin)
+_SECTION_OVERHEAD_TOKENS = 16
+
+# Réponse réservée quand le modèle ne fixe pas max_tokens (au plus un quart de la fenêtre)
+DEFAULT_RESPONSE_RESERVE = 8192
+
+# Lignes de déclaration conservées dans le plan d'un fichier (signatures) :
+# fonctions, classes et types des langages courants
+_OUTLINE_LINE = re.compile(
+    r'^[ \t]*(?:@\w|(?:(?:export|default|public|private|protected|internal|static|async|abstract|'
+    r'final|override|virtual|pub(?:\([\w ]+\))?|unsafe|extern|const|inline)\s+)*'
+    r'(?:def|class|function\*?|func|fn|interface|struct|enum|trait|impl|type|module|namespace|record)\b)'
+)
+
+_SECTION_LABELS = {'compact': ' (compacté)', 'outline': ' (signatures uniquement)'}
 
 
 class ContextBuilderException(ServiceException):
@@ -23,6 +48,10 @@ class ContextBuilderService(BaseService):
             logger: Logger optionnel
         """
         super().__init__(config, logger)
+        # Vocabulaire BPE configuré ([Tokens] vocab_path), sinon tiktoken, sinon estimation à 4 caractères par token
+        if {'tokenizer_vocab', 'tokenizer_encoding', 'token_cache_size'} & set(config):
+            configure_tokenizer(config.get('tokenizer_vocab'), config.get('token_cache_size', 4096), self.logger,
+                                config.get('tokenizer_encoding') or DEFAULT_ENCODING)
         
     def validate_config(self):
         """Valide la configuration du service."""
@@ -37,6 +66,10 @@ class ContextBuilderService(BaseService):
         """
         Construit le contexte formaté à partir des contenus de fichiers.
         
+        Le contexte est assemblé en une seule chaîne à partir de iter_context ;
+        pour les grandes sélections, write_context l'écrit directement dans
+        un fichier ou un flux.
+        
         Args:
             project_name: Nom du projet (généralement le nom du répertoire)
             directory_path: Chemin du répertoire de base
@@ -53,49 +86,13 @@ class ContextBuilderService(BaseService):
                     'error': 'Aucun contenu de fichier fourni'
                 }
             
-            context_parts = []
-            total_chars = 0
-            
-            # En-tête du contexte
-            context_parts.extend(self._build_header(project_name, directory_path, len(file_contents)))
-            
-            # Arbre des fichiers
-            file_paths = [f['path'] for f in file_contents]
-            context_parts.extend(self._build_file_tree(file_paths, project_name))
-            context_parts.append("")
-            
-            # Trier les fichiers par taille décroissante
-            sorted_contents = sorted(file_contents, key=lambda x: x['size'], reverse=True)
-            
-            # Ajouter le contenu de chaque fichier
-            for file_data in sorted_contents:
-                context_parts.extend(self._format_file_content(
-                    file_data['path'], 
-                    file_data['content']
-                ))
-                total_chars += file_data['size']
-            
-            # Ajouter les instructions si présentes
-            if instructions and instructions.strip():
-                context_parts.extend(self._format_instructions(instructions))
-            
-            # Statistiques finales
-            context_parts.extend(self._build_statistics(
-                len(file_contents), 
-                total_chars,
-                sorted_contents[:5]  # Top 5 des plus gros fichiers
-            ))
-            
-            full_context = "\n".join(context_parts)
+            parts = list(self.iter_context(project_name, directory_path, file_contents, instructions))
+            full_context = "".join(parts)
             
             return {
                 'success': True,
                 'context': full_context,
-                'stats': {
-                    'files_count': len(file_contents),
-                    'total_chars': total_chars,
-                    'estimated_tokens': total_chars // 4
-                }
+                'stats': self._context_stats(file_contents, self._count_parts_tokens(parts))
             }
             
         except Exception as e:
@@ -103,6 +100,143 @@ class ContextBuilderService(BaseService):
             self.logger.error(error_msg)
             raise ContextBuilderException(error_msg)
     
+    def write_context(self,
+                      sink,
+                      project_name: str,
+                      directory_path: str,
+                      file_contents: List[Dict[str, Any]],
+                      instructions: str = "") -> Dict[str, Any]:
+        """
+        Écrit le contexte section par section dans un flux, sans l'assembler en mémoire.
+        
+        Args:
+            sink: Objet disposant d'une méthode write(str) (fichier temporaire,
+                  socket enveloppée, canal de morceaux vers l'interface...)
+            project_name: Nom du projet (généralement le nom du répertoire)
+            directory_path: Chemin du répertoire de base
+            file_contents: Voir iter_context
+            instructions: Instructions optionnelles à inclure
+            
+        Returns:
+            Dict contenant success et les statistiques (dont context_chars,
+            le nombre de caractères écrits)
+        """
+        try:
+            if not file_contents:
+                return {
+                    'success': False,
+                    'error': 'Aucun contenu de fichier fourni'
+                }
+            
+            context_chars = 0
+            context_tokens = 0
+            for chunk in self.iter_context(project_name, directory_path, file_contents, instructions):
+                sink.write(chunk)
+                context_chars += len(chunk)
+                context_tokens += self._count_parts_tokens((chunk,))
+            
+            stats = self._context_stats(file_contents, context_tokens)
+            stats['context_chars'] = context_chars
+            return {'success': True, 'stats': stats}
+            
+        except Exception as e:
+            error_msg = f"Erreur lors de l'écriture du contexte: {str(e)}"
+            self.logger.error(error_msg)
+            raise ContextBuilderException(error_msg)
+    
+    def iter_context(self,
+                     project_name: str,
+                     directory_path: str,
+                     file_contents: List[Dict[str, Any]],
+                     instructions: str = "",
+                     packing: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Produit le contexte morceau par morceau ; leur concaténation est le contexte de build_context.
+        
+        Le contenu d'un fichier ('content') peut être une chaîne ou une fonction
+        sans argument qui la retourne : elle est appelée au moment d'écrire le
+        fichier, si bien qu'un seul contenu est en mémoire à la fois. 'size'
+        doit alors être connu à l'avance (tri et statistiques). Un fichier dont
+        la section est déjà formatée (clé 'section', voir format_section) est
+        inséré tel quel, sans 'content'.
+        
+        Args:
+            project_name: Nom du projet (généralement le nom du répertoire)
+            directory_path: Chemin du répertoire de base
+            file_contents: Liste des dictionnaires contenant path, content et size
+                           (et 'mode', niveau d'inclusion d'un contexte ajusté)
+            instructions: Instructions optionnelles à inclure
+            packing: Plan d'inclusion (voir plan_packing) : l'arbre liste alors
+                     tous les fichiers du plan, y compris les fichiers omis
+            
+        Yields:
+            Sections du contexte et séparateurs de lignes
+        """
+        first = True
+        for part in self._iter_context_parts(project_name, directory_path, file_contents, instructions, packing):
+            if not first:
+                yield "\n"
+            first = False
+            yield part
+    
+    def _iter_context_parts(self, project_name: str, directory_path: str,
+                            file_contents: List[Dict[str, Any]], instructions: str,
+                            packing: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Lignes et blocs du contexte, à séparer par des retours à la ligne."""
+        # En-tête du contexte
+        yield from self._build_header(project_name, directory_path, len(file_contents))
+        
+        # Arbre des fichiers
+        source = packing['files'] if packing else file_contents
+        file_paths = [f['path'] for f in source]
+        yield from self._build_file_tree(file_paths, project_name)
+        yield ""
+        
+        # Trier les fichiers par taille décroissante
+        sorted_contents = sorted(file_contents, key=lambda x: x['size'], reverse=True)
+        
+        # Ajouter le contenu de chaque fichier
+        total_chars = 0
+        for file_data in sorted_contents:
+            if 'section' in file_data:
+                yield file_data['section']
+            else:
+                content = file_data['content']
+                if callable(content):
+                    content = content()
+                yield from self._format_file_content(file_data['path'], content, file_data.get('mode'))
+            total_chars += file_data['size']
+        
+        # Ajouter les instructions si présentes
+        if instructions and instructions.strip():
+            yield from self._format_instructions(instructions)
+        
+        if packing:
+            yield from self._format_packing_summary(packing)
+        
+        # Statistiques finales
+        yield from self._build_statistics(
+            len(file_contents), 
+            total_chars,
+            sorted_contents[:5]  # Top 5 des plus gros fichiers
+        )
+    
+    @staticmethod
+    def _context_stats(file_contents: List[Dict[str, Any]], context_tokens: int) -> Dict[str, Any]:
+        return {
+            'files_count': len(file_contents),
+            'total_chars': sum(f['size'] for f in file_contents),
+            'estimated_tokens': context_tokens
+        }
+    
+    def _count_parts_tokens(self, parts) -> int:
+        """
+        Tokens du contexte, morceau par morceau, sans l'assembler : avec un
+        vocabulaire BPE, le contenu de chaque fichier n'est tokenisé qu'une
+        fois par version (voir count_tokens et BpeTokenizer.count_parts).
+        """
+        return get_tokenizer().count_parts(parts)
+    
     def _build_header(self, project_name: str, directory_path: str, file_count: int) -> List[str]:
         """Construit l'en-tête du contexte."""
         return [
@@ -113,40 +247,41 @@ class ContextBuilderService(BaseService):
         ]
     
     def _build_file_tree(self, file_paths: List[str], project_name: str) -> List[str]:
-        """Génère un arbre visuel des fichiers."""
+        """Génère un arbre visuel des fichiers (voir render_tree)."""
         if not file_paths:
             return ["## Arbre des fichiers", "Aucun fichier"]
         
         tree_lines = ["## Arbre des fichiers", "```"]
-        tree_lines.append(f"{project_name}/")
-        
-        # Trier les fichiers pour un affichage cohérent
-        sorted_files = sorted(file_paths)
-        
-        # Construire l'arbre
-        for i, file_path in enumerate(sorted_files):
-            is_last = (i == len(sorted_files) - 1)
-            parts = file_path.split('/')
-            
-            # Construire l'indentation
-            prefix = "└── " if is_last else "├── "
-            indent = "    " * (len(parts) - 1)
-            
-            tree_lines.append(f"{indent}{prefix}{parts[-1]}")
-        
+        tree_lines += render_tree(file_paths, project_name,
+                                  self.config.get('tree_max_depth', 0),
+                                  self.config.get('tree_max_files_per_dir', 0))
         tree_lines.append("```")
         return tree_lines
     
-    def _format_file_content(self, file_path: str, content: str) -> List[str]:
+    def _format_file_content(self, file_path: str, content: str, mode: Optional[str] = None) -> List[str]:
         """Formate le contenu d'un fichier pour l'inclusion dans le contexte."""
         return [
-            f"## Fichier: {file_path}",
+            f"## Fichier: {file_path}{_SECTION_LABELS.get(mode, '')}",
             "```",
             content,
             "```",
             ""
         ]
     
+    def format_section(self, file_path: str, content: str, mode: Optional[str] = None) -> str:
+        """
+        Section d'un fichier telle qu'elle figure dans le contexte, prête à être mémorisée.
+        
+        Args:
+            file_path: Chemin relatif du fichier
+            content: Contenu inclus (masqué, compacté...)
+            mode: Niveau d'inclusion d'un contexte ajusté (voir plan_packing)
+            
+        Returns:
+            La section, à placer dans file_contents sous la clé 'section'
+        """
+        return "\n".join(self._format_file_content(file_path, content, mode))
+    
     def _format_instructions(self, instructions: str) -> List[str]:
         """Formate les instructions pour l'inclusion dans le contexte."""
         return [
@@ -155,6 +290,17 @@ class ContextBuilderService(BaseService):
             ""
         ]
     
+    def _format_packing_summary(self, packing: Dict[str, Any]) -> List[str]:
+        """Résume le plan d'inclusion d'un contexte ajusté au budget de tokens."""
+        counts = packing['counts']
+        return [
+            "## Ajustement au budget de tokens",
+            f"- Budget: {packing['token_budget']:,} tokens",
+            f"- Fichiers complets: {counts['full']}, compactés: {counts['compact']}, "
+            f"signatures uniquement: {counts['outline']}, omis: {counts['omitted']}",
+            ""
+        ]
+    
     def _build_statistics(self, file_count: int, total_chars: int, 
                          largest_files: List[Dict[str, Any]]) -> List[str]:
         """Construit la section des statistiques."""
@@ -189,10 +335,224 @@ class ContextBuilderService(BaseService):
         lines = [line for line in content.splitlines() if line.strip()]
         return "\n".join(lines)
     
+    def outline_code(self, content: str) -> str:
+        """
+        Réduit un bloc de code à ses lignes de déclaration (fonctions, classes, types).
+        
+        Args:
+            content: Le contenu du code
+            
+        Returns:
+            Les signatures, une par ligne avec leur indentation ('' si aucune)
+        """
+        return "\n".join(line.rstrip() for line in content.splitlines() if _OUTLINE_LINE.match(line))
+    
+    def count_tokens(self, text: str) -> int:
+        """Nombre de tokens d'un texte (vocabulaire configuré, tiktoken ou estimation, voir services/tokenizer.py)."""
+        return get_tokenizer().count_tokens(text)
+    
+    def token_budget(self, context_window: int, max_tokens: Optional[int] = None) -> int:
+        """
+        Budget de tokens du contexte pour un modèle : sa fenêtre moins la réponse attendue.
+        
+        Args:
+            context_window: Taille de la fenêtre de contexte du modèle (tokens)
+            max_tokens: Longueur maximale de la réponse configurée pour le modèle
+            
+        Returns:
+            Le budget (0 si la fenêtre est trop petite)
+        """
+        reserve = max_tokens if max_tokens else min(DEFAULT_RESPONSE_RESERVE, context_window // 4)
+        return max(0, context_window - reserve)
+    
+    def plan_packing(self, file_contents: List[Dict[str, Any]], token_budget: int) -> Dict[str, Any]:
+        """
+        Choisit le niveau d'inclusion de chaque fichier pour tenir dans un budget de tokens.
+        
+        Chaque fichier peut être inclus en entier, compacté (compact_code),
+        réduit à ses signatures (outline_code) ou omis. Tous les fichiers ayant
+        la même importance, le plan maximise la somme des valeurs des niveaux
+        retenus (_PACKING_VALUES) : c'est un sac à dos à choix multiples,
+        résolu de manière gloutonne. Les niveaux non rentables d'un fichier
+        (enveloppe convexe coût/valeur) sont écartés, puis les améliorations
+        de tous les fichiers sont appliquées par ordre de valeur par token
+        décroissante tant qu'elles tiennent dans le budget — O(n log n).
+        
+        Quand la sélection complète tient dans le budget, les versions
+        compactées et les signatures ne sont pas calculées.
+        
+        Args:
+            file_contents: Dictionnaires contenant path et content (chaîne ou
+                           fonction sans argument, appelée une fois)
+            token_budget: Tokens disponibles pour les sections des fichiers
+            
+        Returns:
+            Dict contenant token_budget, used_tokens, counts (par niveau) et
+            files : {'path', 'mode', 'tokens', 'full_tokens', 'content'} pour
+            chaque fichier, dans l'ordre reçu ('content' vaut None si omis)
+        """
+        contents = []
+        for file_data in file_contents:
+            content = file_data['content']
+            contents.append(content() if callable(content) else content)
+        
+        wrappers = [_SECTION_OVERHEAD_TOKENS + 2 * self.count_tokens(f['path']) for f in file_contents]
+        full_costs = [wrapper + self.count_tokens(content) for wrapper, content in zip(wrappers, contents)]
+        
+        if sum(full_costs) <= token_budget:
+            levels = [[('full', cost, content)] for cost, content in zip(full_costs, contents)]
+            chosen = [0] * len(contents)
+        else:
+            levels = [self._packing_levels(content, wrapper, full_cost)
+                      for content, wrapper, full_cost in zip(contents, wrappers, full_costs)]
+            chosen = self._pack_greedy(levels, token_budget)
+        
+        files = []
+        counts = dict.fromkeys(PACKING_LEVELS, 0)
+        used_tokens = 0
+        for file_data, options, index, full_cost in zip(file_contents, levels, chosen, full_costs):
+            if index < 0:
+                mode, tokens, text = 'omitted', 0, None
+            else:
+                mode, tokens, text = options[index]
+            counts[mode] += 1
+            used_tokens += tokens
+            files.append({'path': file_data['path'], 'mode': mode, 'tokens': tokens,
+                          'full_tokens': full_cost, 'content': text})
+        
+        return {
+            'token_budget': token_budget,
+            'used_tokens': used_tokens,
+            'counts': counts,
+            'files': files
+        }
+    
+    def _packing_levels(self, content: str, wrapper: int, full_cost: int) -> List[Tuple[str, int, str]]:
+        """Niveaux rentables d'un fichier (hors omission), par coût croissant : (mode, tokens, texte)."""
+        candidates = []
+        outline = self.outline_code(content)
+        if outline:
+            candidates.append(('outline', wrapper + self.count_tokens(outline), outline))
+        compact = self.compact_code(content)
+        candidates.append(('compact', wrapper + self.count_tokens(compact), compact))
+        candidates.append(('full', full_cost, content))
+        
+        # Enveloppe convexe supérieure des points (coût, valeur), en partant de l'omission (0, 0) :
+        # un niveau plus cher sans plus de valeur, ou moins rentable que le suivant, est écarté
+        hull = [('omitted', 0, None)]
+        for level in sorted(candidates, key=lambda c: (c[1], -_PACKING_VALUES[c[0]])):
+            if _PACKING_VALUES[level[0]] <= _PACKING_VALUES[hull[-1][0]]:
+                continue
+            while len(hull) >= 2 and self._packing_slope(hull[-2], hull[-1]) <= self._packing_slope(hull[-1], level):
+                hull.pop()
+            hull.append(level)
+        return hull[1:]
+    
+    @staticmethod
+    def _packing_slope(low: Tuple[str, int, str], high: Tuple[str, int, str]) -> float:
+        gain = _PACKING_VALUES[high[0]] - _PACKING_VALUES[low[0]]
+        cost = high[1] - low[1]
+        return gain / cost if cost > 0 else float('inf')
+    
+    def _pack_greedy(self, levels: List[List[Tuple[str, int, str]]], token_budget: int) -> List[int]:
+        """Indice du niveau retenu pour chaque fichier (-1 = omis)."""
+        upgrades = []
+        for file_index, options in enumerate(levels):
+            previous = ('omitted', 0, None)
+            for step, level in enumerate(options):
+                upgrades.append((-self._packing_slope(previous, level), level[1] - previous[1], file_index, step))
+                previous = level
+        # Sur l'enveloppe convexe, les améliorations d'un fichier arrivent dans l'ordre de ses niveaux
+        upgrades.sort()
+        
+        chosen = [-1] * len(levels)
+        remaining = token_budget
+        for _, cost, file_index, step in upgrades:
+            if chosen[file_index] == step - 1 and cost <= remaining:
+                chosen[file_index] = step
+                remaining -= cost
+        return chosen
+    
+    def build_packed_context(self,
+                             project_name: str,
+                             directory_path: str,
+                             file_contents: List[Dict[str, Any]],
+                             token_budget: int,
+                             instructions: str = "") -> Dict[str, Any]:
+        """
+        Construit un contexte ajusté à un budget de tokens (voir plan_packing).
+        
+        L'en-tête, l'arbre (qui liste tous les fichiers sélectionnés), les
+        instructions et les statistiques sont décomptés du budget avant de
+        répartir le reste entre les fichiers.
+        
+        Args:
+            project_name: Nom du projet (généralement le nom du répertoire)
+            directory_path: Chemin du répertoire de base
+            file_contents: Liste des dictionnaires contenant path, content et size
+            token_budget: Budget de tokens du contexte complet (voir token_budget)
+            instructions: Instructions optionnelles à inclure
+            
+        Returns:
+            Dict contenant le contexte formaté, les statistiques et le plan
+            d'inclusion ('packing', sans les contenus)
+        """
+        try:
+            if not file_contents:
+                return {
+                    'success': False,
+                    'error': 'Aucun contenu de fichier fourni'
+                }
+            
+            overhead_tokens = self._packing_overhead(project_name, directory_path, file_contents, instructions)
+            plan = self.plan_packing(file_contents, max(0, token_budget - overhead_tokens))
+            
+            packed = [
+                {'path': f['path'], 'content': f['content'], 'size': len(f['content']), 'mode': f['mode']}
+                for f in plan['files'] if f['mode'] != 'omitted'
+            ]
+            for f in plan['files']:
+                del f['content']
+            plan['token_budget'] = token_budget
+            plan['overhead_tokens'] = overhead_tokens
+            plan['fits'] = plan['used_tokens'] + overhead_tokens <= token_budget
+            
+            parts = list(self.iter_context(project_name, directory_path, packed, instructions, plan))
+            full_context = "".join(parts)
+            
+            # Comptes des sections déjà mémorisés par plan_packing : le contexte assemblé n'est pas retokenisé
+            stats = self._context_stats(packed, self._count_parts_tokens(parts))
+            return {
+                'success': True,
+                'context': full_context,
+                'stats': stats,
+                'packing': plan
+            }
+            
+        except Exception as e:
+            error_msg = f"Erreur lors de la construction du contexte ajusté: {str(e)}"
+            self.logger.error(error_msg)
+            raise ContextBuilderException(error_msg)
+    
+    def _packing_overhead(self, project_name: str, directory_path: str,
+                          file_contents: List[Dict[str, Any]], instructions: str) -> int:
+        """Tokens du contexte hors sections des fichiers (majorés : tailles et compteurs maximaux)."""
+        file_count = len(file_contents)
+        bound = {'token_budget': 10 ** 12, 'counts': dict.fromkeys(PACKING_LEVELS, file_count)}
+        parts = self._build_header(project_name, directory_path, file_count)
+        parts += self._build_file_tree([f['path'] for f in file_contents], project_name)
+        parts.append("")
+        if instructions and instructions.strip():
+            parts += self._format_instructions(instructions)
+        parts += self._format_packing_summary(bound)
+        parts += self._build_statistics(file_count, sum(f['size'] for f in file_contents), [])
+        return sum(self.count_tokens(part) + 1 for part in parts)
+    
     def estimate_tokens(self, text: str) -> Dict[str, Any]:
         """
-        Estime le nombre de tokens dans un texte.
-        Utilise une heuristique simple de 4 caractères par token.
+        Compte ou estime le nombre de tokens dans un texte.
+        Utilise le vocabulaire configuré ou tiktoken, et à défaut
+        4 caractères par token (voir services/tokenizer.py).
         
         Args:
             text: Le texte à analyser
@@ -200,9 +560,20 @@ class ContextBuilderService(BaseService):
         Returns:
             Dict contenant les statistiques
         """
-        char_count = len(text)
-        # Heuristique simple: en moyenne 4 caractères par token
-        estimated_tokens = char_count / 4
+        return self.token_stats(len(text), self.count_tokens(text))
+    
+    def token_stats(self, char_count: int, token_count: int) -> Dict[str, Any]:
+        """
+        Comme estimate_tokens, à partir des comptes déjà calculés (contexte écrit en flux).
+        
+        Args:
+            char_count: Nombre de caractères du texte
+            token_count: Nombre de tokens du texte
+            
+        Returns:
+            Dict contenant les statistiques
+        """
+        estimated_tokens = token_count
         
         # Déterminer la compatibilité avec les modèles
         if estimated_tokens < 3500:
@@ -0,0 +1,182 @@
+"""Parcours parallèle de l'arborescence d'un projet."""
+
+import os
+import time
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+from .file_records import FileRecord
+
+
+class ParallelDirectoryWalker:
+    """
+    Parcourt un répertoire avec un pool de threads, un répertoire par tâche.
+
+    Les workers partagent une file de répertoires à explorer : un worker inactif
+    prend le prochain répertoire disponible, quel que soit le worker qui l'a
+    découvert. Chaque répertoire est lu avec ``os.scandir`` et les ``stat()``
+    passent par les ``DirEntry`` (mis en cache par l'OS quand c'est possible).
+
+    Le résultat est réassemblé dans l'ordre de parcours d'``os.walk`` (préfixe,
+    descendant) afin d'être identique à celui du parcours séquentiel.
+    """
+
+    def __init__(self, max_workers: int, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_workers: Nombre de threads de parcours
+            logger: Logger optionnel
+        """
+        self.max_workers = max(1, max_workers)
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.stats: Dict[str, Any] = {}
+
+    def walk(self, directory_path: str, ignore_spec, progress=None) -> List[FileRecord]:
+        """
+        Parcourt le répertoire en élaguant les chemins ignorés.
+
+        Args:
+            directory_path: Répertoire racine
+            ignore_spec: Objet exposant match_file(chemin_relatif) ; les répertoires
+                         sont testés avec un '/' final, comme pour le parcours séquentiel
+            progress: ScanProgress optionnel, informé de chaque répertoire parcouru ;
+                      son annulation interrompt le parcours (ScanCancelledException)
+                      et ses limites (fichiers, durée, profondeur) l'arrêtent proprement
+
+        Returns:
+            Liste des enregistrements de fichiers, dans l'ordre d'os.walk
+        """
+        start = time.perf_counter()
+        root_abs = str(Path(directory_path))
+
+        # rel_dir -> (fichiers, sous-répertoires) dans l'ordre de scandir
+        results: Dict[str, Tuple[List[FileRecord], List[str]]] = {}
+        results_lock = threading.Lock()
+        work = queue.Queue()
+        pending = [1]  # Répertoires découverts mais pas encore traités
+        pending_lock = threading.Lock()
+        errors: List[BaseException] = []
+        token = progress.token if progress is not None else None
+        found = [0]  # Fichiers retenus jusqu'ici (limite max_files)
+
+        def process(rel_dir: str, abs_dir: str):
+            if token is not None and token.should_stop(found[0]):
+                # Limite atteinte : vider la file sans explorer
+                with results_lock:
+                    results[rel_dir] = ([], [])
+                return
+            files, subdirs = self._scan_directory(root_abs, rel_dir, abs_dir, ignore_spec, token)
+            if progress is not None:
+                # Vérifie aussi l'annulation avant de mettre en file les sous-répertoires
+                progress.directory_scanned(len(files))
+            with results_lock:
+                found[0] += len(files)
+                results[rel_dir] = (files, [rel for rel, _ in subdirs])
+            with pending_lock:
+                pending[0] += len(subdirs)
+            for sub in subdirs:
+                work.put(sub)
+
+        def worker():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                try:
+                    process(*item)
+                except BaseException as e:  # Remonter l'erreur au thread appelant
+                    errors.append(e)
+                finally:
+                    with pending_lock:
+                        pending[0] -= 1
+                        done = pending[0] == 0
+                    if done:
+                        for _ in range(self.max_workers):
+                            work.put(None)
+
+        work.put(('', root_abs))
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.max_workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        walk_seconds = time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+
+        # Réassemblage dans l'ordre préfixe d'os.walk
+        scanned_files: List[FileRecord] = []
+        stack = ['']
+        while stack:
+            rel_dir = stack.pop()
+            files, subdirs = results.get(rel_dir, ([], []))
+            scanned_files.extend(files)
+            stack.extend(reversed(subdirs))
+
+        if token is not None and token.limits.max_files and len(scanned_files) >= token.limits.max_files:
+            token.should_stop(len(scanned_files))
+            del scanned_files[token.limits.max_files:]
+
+        self.stats = {
+            'workers': self.max_workers,
+            'directories': len(results),
+            'files': len(scanned_files),
+            'walk_seconds': round(walk_seconds, 4),
+            'assemble_seconds': round(time.perf_counter() - start - walk_seconds, 4)
+        }
+        return scanned_files
+
+    def _scan_directory(self, root_abs: str, rel_dir: str, abs_dir: str,
+                        ignore_spec, token=None) -> Tuple[List[FileRecord], List[Tuple[str, str]]]:
+        """Liste un répertoire : fichiers retenus et sous-répertoires à explorer."""
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(abs_dir) as entries:
+                entries = list(entries)
+        except OSError:
+            # Même comportement qu'os.walk : répertoire illisible ignoré
+            return files, subdirs
+
+        dir_entries = []
+        file_entries = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dir_entries if is_dir else file_entries).append(entry)
+
+        for entry in dir_entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if ignore_spec.match_file(rel_path + '/'):
+                continue
+            # Comme os.walk (followlinks=False) : les liens vers des répertoires ne sont pas suivis
+            try:
+                if entry.is_symlink():
+                    continue
+            except OSError:
+                continue
+            if token is not None and not token.depth_allowed(rel_path):
+                continue
+            subdirs.append((rel_path, entry.path if abs_dir != '.' else entry.name))
+
+        for entry in file_entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if ignore_spec.match_file(rel_path):
+                continue
+            abs_path = entry.path if abs_dir != '.' else entry.name
+            try:
+                file_stat = entry.stat()
+            except OSError as e:
+                self.logger.warning(f"Impossible d'accéder au fichier {abs_path}: {e}")
+                continue
+            files.append(FileRecord(
+                root_abs, rel_dir, entry.name, file_stat.st_size, file_stat.st_mtime,
+                # DirEntry.stat() renvoie st_ino=0 sous Windows : entry.inode() le fournit
+                file_stat.st_ino or entry.inode()
+            ))
+        return files, subdirs
@@ -21,6 +21,11 @@ class FileServiceException(ServiceException):
     pass
 
 
+class ScanCancelledException(FileServiceException):
+    """Exception levée lorsqu'un scan est annulé par l'utilisateur."""
+    pass
+
+
 class ConfigurationException(ServiceException):
     """Exception liée à la configuration des services."""
     pass
@@ -0,0 +1,123 @@
+"""Règles d'exclusion des fichiers par nom, motif et extension, compilées une fois."""
+
+import os
+import re
+import fnmatch
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class ExclusionRule(NamedTuple):
+    """Règle ayant décidé du sort d'un fichier (pour le débogage)."""
+    kind: str   # 'file_blacklist', 'pattern_blacklist', 'binary_blacklist' ou 'binary_whitelist'
+    value: str  # Nom, motif ou extension tel qu'écrit dans la configuration
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.value}"
+
+
+_WILDCARDS = re.compile(r'[*?\[]')
+
+
+def _last_extension(name: str) -> str:
+    """Partie du nom à partir du dernier point ('' sans point)."""
+    position = name.rfind('.')
+    return name[position:] if position >= 0 else ''
+
+
+class ExclusionRules:
+    """
+    Moteur d'exclusion partagé par le scan local et l'upload.
+
+    Reprend les règles de [FileExclusion] et [BinaryDetection], dans cet ordre
+    de priorité : nom de fichier exclu, motif exclu (fnmatch), extension
+    binaire (rejet), extension texte (acceptation sans analyse de contenu).
+
+    Les motifs sont compilés à la construction :
+    - sans joker (ex : 'yarn.lock') : ensemble de noms ;
+    - '*' suivi d'un suffixe littéral (ex : '*.min.js', '*-lock.json') : table
+      indexée par l'extension finale du suffixe, seuls les suffixes de
+      l'extension du fichier sont testés ;
+    - autres motifs : une seule expression régulière (alternative de
+      fnmatch.translate) ; en cas de correspondance, le motif est identifié
+      parmi ceux de l'expression.
+
+    La casse des motifs suit fnmatch.fnmatch (os.path.normcase : insensible
+    sous Windows) ; les noms exclus sont comparés tels quels.
+    """
+
+    def __init__(self, file_blacklist: Iterable[str] = (), pattern_blacklist: Iterable[str] = (),
+                 binary_blacklist: Iterable[str] = (), binary_whitelist: Iterable[str] = ()):
+        self.file_blacklist = set(file_blacklist)
+        self.binary_blacklist = {ext.lower(): ext for ext in binary_blacklist}
+        self.binary_whitelist = {ext.lower(): ext for ext in binary_whitelist}
+        self.patterns: List[str] = list(dict.fromkeys(pattern_blacklist))
+
+        self._literal_patterns: Dict[str, int] = {}
+        self._suffix_patterns: Dict[str, List[Tuple[str, int]]] = {}
+        self._plain_suffixes: List[Tuple[str, int]] = []  # Suffixes sans point (ex : '*~')
+        self._regex_patterns: List[Tuple[re.Pattern, int]] = []
+        for position, pattern in enumerate(self.patterns):
+            normalized = os.path.normcase(pattern)
+            suffix = normalized[1:]
+            if not _WILDCARDS.search(normalized):
+                self._literal_patterns.setdefault(normalized, position)
+            elif normalized.startswith('*') and not _WILDCARDS.search(suffix):
+                if '.' in suffix:
+                    self._suffix_patterns.setdefault(_last_extension(suffix), []).append((suffix, position))
+                else:
+                    self._plain_suffixes.append((suffix, position))
+            else:
+                self._regex_patterns.append((re.compile(fnmatch.translate(normalized)), position))
+        self._regex = re.compile('|'.join(regex.pattern for regex, _ in self._regex_patterns)) \
+            if self._regex_patterns else None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ExclusionRules':
+        """Construit le moteur depuis la configuration du FileService."""
+        return cls(
+            file_blacklist=config.get('file_blacklist', ()),
+            pattern_blacklist=config.get('pattern_blacklist', ()),
+            binary_blacklist=config.get('binary_blacklist', ()),
+            binary_whitelist=config.get('binary_whitelist', ())
+        )
+
+    def match_pattern(self, filename: str) -> Optional[str]:
+        """Retourne le premier motif (ordre de la configuration) qui correspond au nom, ou None."""
+        name = os.path.normcase(filename)
+        best = self._literal_patterns.get(name)
+        for suffixes in (self._suffix_patterns.get(_last_extension(name), ()), self._plain_suffixes):
+            for suffix, position in suffixes:
+                if (best is None or position < best) and name.endswith(suffix):
+                    best = position
+        if self._regex is not None and self._regex.match(name):
+            # Correspondance rare : identifier le premier motif concerné
+            for regex, position in self._regex_patterns:
+                if best is not None and position > best:
+                    break
+                if regex.match(name):
+                    best = position
+                    break
+        return None if best is None else self.patterns[best]
+
+    def decide(self, filename: str) -> Tuple[Optional[bool], Optional[ExclusionRule]]:
+        """
+        Décide du sort d'un fichier d'après son nom.
+
+        Returns:
+            (verdict, règle) : verdict False si le fichier est exclu, True s'il
+            est accepté sans analyse (extension texte), None si son contenu
+            doit être analysé ; règle est None dans ce dernier cas
+        """
+        if filename in self.file_blacklist:
+            return False, ExclusionRule('file_blacklist', filename)
+
+        pattern = self.match_pattern(filename)
+        if pattern is not None:
+            return False, ExclusionRule('pattern_blacklist', pattern)
+
+        ext = os.path.splitext(filename)[1].lower()
+        if ext in self.binary_blacklist:
+            return False, ExclusionRule('binary_blacklist', self.binary_blacklist[ext])
+        if ext in self.binary_whitelist:
+            return True, ExclusionRule('binary_whitelist', self.binary_whitelist[ext])
+        return None, None
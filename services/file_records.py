@@ -0,0 +1,102 @@
+"""Représentation compacte des fichiers scannés."""
+
+import os
+from operator import attrgetter
+from collections.abc import Mapping
+from typing import Dict
+
+
+class FileRecord(Mapping):
+    """
+    Enregistrement d'un fichier scanné, en lecture seule.
+
+    Remplace le dictionnaire à six clés produit par les parcours : seuls le
+    nom, la taille, le mtime et l'inode sont propres au fichier. La racine et
+    le répertoire relatif sont des chaînes partagées par tous les fichiers
+    d'un même répertoire ; ``relative_path`` et ``absolute_path`` sont
+    recalculés à la demande.
+
+    L'enregistrement se comporte comme un dict en lecture (``record['size']``,
+    ``record.get('mtime', 0)``, ``dict(record)``, égalité avec un dict), ce qui
+    le rend transparent pour les appelants existants.
+    """
+
+    __slots__ = ('root', 'directory', 'name', 'size', 'mtime', 'inode')
+
+    KEYS = ('absolute_path', 'relative_path', 'name', 'size', 'mtime', 'inode')
+
+    def __init__(self, root: str, directory: str, name: str,
+                 size: int, mtime: float, inode: int = 0):
+        """
+        Args:
+            root: Répertoire scanné (chaîne partagée par tout le scan)
+            directory: Répertoire relatif POSIX du fichier ('' à la racine), partagé par répertoire
+            name: Nom du fichier
+            size: Taille en octets
+            mtime: Date de modification
+            inode: Numéro d'inode (signature de l'index de scan)
+        """
+        self.root = root
+        self.directory = directory
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.inode = inode
+
+    @property
+    def relative_path(self) -> str:
+        return f"{self.directory}/{self.name}" if self.directory else self.name
+
+    @property
+    def absolute_path(self) -> str:
+        relative = self.relative_path
+        if os.sep != '/':
+            relative = relative.replace('/', os.sep)
+        # Même convention que le parcours : pas de préfixe './' pour le répertoire courant
+        return relative if self.root == '.' else os.path.join(self.root, relative)
+
+    def __getitem__(self, key: str):
+        try:
+            getter = _GETTERS[key]
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        return getter(self)
+
+    def __contains__(self, key) -> bool:
+        return key in self.KEYS
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"FileRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        return (FileRecord, (self.root, self.directory, self.name, self.size, self.mtime, self.inode))
+
+
+# Accesseurs par clé, résolus une seule fois
+_GETTERS = {key: attrgetter(key) for key in FileRecord.KEYS}
+
+
+class DirectoryInterner:
+    """
+    Partage une seule instance de chaîne par répertoire relatif.
+
+    Utile lorsque les chemins arrivent sous forme de chaînes indépendantes
+    (ex : sortie de ``git ls-files``), pour que les fichiers d'un même
+    répertoire référencent la même chaîne.
+    """
+
+    __slots__ = ('_directories',)
+
+    def __init__(self):
+        self._directories: Dict[str, str] = {}
+
+    def split(self, relative_path: str):
+        """Retourne (répertoire partagé, nom) pour un chemin relatif POSIX."""
+        directory, _, name = relative_path.rpartition('/')
+        return self._directories.setdefault(directory, directory), name
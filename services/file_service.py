@@ -1,55 +1,106 @@
 import os
+import stat
+import time
 import logging
+import threading
 import pathspec
 from pathspec.patterns import GitWildMatchPattern
 from pathlib import Path
-import fnmatch
-import re
-from typing import Dict, Any, Optional, List, Tuple
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Iterator, Iterable, Set, Callable
+from concurrent.futures import ThreadPoolExecutor
 from .base_service import BaseService
-from .exceptions import FileServiceException
+from .exceptions import FileServiceException, ScanCancelledException
+from .scan_index import ScanIndex
+from .directory_walker import ParallelDirectoryWalker
+from .large_files import LargeFilePolicy, decode_text
+from .file_records import FileRecord, DirectoryInterner
+from .scan_jobs import ScanProgress
+from .scan_control import ScanLimits
+from .binary_detection import BinaryClassifier
+from .exclusion_rules import ExclusionRules
+from .content_hash import hash_file, hash_bytes, hash_text
+from .secret_scanner import DEFAULT_SCANNER
+from .secret_findings import SecretFinding, SecretFindingsStore
+from .masking_cache import MaskingCache
+from .file_watcher import FileWatcher, ROOT_CHANGED
+from .ignore_rules import HierarchicalIgnoreMatcher, IgnoreRulesCache, CompiledIgnoreRules, DEFAULT_IGNORE_PATTERNS
 
 
 # Import optionnel de detect-secrets
 try:
     from detect_secrets import SecretsCollection
     from detect_secrets.plugins import initialize as initialize_detect_secrets_plugins
+    from detect_secrets.__version__ import VERSION as DETECT_SECRETS_VERSION
     HAS_DETECT_SECRETS = True
 except ImportError:
     logging.warning("detect-secrets library not found. Secret masking will be disabled.")
     HAS_DETECT_SECRETS = False
+    SecretsCollection = None
+    initialize_detect_secrets_plugins = None
+    DETECT_SECRETS_VERSION = None
 
 
 class FileService(BaseService):
     """Service pour gérer les opérations sur les fichiers et répertoires."""
     
-    def __init__(self, config: Dict[str, Any], logger: Optional[logging.Logger] = None):
+    SCAN_BACKENDS = ('auto', 'git', 'walk')
+    
+    def __init__(self, config: Dict[str, Any], logger: Optional[logging.Logger] = None,
+                 git_service=None):
         """
         Initialise le service de fichiers.
         
         Args:
             config: Dictionnaire de configuration
             logger: Logger optionnel
+            git_service: GitService optionnel, utilisé par le backend de scan 'git'
         """
         super().__init__(config, logger)
+        self.git_service = git_service
         self.gitignore_cache = {}  # Cache pour les specs gitignore
+        self.ignore_rules_cache = IgnoreRulesCache(self.logger)  # Règles compilées par (chemin, mtime)
         self.file_cache = []  # Cache des fichiers scannés
         self.current_directory = None  # Répertoire actuellement scanné
+        self.scan_index = None  # Index persistant du projet courant
+        self.large_file_policy = LargeFilePolicy.from_config(config)  # Lecture des gros fichiers
+        self.exclusion_rules = ExclusionRules.from_config(config)  # Listes d'exclusion compilées
+        self._file_index = {}  # relative_path -> enregistrement de la liste indexée
+        self._file_index_source = None  # Liste indexée (comparée par identité)
+        self._file_index_size = 0
+        self.watcher = None  # Surveillance du projet courant (start_watching)
+        self._state_lock = threading.RLock()  # Protège file_cache et l'index pendant les mises à jour
+        self._secret_plugins = None  # Plugins detect-secrets, initialisés une seule fois
+        self._secret_plugins_version = None
+        self._secret_plugins_lock = threading.Lock()
+        # (empreinte, mode, chemin, version des détecteurs) -> résultat de mask_secrets,
+        # borné par config['secrets_cache_mb']
+        self._masking_cache = MaskingCache(self._get_int_config('secrets_cache_mb', 64) * 1024 * 1024, self.logger)
+        self._findings_store = None  # Secrets détectés du projet courant (voir scan_secret_findings)
+        self._findings_scan_lock = threading.Lock()  # Une seule analyse des secrets à la fois
         
     def validate_config(self):
         """Valide la configuration du service."""
         # Pas de validation spécifique requise pour l'instant
         pass
     
-    def scan_local_directory(self, directory_path: str) -> Dict[str, Any]:
+    def scan_local_directory(self, directory_path: str,
+                             progress: Optional[ScanProgress] = None) -> Dict[str, Any]:
         """
         Scanne un répertoire local et applique les règles .gitignore.
         
         Args:
             directory_path: Le chemin du répertoire à scanner
+            progress: Suivi optionnel (scan progressif) : reçoit les compteurs et
+                      les fichiers retenus par lots, et permet l'annulation
             
         Returns:
-            Dict contenant les informations du scan
+            Dict contenant les informations du scan. Si une limite de scan
+            (scan_max_files, scan_max_depth, scan_max_seconds) est atteinte, les
+            résultats sont partiels et response_for_frontend['truncated'] vaut True
+            
+        Raises:
+            ScanCancelledException: Si le scan a été annulé via progress
         """
         try:
             if not directory_path or not os.path.exists(directory_path):
@@ -62,18 +113,61 @@ class FileService(BaseService):
                 }
             
             self.logger.info(f"Début du scan local du répertoire: {directory_path}")
+            timings = {}
+            phase_start = scan_start = time.perf_counter()
+            
+            def end_phase(name):
+                nonlocal phase_start
+                now = time.perf_counter()
+                timings[name] = round(now - phase_start, 4)
+                phase_start = now
+            
+            # Un nouveau scan remplace la surveillance du projet précédent
+            self.stop_watching()
+            
+            # Jeton d'arrêt commun à toutes les phases (annulation et limites)
+            if progress is None:
+                progress = ScanProgress()
+            token = progress.token.start(ScanLimits.from_config(self.config))
             
             # Charger les règles .gitignore
             gitignore_spec = self._load_gitignore_spec(directory_path)
+            end_phase('gitignore')
+            
+            # Scanner les fichiers : index git si possible, sinon parcours avec élagage
+            progress.set_phase('walk')
+            scanned_files = None
+            scan_backend = 'walk'
+            if self._get_scan_backend() != 'walk':
+                scanned_files = self._scan_files_with_git_index(directory_path, progress)
+                if scanned_files is not None:
+                    scan_backend = 'git'
+            if scanned_files is None:
+                scanned_files = self._scan_files_with_gitignore(directory_path, gitignore_spec, progress)
+            end_phase('walk')
             
-            # Scanner les fichiers
-            scanned_files = self._scan_files_with_gitignore(directory_path, gitignore_spec)
+            # Comparer au scan précédent pour réutiliser les verdicts binaires
+            # (un parcours tronqué ne doit pas effacer les entrées non visitées)
+            self.scan_index = self._open_scan_index(directory_path)
+            index_stats = self.scan_index.reconcile(scanned_files, partial=token.truncation()['truncated'])
+            end_phase('index')
             
             # Filtrer les fichiers binaires
-            filtered_files = self._filter_binary_files(scanned_files)
+            progress.set_phase('binary_filter')
+            filtered_files = self._filter_binary_files(scanned_files, progress)
+            end_phase('binary_filter')
+            truncation = token.truncation()
+            if truncation['truncated']:
+                self.logger.warning(
+                    f"Scan tronqué ({', '.join(truncation['reasons'])}): "
+                    f"{len(filtered_files)} fichiers retenus — limites {truncation['limits']}"
+                )
+            self.scan_index.save()
+            end_phase('index_save')
+            timings['total'] = round(time.perf_counter() - scan_start, 4)
             
             # Préparer la structure pour l'affichage (inclure mtime)
-            file_tree_data = [{"path": f["relative_path"], "size": f["size"], "mtime": f.get("mtime", 0)} for f in filtered_files]
+            file_tree_data = [self._frontend_entry(f) for f in filtered_files]
             
             # Calculer les fichiers les plus volumineux (top 10)
             largest_files = sorted(filtered_files, key=lambda f: f['size'], reverse=True)[:10]
@@ -86,11 +180,18 @@ class FileService(BaseService):
                 for f in largest_files
             ]
             
-            self.logger.info(f"Scan terminé: {len(filtered_files)} fichiers trouvés")
+            self.logger.info(
+                f"Scan terminé: {len(filtered_files)} fichiers trouvés "
+                f"(index: {index_stats['unchanged']} inchangés, {index_stats['modified']} modifiés, "
+                f"{index_stats['added']} ajoutés, {index_stats['removed']} supprimés)"
+            )
+            self.logger.info(f"Durées du scan (s): {timings}")
             
             # Mettre à jour l'état interne
-            self.file_cache = filtered_files
-            self.current_directory = directory_path
+            with self._state_lock:
+                self.file_cache = filtered_files
+                self.current_directory = directory_path
+                self._get_file_index(filtered_files)
             
             return {
                 'success': True,
@@ -103,17 +204,31 @@ class FileService(BaseService):
                     'directory': directory_path,
                     'total_files': len(filtered_files),
                     'largest_files': largest_files_data,  # NOUVELLE DONNÉE
+                    'index_stats': index_stats,
+                    'truncated': truncation['truncated'],
+                    'truncation': truncation,
                     'debug': {
-                        'gitignore_patterns_count': len(gitignore_spec.patterns) if hasattr(gitignore_spec, 'patterns') else 0
+                        'gitignore_patterns_count': len(gitignore_spec.patterns) if hasattr(gitignore_spec, 'patterns') else 0,
+                        'scan_workers': self._get_scan_workers(),
+                        'scan_backend': scan_backend,
+                        'timings': timings
                     }
                 }
             }
             
+        except ScanCancelledException:
+            self.logger.info(f"Scan annulé: {directory_path}")
+            raise
         except Exception as e:
             error_msg = f"Erreur lors du scan du répertoire: {str(e)}"
             self.logger.error(error_msg)
             raise FileServiceException(error_msg)
     
+    @staticmethod
+    def _frontend_entry(file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Représentation d'un fichier scanné pour l'interface."""
+        return {"path": file_info["relative_path"], "size": file_info["size"], "mtime": file_info.get("mtime", 0)}
+    
     def get_file_content(self, relative_path: str, current_directory: Optional[str] = None, 
                         file_cache: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
@@ -140,6 +255,10 @@ class FileService(BaseService):
             - content (str): Le contenu du fichier (si succès)
             - path (str): Le chemin relatif du fichier (si succès)
             - size (int): La taille du fichier (si succès)
+            - truncated (bool): True si seul un extrait début/fin est renvoyé (gros fichier)
+            - line_count (int): Nombre de lignes du fichier complet (gros fichiers uniquement)
+            - content_hash (str): Empreinte des octets lus sur disque, au format de
+              get_content_hashes : clé des caches alimentés par cette lecture (si succès)
             - error (str): Message d'erreur (si échec)
         """
         try:
@@ -153,20 +272,25 @@ class FileService(BaseService):
                 return {'success': False, 'error': 'Aucun répertoire spécifié'}
             
             # Trouver le fichier dans le cache
-            file_info = next((f for f in file_cache if f['relative_path'] == relative_path), None)
+            file_info = self._get_file_index(file_cache).get(relative_path)
             
             if not file_info:
                 return {'success': False, 'error': f'Fichier non trouvé: {relative_path}'}
             
-            # Lire le contenu
-            with open(file_info['absolute_path'], 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            # Gros fichier : mmap, plafond de taille et extrait début/fin
+            if self.large_file_policy.needs_special_read(file_info['size']):
+                return self._read_large_file(relative_path, file_info)
+            
+            # Lire le contenu : l'empreinte porte sur les octets lus, avant décodage
+            with open(file_info['absolute_path'], 'rb') as f:
+                data = f.read()
             
             return {
                 'success': True,
-                'content': content,
+                'content': decode_text(data),
                 'path': relative_path,
-                'size': file_info['size']
+                'size': file_info['size'],
+                'content_hash': hash_bytes(data)
             }
             
         except Exception as e:
@@ -174,6 +298,46 @@ class FileService(BaseService):
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
+    def _read_large_file(self, relative_path: str, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Lit un fichier volumineux selon self.large_file_policy (voir get_file_content)."""
+        read = self.large_file_policy.read(file_info['absolute_path'])
+        if read['skipped']:
+            return {
+                'success': False,
+                'error': (f"Fichier trop volumineux ignoré: {relative_path} "
+                          f"({read['size']} octets > {self.large_file_policy.max_file_bytes})"),
+                'skipped': True
+            }
+        if read['truncated']:
+            self.logger.info(f"Extrait début/fin de {relative_path} ({read['size']} octets, {read['line_count']} lignes)")
+        return {
+            'success': True,
+            'content': read['content'],
+            'path': relative_path,
+            'size': read['size'],
+            'truncated': read['truncated'],
+            'line_count': read['line_count'],
+            'content_hash': read['content_hash']
+        }
+    
+    def _get_file_index(self, file_cache: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retourne l'index relative_path -> enregistrement de file_cache.
+        
+        L'index est construit une fois par liste et réutilisé tant que la même
+        liste (même objet, même longueur) est passée : un scan ou l'affectation
+        d'une nouvelle liste à file_cache provoque sa reconstruction.
+        """
+        if file_cache is not self._file_index_source or len(file_cache) != self._file_index_size:
+            index = {}
+            for file_info in file_cache:
+                # En cas de doublon, le premier enregistrement l'emporte (comme un parcours linéaire)
+                index.setdefault(file_info['relative_path'], file_info)
+            self._file_index = index
+            self._file_index_source = file_cache
+            self._file_index_size = len(file_cache)
+        return self._file_index
+    
     def get_file_contents_batch(self, selected_files: List[str], current_directory: Optional[str] = None,
                               file_cache: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
@@ -214,10 +378,12 @@ class FileService(BaseService):
             
             file_contents = []
             failed_files = []
+            skipped_budget = 0
             
-            # Récupérer le contenu de chaque fichier
-            for file_path in selected_files:
-                file_result = self.get_file_content(file_path, current_directory, file_cache)
+            # Récupérer le contenu des fichiers (lectures concurrentes, résultats dans l'ordre)
+            for file_path, file_result in self.iter_file_contents(selected_files, current_directory, file_cache):
+                if file_result.get('budget_exceeded'):
+                    skipped_budget += 1
                 if file_result['success']:
                     content = file_result['content']
                     file_contents.append({
@@ -239,7 +405,8 @@ class FileService(BaseService):
                 'stats': {
                     'requested': len(selected_files),
                     'successful': len(file_contents),
-                    'failed': len(failed_files)
+                    'failed': len(failed_files),
+                    'skipped_budget': skipped_budget
                 }
             }
             
@@ -248,15 +415,417 @@ class FileService(BaseService):
             self.logger.error(error_msg)
             return {'success': False, 'error': error_msg}
     
-    def _load_gitignore_spec(self, directory_path: str) -> pathspec.PathSpec:
-        """Charge les règles .gitignore depuis le répertoire."""
+    def iter_file_contents(self, selected_files: List[str], current_directory: Optional[str] = None,
+                           file_cache: Optional[List[Dict[str, Any]]] = None,
+                           max_workers: Optional[int] = None,
+                           max_total_bytes: Optional[int] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Lit les fichiers sélectionnés en parallèle et produit les résultats au fil de l'eau.
+        
+        Les lectures sont confiées à un pool de threads borné ; au plus deux
+        lectures par thread sont en cours ou en attente, ce qui limite la mémoire
+        même pour de très grandes sélections. Les résultats sont produits dans
+        l'ordre de selected_files, dès que le fichier suivant est lu : l'appelant
+        peut commencer à les traiter avant la fin des lectures.
+        
+        Le budget total (en octets, d'après la taille connue au scan) est
+        appliqué avant lecture : dès qu'un fichier le dépasserait, lui et les
+        suivants ne sont pas lus et sont signalés avec budget_exceeded=True.
+        
+        Args:
+            selected_files: Liste des chemins relatifs à lire
+            current_directory: Le répertoire de base (utilise self.current_directory si None)
+            file_cache: Le cache des fichiers (utilise self.file_cache si None)
+            max_workers: Nombre de lectures simultanées (config['read_workers'] si None)
+            max_total_bytes: Budget total en octets (config['max_read_bytes'] si None, 0 = illimité)
+            
+        Yields:
+            Tuples (chemin relatif, résultat au format de get_file_content)
+        """
+        if current_directory is None:
+            current_directory = self.current_directory
+        if file_cache is None:
+            file_cache = self.file_cache
+        if max_workers is None:
+            max_workers = self._get_int_config('read_workers', 8)
+        if max_total_bytes is None:
+            max_total_bytes = self._get_int_config('max_read_bytes', 0)
+        
+        # Construire l'index ici : les threads de lecture ne font que le consulter
+        file_index = self._get_file_index(file_cache)
+        budget_used = 0
+        budget_exceeded = False
+        
+        def budget_result() -> Dict[str, Any]:
+            return {
+                'success': False,
+                'error': f'Budget de lecture dépassé ({max_total_bytes} octets)',
+                'budget_exceeded': True
+            }
+        
+        def admit(file_path: str) -> bool:
+            """Réserve la taille du fichier dans le budget."""
+            nonlocal budget_used, budget_exceeded
+            if budget_exceeded:
+                return False
+            if max_total_bytes > 0:
+                file_info = file_index.get(file_path)
+                size = file_info.get('size', 0) if file_info else 0
+                if budget_used + size > max_total_bytes:
+                    budget_exceeded = True
+                    self.logger.warning(
+                        f"Budget de lecture atteint ({budget_used}/{max_total_bytes} octets) "
+                        f"à partir de {file_path}"
+                    )
+                    return False
+                budget_used += size
+            return True
+        
+        if max_workers <= 1 or len(selected_files) <= 1:
+            for file_path in selected_files:
+                if admit(file_path):
+                    yield file_path, self.get_file_content(file_path, current_directory, file_cache)
+                else:
+                    yield file_path, budget_result()
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = deque()  # (chemin, future ou None si hors budget), dans l'ordre de sélection
+            selection = iter(selected_files)
+            window = max_workers * 2
+            
+            def fill():
+                while len(in_flight) < window:
+                    file_path = next(selection, None)
+                    if file_path is None:
+                        return
+                    future = None
+                    if admit(file_path):
+                        future = executor.submit(self.get_file_content, file_path, current_directory, file_cache)
+                    in_flight.append((file_path, future))
+            
+            try:
+                fill()
+                while in_flight:
+                    file_path, future = in_flight.popleft()
+                    file_result = future.result() if future is not None else budget_result()
+                    fill()
+                    yield file_path, file_result
+            finally:
+                # Consommateur interrompu : abandonner les lectures pas encore démarrées
+                for _, future in in_flight:
+                    if future is not None:
+                        future.cancel()
+    
+    def get_content_hash(self, relative_path: str, current_directory: Optional[str] = None) -> Optional[str]:
+        """
+        Empreinte du contenu d'un fichier, pour servir de clé aux caches des autres services.
+        
+        Voir get_content_hashes.
+        
+        Returns:
+            L'empreinte '<algorithme>:<hex>', ou None si le fichier est illisible
+        """
+        return self.get_content_hashes([relative_path], current_directory).get(relative_path)
+    
+    def get_content_hashes(self, relative_paths: List[str], current_directory: Optional[str] = None,
+                           max_workers: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """
+        Empreintes du contenu de plusieurs fichiers, calculées à la demande et en parallèle.
+        
+        La signature (taille, mtime, inode) de chaque fichier est relue sur
+        disque : l'empreinte mémorisée dans l'index de scan n'est réutilisée
+        que si le fichier n'a pas changé depuis son calcul. Les nouvelles
+        empreintes sont enregistrées dans l'index du projet courant.
+        
+        Args:
+            relative_paths: Chemins relatifs (POSIX) des fichiers
+            current_directory: Répertoire du projet (par défaut, le projet scanné)
+            max_workers: Nombre de fichiers lus simultanément (défaut: config['read_workers'])
+            
+        Returns:
+            Dict chemin relatif -> empreinte (None si le fichier est illisible)
+        """
+        directory = current_directory or self.current_directory
+        if not directory:
+            return {path: None for path in relative_paths}
+        # L'index n'est utilisé que pour le projet scanné
+        scan_index = self.scan_index if directory == self.current_directory else None
+        
+        def compute(relative_path: str):
+            absolute_path = os.path.join(directory, *relative_path.split('/'))
+            try:
+                file_stat = os.stat(absolute_path)
+                if not stat.S_ISREG(file_stat.st_mode):
+                    return relative_path, None, None, False
+                signature = (file_stat.st_size, file_stat.st_mtime, file_stat.st_ino)
+                cached = scan_index.get_hash(relative_path, signature) if scan_index else None
+                if cached is not None:
+                    return relative_path, signature, cached, False
+                return relative_path, signature, hash_file(absolute_path), True
+            except OSError as e:
+                self.logger.warning(f"Empreinte impossible pour {relative_path}: {e}")
+                return relative_path, None, None, False
+        
+        paths = list(dict.fromkeys(relative_paths))
+        workers = min(max_workers or self._get_int_config('read_workers', 8) or 1, len(paths))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(compute, paths))
+        else:
+            results = [compute(path) for path in paths]
+        
+        hashes = {}
+        computed = 0
+        with self._state_lock:
+            for relative_path, signature, content_hash, is_new in results:
+                hashes[relative_path] = content_hash
+                if is_new and scan_index is not None:
+                    scan_index.set_hash(relative_path, signature, content_hash)
+                    computed += 1
+            if computed:
+                scan_index.save()
+        if computed and self.config.get('debug'):
+            self.logger.debug(f"Empreintes: {computed} calculées, {len(paths) - computed} réutilisées ou absentes")
+        return hashes
+    
+    def start_watching(self, on_delta: Callable[[Dict[str, Any]], None]) -> Optional[str]:
+        """
+        Surveille le projet scanné et applique les changements à file_cache au fil de l'eau.
+        
+        Backend config['watch_backend'] : 'inotify' (Linux), 'polling' (comparaison
+        périodique avec l'index de scan) ou 'auto'. Les événements sont regroupés
+        pendant config['watch_debounce_ms'] ms avant d'être appliqués.
+        
+        Args:
+            on_delta: Reçoit chaque delta non vide produit par apply_changes
+            
+        Returns:
+            Le nom du backend utilisé, ou None si aucun projet n'est scanné
+        """
+        self.stop_watching()
+        if not self.current_directory:
+            return None
+        
+        def on_changes(paths: Set[str]):
+            delta = self.apply_changes(paths)
+            if delta['count']:
+                on_delta(delta)
+        
+        try:
+            poll_interval = float(self.config.get('watch_poll_interval', 2.0))
+        except (TypeError, ValueError):
+            poll_interval = 2.0
+        watcher = FileWatcher(
+            self.current_directory, on_changes,
+            ignore_spec=self._load_gitignore_spec(self.current_directory),
+            detect_changes=self._detect_changes_from_index,
+            backend=str(self.config.get('watch_backend', 'auto')).strip().lower(),
+            debounce=self._get_int_config('watch_debounce_ms', 500) / 1000,
+            poll_interval=poll_interval,
+            logger=self.logger
+        )
+        self.watcher = watcher.start()
+        return watcher.backend_name
+    
+    def stop_watching(self):
+        """Arrête la surveillance du projet, si elle est active."""
+        watcher, self.watcher = self.watcher, None
+        if watcher:
+            watcher.stop()
+    
+    def _detect_changes_from_index(self) -> Set[str]:
+        """
+        Backend polling : parcourt le projet et compare les signatures à l'index de scan.
+        
+        Returns:
+            Les chemins relatifs ajoutés, modifiés ou supprimés depuis la dernière mise à jour
+        """
+        with self._state_lock:
+            directory_path = self.current_directory
+            scan_index = self.scan_index
+        if not directory_path or scan_index is None:
+            return set()
+        spec = self._load_gitignore_spec(directory_path)
+        current = {f['relative_path']: f for f in self._scan_files_with_gitignore(directory_path, spec)}
+        changed = set()
+        for rel_path, file_info in current.items():
+            entry = scan_index.entries.get(rel_path)
+            if entry is None or entry['sig'] != list(scan_index.signature(file_info)):
+                changed.add(rel_path)
+        changed.update(path for path in list(scan_index.entries) if path not in current)
+        return changed
+    
+    def apply_changes(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """
+        Applique à file_cache et à l'index de scan les changements de quelques chemins.
+        
+        Chaque chemin relatif peut désigner un fichier (ajouté, modifié ou
+        supprimé) ou un répertoire, dont le contenu est alors réexaminé.
+        ROOT_CHANGED ('') réexamine tout le projet. Les règles d'exclusion et le
+        filtre binaire sont ceux du scan complet. file_cache est modifiée en
+        place : les références partagées restent synchronisées.
+        
+        Returns:
+            Dict avec les clés :
+            - added (list): Entrées {path, size, mtime} des fichiers ajoutés
+            - modified (list): Entrées des fichiers modifiés
+            - removed (list): Chemins relatifs des fichiers retirés
+            - count (int): Nombre total de changements
+        """
+        with self._state_lock:
+            directory_path = self.current_directory
+            delta = {'added': [], 'modified': [], 'removed': [], 'count': 0}
+            if not directory_path:
+                return delta
+            if self.scan_index is None:
+                self.scan_index = self._open_scan_index(directory_path)
+            spec = self._load_gitignore_spec(directory_path)
+            
+            paths = set(paths)
+            # Un .gitignore modifié peut changer le sort de tout son répertoire
+            paths.update(p.rpartition('/')[0] for p in list(paths) if p.rpartition('/')[2] == '.gitignore')
+            if ROOT_CHANGED in paths:
+                paths = {ROOT_CHANGED}
+            
+            current = self._get_file_index(self.file_cache)
+            known = set(current) | set(self.scan_index.entries)
+            found: Dict[str, FileRecord] = {}
+            gone = set()
+            root_abs = str(Path(directory_path))
+            for rel_path in sorted(paths):
+                abs_path = os.path.join(root_abs, *rel_path.split('/')) if rel_path else root_abs
+                try:
+                    file_stat = os.stat(abs_path)
+                except OSError:
+                    file_stat = None
+                # Comme le parcours : les liens vers des répertoires ne sont pas suivis
+                is_dir = file_stat is not None and stat.S_ISDIR(file_stat.st_mode) and not os.path.islink(abs_path)
+                is_file = file_stat is not None and stat.S_ISREG(file_stat.st_mode)
+                if rel_path and self._is_path_ignored(spec, rel_path, is_dir):
+                    is_dir = is_file = False
+                if is_dir:
+                    subtree = {r.relative_path: r for r in self._scan_subtree(root_abs, rel_path, spec)}
+                    found.update(subtree)
+                    prefix = rel_path + '/' if rel_path else ''
+                    gone.update(p for p in known if p.startswith(prefix) and p not in subtree)
+                elif is_file:
+                    directory, _, name = rel_path.rpartition('/')
+                    found[rel_path] = FileRecord(root_abs, directory, name, file_stat.st_size,
+                                                 file_stat.st_mtime, file_stat.st_ino)
+                else:
+                    # Supprimé, exclu ou devenu autre chose qu'un fichier
+                    gone.add(rel_path)
+                    gone.update(p for p in known if p.startswith(rel_path + '/'))
+            gone.difference_update(found)
+            
+            # Seuls les fichiers dont la signature a changé repassent par le filtre binaire
+            changed = [
+                record for rel_path, record in found.items()
+                if rel_path not in current
+                or self.scan_index.signature(current[rel_path]) != self.scan_index.signature(record)
+            ]
+            self.scan_index.update(changed)
+            kept = {f['relative_path']: f for f in self._filter_binary_files(changed)}
+            removed = {p for p in gone if p in current}
+            removed.update(r.relative_path for r in changed if r.relative_path in current and r.relative_path not in kept)
+            modified = {p: f for p, f in kept.items() if p in current}
+            added = [f for p, f in kept.items() if p not in current]
+            self.scan_index.remove(gone)
+            
+            if removed or modified or added:
+                updated = [
+                    modified.get(f['relative_path'], f) for f in self.file_cache
+                    if f['relative_path'] not in removed
+                ]
+                updated.extend(added)
+                self.file_cache[:] = updated
+                self._file_index_source = None  # Index reconstruit à la prochaine lecture
+            self.scan_index.save()
+        
+        delta['added'] = [self._frontend_entry(f) for f in added]
+        delta['modified'] = [self._frontend_entry(f) for f in modified.values()]
+        delta['removed'] = sorted(removed)
+        delta['count'] = len(added) + len(modified) + len(removed)
+        if delta['count']:
+            self.logger.info(
+                f"Changements appliqués: {len(added)} ajoutés, {len(modified)} modifiés, {len(removed)} retirés"
+            )
+        return delta
+    
+    @staticmethod
+    def _is_path_ignored(spec, rel_path: str, is_dir: bool) -> bool:
+        """Indique si un chemin, ou l'un de ses répertoires parents, est exclu."""
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if spec.match_file('/'.join(parts[:depth]) + '/'):
+                return True
+        return spec.match_file(rel_path + '/' if is_dir else rel_path)
+    
+    def _scan_subtree(self, root_abs: str, rel_dir: str, spec) -> List[FileRecord]:
+        """Liste les fichiers non exclus d'un sous-répertoire du projet."""
+        walker = ParallelDirectoryWalker(1, self.logger)
+        records = []
+        pending = [(rel_dir, os.path.join(root_abs, *rel_dir.split('/')) if rel_dir else root_abs)]
+        while pending:
+            current_rel, current_abs = pending.pop()
+            files, subdirs = walker._scan_directory(root_abs, current_rel, current_abs, spec)
+            records.extend(files)
+            pending.extend(subdirs)
+        return records
+    
+    def _get_int_config(self, key: str, default: int) -> int:
+        """Lit un entier positif de la configuration (default si absent ou invalide)."""
+        try:
+            return max(0, int(self.config.get(key, default)))
+        except (TypeError, ValueError):
+            return default
+    
+    def _open_scan_index(self, directory_path: str) -> ScanIndex:
+        """
+        Ouvre l'index de scan persistant du projet.
+        
+        L'index est stocké dans config['scan_index_dir'] ; sans ce paramètre
+        (ou si config['scan_index_enabled'] est faux), il reste en mémoire et
+        ne sert qu'à produire les compteurs du scan.
+        """
+        index_dir = self.config.get('scan_index_dir') if self.config.get('scan_index_enabled', True) else None
+        return ScanIndex(index_dir, directory_path, self.logger).load()
+    
+    def _load_gitignore_spec(self, directory_path: str):
+        """
+        Charge les règles d'exclusion du répertoire.
+        
+        Par défaut, retourne un HierarchicalIgnoreMatcher qui applique les
+        .gitignore imbriqués, .git/info/exclude et le fichier d'exclusion global.
+        Avec config['hierarchical_gitignore'] à False, seul le .gitignore racine
+        est lu (PathSpec unique).
+        """
+        if not self.config.get('hierarchical_gitignore', True):
+            return self._load_root_gitignore_spec(directory_path)
+        
+        matcher = self.gitignore_cache.get(directory_path)
+        if isinstance(matcher, HierarchicalIgnoreMatcher):
+            # Les règles inchangées sont reprises du cache (chemin, mtime)
+            matcher.reset()
+            return matcher
+        
+        matcher = HierarchicalIgnoreMatcher(
+            directory_path, self.ignore_rules_cache,
+            global_excludes_file=self.config.get('global_excludes_file')
+        )
+        self.gitignore_cache[directory_path] = matcher
+        return matcher
+    
+    def _load_root_gitignore_spec(self, directory_path: str) -> pathspec.PathSpec:
+        """Charge les règles du seul .gitignore racine dans un PathSpec."""
         try:
             # Vérifier le cache
             if directory_path in self.gitignore_cache:
                 return self.gitignore_cache[directory_path]
             
             gitignore_path = os.path.join(directory_path, '.gitignore')
-            patterns = ['.git/', '__pycache__/', 'node_modules/', '.vscode/', '.idea/']
+            patterns = list(DEFAULT_IGNORE_PATTERNS)
             
             if os.path.exists(gitignore_path):
                 with open(gitignore_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -279,20 +848,130 @@ class FileService(BaseService):
         except Exception as e:
             self.logger.warning(f"Erreur lors du chargement de .gitignore: {e}")
             # Retourner un spec avec seulement les règles par défaut
-            default_patterns = ['.git/', '__pycache__/', 'node_modules/', '.vscode/', '.idea/']
-            return pathspec.PathSpec.from_lines(GitWildMatchPattern, default_patterns)
+            return pathspec.PathSpec.from_lines(GitWildMatchPattern, DEFAULT_IGNORE_PATTERNS)
+    
+    def _get_scan_backend(self) -> str:
+        """
+        Backend d'énumération des fichiers (config['scan_backend']).
+        
+        - 'auto' / 'git' : index git si le répertoire est un dépôt et qu'un
+          GitService est disponible, sinon parcours du répertoire
+        - 'walk' : toujours parcourir le répertoire
+        """
+        backend = str(self.config.get('scan_backend', 'auto')).strip().lower()
+        if backend not in self.SCAN_BACKENDS:
+            self.logger.warning(f"Backend de scan inconnu '{backend}', utilisation de 'auto'")
+            return 'auto'
+        return backend
+    
+    def _scan_files_with_git_index(self, directory_path: str,
+                                   progress: Optional[ScanProgress] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Énumère les fichiers via `git ls-files` au lieu de parcourir le répertoire.
+        
+        Les règles par défaut (.vscode/, node_modules/...) restent appliquées ;
+        les fichiers listés par git mais absents du disque (suppressions non
+        commitées) et les sous-modules sont ignorés.
+        
+        Returns:
+            Les enregistrements au même format que _scan_files_with_gitignore,
+            ou None si le répertoire n'est pas un dépôt git
+        """
+        if self.git_service is None:
+            if self._get_scan_backend() == 'git':
+                self.logger.warning("Backend de scan 'git' demandé sans GitService, parcours du répertoire")
+            return None
+        
+        relative_paths = self.git_service.list_project_files(directory_path)
+        if relative_paths is None:
+            self.logger.info(f"{directory_path} n'est pas un dépôt git, parcours du répertoire")
+            return None
+        
+        default_rules = CompiledIgnoreRules(DEFAULT_IGNORE_PATTERNS)
+        root_abs = str(Path(directory_path))
+        
+        def stat_record(candidate: Tuple[str, str]) -> Optional[FileRecord]:
+            directory, name = candidate
+            record = FileRecord(root_abs, directory, name, 0, 0.0)
+            try:
+                file_stat = os.stat(record.absolute_path)
+            except OSError:
+                return None  # Fichier suivi mais supprimé du disque
+            if not stat.S_ISREG(file_stat.st_mode):
+                return None  # Sous-module ou lien vers un répertoire
+            record.size = file_stat.st_size
+            record.mtime = file_stat.st_mtime
+            record.inode = file_stat.st_ino
+            return record
+        
+        token = progress.token if progress else None
+        interner = DirectoryInterner()
+        candidates = [interner.split(p) for p in relative_paths if not default_rules.decide(p)]
+        if token is not None and token.limits.max_depth:
+            candidates = [c for c in candidates if not c[0] or token.depth_allowed(c[0])]
+        if progress:
+            progress.files_discovered(len(candidates))
+        
+        # Phase stat par tranches : le jeton d'arrêt est vérifié entre deux tranches
+        scanned_files = []
+        workers = self._get_scan_workers()
+        chunk_size = 1024
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 and len(candidates) > chunk_size else None
+        try:
+            for start in range(0, len(candidates), chunk_size):
+                if token is not None and token.should_stop(len(scanned_files)):
+                    break
+                chunk = candidates[start:start + chunk_size]
+                # Les stat() sont dominés par la latence disque/réseau : les paralléliser
+                records = executor.map(stat_record, chunk) if executor else map(stat_record, chunk)
+                scanned_files.extend(r for r in records if r is not None)
+        finally:
+            if executor:
+                executor.shutdown()
+        if token is not None and token.limits.max_files and len(scanned_files) >= token.limits.max_files:
+            token.should_stop(len(scanned_files))
+            del scanned_files[token.limits.max_files:]
+        
+        self.logger.info(f"Index git: {len(scanned_files)} fichiers listés ({len(relative_paths)} entrées git)")
+        return scanned_files
+    
+    def _get_scan_workers(self) -> int:
+        """Nombre de threads de parcours (config['scan_workers'], 1 = parcours séquentiel)."""
+        try:
+            return max(1, int(self.config.get('scan_workers', 1)))
+        except (TypeError, ValueError):
+            return 1
     
     def _scan_files_with_gitignore(self, directory_path: str, 
-                                  gitignore_spec: pathspec.PathSpec) -> List[Dict[str, Any]]:
+                                  gitignore_spec: pathspec.PathSpec,
+                                  progress: Optional[ScanProgress] = None) -> List[Dict[str, Any]]:
         """
         Scanne récursivement les fichiers en appliquant les règles gitignore
         avec une stratégie d'élagage pour une performance optimale.
+        
+        Avec config['scan_workers'] > 1, le parcours est délégué à
+        ParallelDirectoryWalker, qui produit exactement la même liste.
         """
+        workers = self._get_scan_workers()
+        if workers > 1:
+            walker = ParallelDirectoryWalker(workers, self.logger)
+            scanned_files = walker.walk(directory_path, gitignore_spec, progress)
+            if self.config.get('debug'):
+                self.logger.debug(f"Parcours parallèle: {walker.stats}")
+            return scanned_files
+        
         scanned_files = []
         base_path = Path(directory_path)
+        root_abs = str(base_path)
+        token = progress.token if progress else None
         
         for root, dirs, files in os.walk(directory_path, topdown=True):
+            if token is not None and token.should_stop(len(scanned_files)):
+                break
             root_path = Path(root)
+            rel_dir = root_path.relative_to(base_path).as_posix()
+            if rel_dir == '.':
+                rel_dir = ''
             
             # OPTIMISATION CLÉ : Élagage des répertoires ignorés
             # Approche pythonique : modification en place avec list comprehension
@@ -304,8 +983,16 @@ class FileService(BaseService):
                 )
             ]
             
+            if token is not None and token.limits.max_depth:
+                dirs[:] = [d for d in dirs if token.depth_allowed(f"{rel_dir}/{d}" if rel_dir else d)]
+            
+            if progress:
+                progress.directory_scanned(len(files))
+            
             # Traiter les fichiers du répertoire courant
             for filename in files:
+                if token is not None and token.should_stop(len(scanned_files)):
+                    break
                 file_abs_path = root_path.joinpath(filename)
                 file_rel_path = file_abs_path.relative_to(base_path).as_posix()
                 
@@ -314,13 +1001,10 @@ class FileService(BaseService):
                         file_stat = file_abs_path.stat()
                         file_size = file_stat.st_size
                         file_mtime = file_stat.st_mtime  # Timestamp de modification
-                        scanned_files.append({
-                            'absolute_path': str(file_abs_path),
-                            'relative_path': file_rel_path,
-                            'name': filename,
-                            'size': file_size,
-                            'mtime': file_mtime
-                        })
+                        scanned_files.append(FileRecord(
+                            root_abs, rel_dir, filename, file_size, file_mtime,
+                            file_stat.st_ino  # Pour la signature de l'index de scan
+                        ))
                         
                         if self.config.get('debug') and len(scanned_files) % 1000 == 0:
                             self.logger.debug(f"Scanné {len(scanned_files)} fichiers...")
@@ -331,78 +1015,85 @@ class FileService(BaseService):
         
         return scanned_files
     
-    def _filter_binary_files(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filtre les fichiers binaires basé sur l'extension et le contenu."""
+    def _filter_binary_files(self, files: List[Dict[str, Any]],
+                             progress: Optional[ScanProgress] = None) -> List[Dict[str, Any]]:
+        """
+        Filtre les fichiers binaires basé sur l'extension et le contenu.
+        
+        Les fichiers sont traités par tranches : les échantillons de contenu
+        d'une tranche sont lus en parallèle (config['scan_workers']) puis classés
+        ensemble par BinaryClassifier. Avec un suivi de progression, les fichiers
+        retenus lui sont transmis après chaque tranche ; si une limite de durée
+        est atteinte, les fichiers restants ne sont pas analysés (ni retenus).
+        """
         filtered_files = []
+        published = 0
+        token = progress.token if progress else None
+        classifier = BinaryClassifier(self._get_scan_workers(), logger=self.logger)
+        chunk_size = 256
         
-        for file_info in files:
-            file_path = Path(file_info['absolute_path'])
-            ext = file_path.suffix.lower()
-            filename = file_path.name
-            
-            # Vérifier d'abord les exclusions de fichiers spécifiques
-            if filename in self.config.get('file_blacklist', set()):
-                if self.config.get('debug'):
-                    self.logger.debug(f"Ignoré (fichier dans la blacklist): {file_info['relative_path']}")
-                continue
-            
-            # Vérifier les patterns d'exclusion
-            excluded_by_pattern = False
-            for pattern in self.config.get('pattern_blacklist', []):
-                if fnmatch.fnmatch(filename, pattern):
-                    if self.config.get('debug'):
-                        self.logger.debug(f"Ignoré (correspond au pattern '{pattern}'): {file_info['relative_path']}")
-                    excluded_by_pattern = True
+        for start in range(0, len(files), chunk_size):
+            if start and progress:
+                progress.files_accepted([self._frontend_entry(f) for f in filtered_files[published:]])
+                published = len(filtered_files)
+                if token is not None and token.should_stop():
+                    self.logger.warning(f"Filtre binaire interrompu: {len(files) - start} fichiers non analysés")
                     break
             
-            if excluded_by_pattern:
-                continue
-            
-            # Niveau 1: Liste Noire d'extensions (Rejet Immédiat)
-            if ext in self.config.get('binary_blacklist', set()):
-                if self.config.get('debug'):
-                    self.logger.debug(f"Ignoré (binaire par extension): {file_info['relative_path']}")
-                continue
-                
-            # Niveau 2: Liste Blanche d'extensions (Acceptation immédiate pour .md, .txt, .json)
-            if ext in self.config.get('binary_whitelist', set()):
-                filtered_files.append(file_info)
-                continue
+            chunk = files[start:start + chunk_size]
+            decisions = [self._classify_without_content(file_info) for file_info in chunk]
             
-            # Niveau 3: Test de contenu pour les autres extensions
-            if file_info['size'] > 0:  # Ne pas tester les fichiers vides
-                try:
-                    # Déterminer la taille de l'échantillon (max 8KB pour les gros fichiers)
-                    sample_size = min(file_info['size'], 8192)
-                    
-                    with open(file_info['absolute_path'], 'rb') as f:
-                        sample = f.read(sample_size)
-                    
-                    # Vérifier s'il contient des octets nuls (indicateur fort de binaire)
-                    if b'\x00' in sample:
-                        if self.config.get('debug'):
-                            self.logger.debug(f"Ignoré (binaire détecté - octets nuls): {file_info['relative_path']}")
+            # Niveau 3: Test de contenu pour les fichiers restants, par lot
+            pending = [i for i, keep in enumerate(decisions) if keep is None]
+            if pending:
+                verdicts = classifier.classify_files([chunk[i]['absolute_path'] for i in pending])
+                for i, is_binary in zip(pending, verdicts):
+                    if is_binary is None:
+                        # En cas d'erreur, on inclut le fichier par défaut
+                        decisions[i] = True
                         continue
-                    
-                    # Essayer de décoder en UTF-8
-                    try:
-                        sample.decode('utf-8')
-                        filtered_files.append(file_info)
-                    except UnicodeDecodeError:
-                        if self.config.get('debug'):
-                            self.logger.debug(f"Ignoré (binaire détecté - pas UTF-8): {file_info['relative_path']}")
-                        continue
-                        
-                except Exception as e:
-                    self.logger.warning(f"Erreur lors du test binaire de {file_info['relative_path']}: {e}")
-                    # En cas d'erreur, on inclut le fichier par défaut
-                    filtered_files.append(file_info)
-            else:
-                # Les fichiers vides sont acceptés
-                filtered_files.append(file_info)
-                
+                    self._record_binary_verdict(chunk[i], is_binary)
+                    decisions[i] = not is_binary
+                    if is_binary and self.config.get('debug'):
+                        self.logger.debug(f"Ignoré (binaire détecté - octets nuls ou non UTF-8): {chunk[i]['relative_path']}")
+            
+            filtered_files.extend(f for f, keep in zip(chunk, decisions) if keep)
+        
+        if progress:
+            progress.files_accepted([self._frontend_entry(f) for f in filtered_files[published:]])
         return filtered_files
     
+    def _classify_without_content(self, file_info: Dict[str, Any]) -> Optional[bool]:
+        """
+        Décide du sort d'un fichier sans lire son contenu.
+        
+        Returns:
+            True (retenu), False (exclu), ou None si le contenu doit être analysé
+        """
+        # Nom exclu, motif exclu, extension binaire (rejet) ou texte (acceptation)
+        verdict, rule = self.exclusion_rules.decide(file_info['name'])
+        if verdict is not None:
+            if not verdict and self.config.get('debug'):
+                self.logger.debug(f"Ignoré ({rule}): {file_info['relative_path']}")
+            return verdict
+        
+        # Les fichiers vides sont acceptés
+        if file_info['size'] <= 0:
+            return True
+        
+        # Réutiliser le verdict de l'index si le fichier n'a pas changé
+        cached_verdict = self.scan_index.get_verdict(file_info) if self.scan_index else None
+        if cached_verdict is not None:
+            if cached_verdict and self.config.get('debug'):
+                self.logger.debug(f"Ignoré (binaire selon l'index): {file_info['relative_path']}")
+            return not cached_verdict
+        return None
+    
+    def _record_binary_verdict(self, file_info: Dict[str, Any], is_binary: bool):
+        """Mémorise le verdict de l'analyse de contenu dans l'index de scan."""
+        if self.scan_index is not None:
+            self.scan_index.set_verdict(file_info, is_binary)
+    
     def detect_and_redact_secrets(self, content: str, file_path: str, 
                                   redact_mode: str = 'mask') -> Tuple[str, int]:
         """
@@ -421,64 +1112,98 @@ class FileService(BaseService):
             return content, 0
 
         try:
-            # Initialiser la collection de secrets
-            secrets = SecretsCollection()
-            
-            # Initialiser les plugins de détection disponibles
-            plugins_used = list(initialize_detect_secrets_plugins.from_parser_builder([]))
-            for plugin in plugins_used:
-                try:
-                    secrets.scan_string_content(content, plugin, path=file_path)
-                except Exception as plugin_error:
-                    self.logger.debug(f"Plugin {plugin.__class__.__name__} failed for {file_path}: {plugin_error}")
-            
-            # Si aucun secret n'est détecté, retourner le contenu original
-            if not secrets.data:
-                return content, 0
-            
-            # Redacter les secrets détectés
-            lines = content.splitlines()
-            redacted_lines = list(lines)  # Copie pour modification
-            
-            # Trier les secrets par numéro de ligne
-            secrets_by_line = {}
-            for filename, secret_list in secrets.data.items():
-                for secret in secret_list:
-                    line_num = secret['line_number'] - 1  # Ajuster pour l'indexation à 0
-                    if line_num not in secrets_by_line:
-                        secrets_by_line[line_num] = []
-                    secrets_by_line[line_num].append(secret)
-            
-            # Redacter chaque ligne contenant des secrets
-            secrets_count = 0
-            for line_num, line_secrets in sorted(secrets_by_line.items(), reverse=True):
-                if line_num >= len(redacted_lines):
-                    continue  # Ignorer si la ligne est hors limites
-                
-                if redact_mode == 'remove':
-                    # Supprimer la ligne entière
-                    redacted_lines[line_num] = f"[LINE REMOVED DUE TO DETECTED SECRET]"
-                    secrets_count += len(line_secrets)
-                else:
-                    # Mode par défaut: masquer les secrets individuellement
-                    current_line = redacted_lines[line_num]
-                    redacted_lines[line_num] = f"[LINE CONTAINING SENSITIVE DATA: {line_secrets[0]['type']}]"
-                    secrets_count += 1
-            
-            # Reconstituer le contenu avec les lignes redactées
-            redacted_content = "\n".join(redacted_lines)
-            
-            return redacted_content, secrets_count
+            plugins_used, _ = self._get_secret_plugins()
+            return self._detect_and_redact_secrets_uncached(content, file_path, redact_mode, plugins_used)
             
         except Exception as e:
             self.logger.error(f"Error using detect-secrets: {e}")
             return content, 0
+    
+    def _get_secret_plugins(self) -> Tuple[list, str]:
+        """
+        Plugins detect-secrets, initialisés au premier appel puis réutilisés.
+        
+        Returns:
+            (plugins, version) : la version identifie le jeu de plugins dans les
+            clés du cache de masquage
+        """
+        with self._secret_plugins_lock:
+            if self._secret_plugins is None:
+                plugins = list(initialize_detect_secrets_plugins.from_parser_builder([]))
+                names = sorted(plugin.__class__.__name__ for plugin in plugins)
+                self._secret_plugins_version = hash_bytes(
+                    f"{DETECT_SECRETS_VERSION}:{','.join(names)}".encode('utf-8')
+                )
+                self._secret_plugins = plugins
+                self.logger.info(f"Plugins detect-secrets initialisés: {len(plugins)}")
+            return self._secret_plugins, self._secret_plugins_version
+    
+    def _detect_and_redact_secrets_uncached(self, content: str, file_path: str, redact_mode: str,
+                                            plugins_used: list) -> Tuple[str, int]:
+        """Analyse detect-secrets et masquage, sans cache (voir detect_and_redact_secrets)."""
+        secrets_by_line = self._detect_secrets_by_line(content, file_path, plugins_used)
+        
+        # Si aucun secret n'est détecté, retourner le contenu original
+        if not secrets_by_line:
+            return content, 0
+        
+        # Redacter les secrets détectés
+        redacted_lines = content.splitlines()  # Modifiée sur place
+        
+        # Redacter chaque ligne contenant des secrets
+        secrets_count = 0
+        for line_num, line_secrets in sorted(secrets_by_line.items(), reverse=True):
+            if line_num >= len(redacted_lines):
+                continue  # Ignorer si la ligne est hors limites
+            
+            if redact_mode == 'remove':
+                # Supprimer la ligne entière
+                redacted_lines[line_num] = f"[LINE REMOVED DUE TO DETECTED SECRET]"
+                secrets_count += len(line_secrets)
+            else:
+                # Mode par défaut: masquer les secrets individuellement
+                current_line = redacted_lines[line_num]
+                redacted_lines[line_num] = f"[LINE CONTAINING SENSITIVE DATA: {line_secrets[0]['type']}]"
+                secrets_count += 1
+        
+        # Reconstituer le contenu avec les lignes redactées
+        redacted_content = "\n".join(redacted_lines)
+        
+        return redacted_content, secrets_count
+
+    def _detect_secrets_by_line(self, content: str, file_path: str, plugins_used: list) -> Dict[int, list]:
+        """Secrets trouvés par detect-secrets, groupés par ligne (indexée à partir de 0)."""
+        # Initialiser la collection de secrets
+        secrets = SecretsCollection()
+        
+        for plugin in plugins_used:
+            try:
+                secrets.scan_string_content(content, plugin, path=file_path)
+            except Exception as plugin_error:
+                self.logger.debug(f"Plugin {plugin.__class__.__name__} failed for {file_path}: {plugin_error}")
+        
+        # Trier les secrets par numéro de ligne
+        secrets_by_line = {}
+        for filename, secret_list in secrets.data.items():
+            for secret in secret_list:
+                line_num = secret['line_number'] - 1  # Ajuster pour l'indexation à 0
+                if line_num not in secrets_by_line:
+                    secrets_by_line[line_num] = []
+                secrets_by_line[line_num].append(secret)
+        return secrets_by_line
 
     def detect_and_redact_with_regex(self, content: str, file_path: str) -> Tuple[str, int]:
         """
         Détecte et masque les patterns courants de secrets avec des expressions régulières.
         Complémentaire à detect-secrets pour des cas spécifiques.
         
+        Chaque ligne contenant un secret est remplacée par un marqueur ; les
+        motifs (SECRET_PATTERNS) sont compilés une fois et le contenu est
+        analysé en une passe (voir RegexSecretScanner). Contrairement à
+        l'ancienne boucle ("\n".join(content.splitlines())), les retours à la
+        ligne d'origine, dernier compris, sont conservés, et le corps d'un
+        bloc PEM est masqué avec sa ligne BEGIN.
+        
         Args:
             content: Le contenu du fichier
             file_path: Le chemin du fichier (pour le logging)
@@ -486,43 +1211,222 @@ class FileService(BaseService):
         Returns:
             tuple: (contenu redacté, nombre de secrets détectés)
         """
-        # Patterns courants de secrets et informations d'identification
-        patterns = {
-            # API Keys - différents formats courants
-            'api_key': r'(?i)(api[_-]?key|apikey|api_token|auth_token|authorization_token|bearer_token)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z\-_\.]{16,128})["\']?',
-            # Tokens divers (OAuth, JWT, etc.)
-            'token': r'(?i)(access_token|auth_token|token)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z._\-]{8,64})["\']?',
-            # Clés AWS
-            'aws_key': r'(?i)(AKIA[0-9A-Z]{16})',
-            # URLs contenant username:password
-            'url_auth': r'(?i)https?://[^:@/\s]+:[^:@/\s]+@[^/\s]+',
-            # Clés privées
-            'private_key_pem': r'-----BEGIN ((RSA|EC|OPENSSH|PGP) )?PRIVATE KEY-----',
-            # Documentation de credentials/variables sensibles avec valeurs
-            'credentials_doc': r'(?i)# ?(password|secret|key|token|credential).*[=:] ?"[^"]{3,}"',
-            # Clés AWS
-            'aws_secret': r'(?i)(aws[\w_\-]*secret[\w_\-]*key)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z\-_\/+]{40})["\']?',
-            # Clés privées
-            'private_key': r'(?i)(-----BEGIN [A-Z]+ PRIVATE KEY-----)',
-            # Connection strings
-            'connection_string': r'(?i)(mongodb|mysql|postgresql|sqlserver|redis|amqp)://[^:]+:[^@]+@[:\w\.\-]+[/:\w\d\?=&%\-\.]*'
-        }
+        return DEFAULT_SCANNER.redact(content)
+
+    def mask_secrets(self, content: str, file_path: str, redact_mode: str = 'mask') -> Tuple[str, int]:
+        """
+        Masque les secrets d'un fichier : detect-secrets, puis expressions régulières.
         
-        # Initialiser les variables
-        lines = content.splitlines()
-        redacted_lines = list(lines)
-        count = 0
-        
-        # Parcourir chaque ligne pour détecter les patterns
-        for i, line in enumerate(lines):
-            for pattern_name, pattern in patterns.items():
-                matches = list(re.finditer(pattern, line))
-                if matches:
-                    redacted_lines[i] = f"[LINE CONTAINING SENSITIVE DATA: {pattern_name}]"
-                    count += 1
-                    break  # Passer à la ligne suivante une fois qu'un pattern est trouvé
-        
-        # Reconstituer le contenu
-        redacted_content = "\n".join(redacted_lines)
+        Le résultat est mémorisé par contenu, mode, chemin et version des
+        détecteurs (voir get_cached_masking) : un contenu déjà masqué n'est
+        pas réanalysé.
+        
+        Args:
+            content: Le contenu du fichier
+            file_path: Le chemin relatif du fichier
+            redact_mode: 'mask' ou 'remove' (voir detect_and_redact_secrets)
+            
+        Returns:
+            tuple: (contenu masqué, nombre total de secrets détectés)
+        """
+        text_hash = hash_text(content)
+        cached = self.get_cached_masking(content, text_hash, file_path, redact_mode)
+        if cached is not None:
+            return cached
+        redacted_content, secrets_count_ds = self.detect_and_redact_secrets(content, file_path, redact_mode)
+        # Les expressions régulières s'appliquent au contenu déjà traité par detect-secrets
+        final_redacted_content, secrets_count_regex = self.detect_and_redact_with_regex(redacted_content, file_path)
+        if secrets_count_regex > 0:
+            redacted_content = final_redacted_content
+        result = (redacted_content, secrets_count_ds + secrets_count_regex)
+        self.store_masking(content, text_hash, file_path, redact_mode, result)
+        return result
+    
+    def get_cached_masking(self, content: str, text_hash: str, file_path: str,
+                           redact_mode: str) -> Optional[Tuple[str, int]]:
+        """
+        Résultat mémorisé de mask_secrets pour ce contenu, ou None.
+        
+        Args:
+            content: Le contenu du fichier
+            text_hash: Son empreinte (hash_text)
+            file_path: Le chemin relatif du fichier
+            redact_mode: 'mask' ou 'remove'
+        """
+        return self._masking_cache.get((text_hash, redact_mode, file_path, self._detectors_version()), content)
+    
+    def store_masking(self, content: str, text_hash: str, file_path: str, redact_mode: str,
+                      result: Tuple[str, int]):
+        """Mémorise le résultat de mask_secrets pour ce contenu (par exemple calculé par un autre processus)."""
+        self._masking_cache.put((text_hash, redact_mode, file_path, self._detectors_version()), content, result)
+    
+    def _detectors_version(self) -> str:
+        """Version des détecteurs (plugins detect-secrets et motifs regex) : invalide les résultats mémorisés."""
+        plugins_version = None
+        if HAS_DETECT_SECRETS:
+            try:
+                plugins_version = self._get_secret_plugins()[1]
+            except Exception as e:
+                self.logger.error(f"Error using detect-secrets: {e}")
+        return f"{plugins_version}:{DEFAULT_SCANNER.version}"
+    
+    def find_secrets(self, content: str, file_path: str) -> List[SecretFinding]:
+        """
+        Liste les secrets d'un fichier sans le masquer.
+        
+        Les deux détecteurs analysent le contenu d'origine : detect-secrets
+        (s'il est installé) puis les expressions régulières.
+        
+        Args:
+            content: Le contenu du fichier
+            file_path: Le chemin relatif du fichier
+            
+        Returns:
+            Secrets détectés, triés par ligne
+        """
+        findings = []
+        if HAS_DETECT_SECRETS:
+            try:
+                plugins_used, _ = self._get_secret_plugins()
+                for line_num, line_secrets in self._detect_secrets_by_line(content, file_path, plugins_used).items():
+                    findings.extend(SecretFinding(line_num + 1, secret['type'], 'detect-secrets')
+                                    for secret in line_secrets)
+            except Exception as e:
+                self.logger.error(f"Error using detect-secrets: {e}")
+        findings.extend(SecretFinding(line, name, 'regex') for line, name in DEFAULT_SCANNER.iter_line_findings(content))
+        return sorted(findings)
+    
+    def scan_secret_findings(self, relative_paths: Optional[List[str]] = None,
+                             cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Analyse les fichiers du projet courant et conserve les secrets détectés.
+        
+        Seuls les contenus absents du magasin (nouveaux ou modifiés, d'après
+        leur empreinte) sont lus et analysés ; les résultats sont enregistrés
+        sur disque avec l'index de scan. Destiné à tourner en arrière-plan
+        après un scan : la génération ne masque pas un texte lu identique à
+        un texte analysé sans secret (voir known_clean_texts).
+        
+        Args:
+            relative_paths: Fichiers à analyser (défaut : tous les fichiers scannés)
+            cancel_event: Interrompt l'analyse lorsqu'il est positionné
+            
+        Returns:
+            Dict avec success, analysed (contenus analysés), reused (fichiers déjà
+            connus), cancelled, ou error
+        """
+        with self._state_lock:
+            directory = self.current_directory
+            file_cache = self.file_cache
+        store = self._get_findings_store()
+        if store is None:
+            return {'success': False, 'error': 'Aucun répertoire scanné'}
+        with self._findings_scan_lock:
+            return self._scan_secret_findings(store, directory, file_cache, relative_paths, cancel_event)
+    
+    def _scan_secret_findings(self, store: SecretFindingsStore, directory: str, file_cache: List[Dict[str, Any]],
+                              relative_paths: Optional[List[str]],
+                              cancel_event: Optional[threading.Event]) -> Dict[str, Any]:
+        full_tree = relative_paths is None
+        paths = [f['relative_path'] for f in file_cache] if full_tree else list(relative_paths)
+        hashes = self.get_content_hashes(paths, directory)
+        to_analyse = []
+        for path in paths:
+            content_hash = hashes.get(path)
+            if content_hash is None:
+                continue
+            if store.get(content_hash) is None:
+                to_analyse.append(path)
+            else:
+                store.record(path, content_hash)
+        
+        analysed = 0
+        cancelled = False
+        for path, read_result in self.iter_file_contents(to_analyse, directory, file_cache, max_total_bytes=0):
+            if cancel_event is not None and cancel_event.is_set():
+                cancelled = True
+                break
+            if not read_result['success']:
+                continue
+            content_hash = hashes[path]
+            if store.get(content_hash) is None:  # Contenu identique déjà analysé dans cette boucle
+                content = read_result['content']
+                store.record(path, content_hash, self.find_secrets(content, path), hash_text(content))
+                analysed += 1
+            else:
+                store.record(path, content_hash)
+        
+        if full_tree and not cancelled:
+            scanned = set(paths)
+            store.forget([path for path in list(store.files) if path not in scanned])
+        store.save()
+        self.logger.info(f"Détection des secrets: {analysed} fichiers analysés, "
+                         f"{len(paths) - len(to_analyse)} déjà connus{' (interrompue)' if cancelled else ''}")
+        return {'success': True, 'analysed': analysed, 'reused': len(paths) - len(to_analyse), 'cancelled': cancelled}
+    
+    def get_secret_findings(self, relative_paths: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Rapport d'audit des secrets détectés dans le projet courant.
         
-        return redacted_content, count
+        Args:
+            relative_paths: Fichiers à inclure (défaut : tous les fichiers scannés)
+            
+        Returns:
+            Dict contenant :
+            - success (bool)
+            - findings (list): {'path', 'line', 'type', 'detector'} pour chaque secret
+            - files_with_secrets (list): Fichiers contenant au moins un secret
+            - by_type (dict): Nombre de secrets par type
+            - analysed_files (int): Fichiers dont les résultats sont à jour
+            - pending_files (list): Fichiers jamais analysés ou modifiés depuis
+              (voir scan_secret_findings)
+        """
+        store = self._get_findings_store()
+        if store is None:
+            return {'success': False, 'error': 'Aucun répertoire scanné'}
+        paths = [f['relative_path'] for f in self.file_cache] if relative_paths is None else relative_paths
+        hashes = self.get_content_hashes(paths)
+        up_to_date = [path for path in paths
+                      if hashes.get(path) and store.files.get(path) == hashes[path]
+                      and store.get(hashes[path]) is not None]
+        pending = sorted(set(paths).difference(up_to_date))
+        findings = store.report(up_to_date)
+        by_type = {}
+        for finding in findings:
+            by_type[finding['type']] = by_type.get(finding['type'], 0) + 1
+        return {
+            'success': True,
+            'findings': findings,
+            'files_with_secrets': sorted({finding['path'] for finding in findings}),
+            'by_type': by_type,
+            'analysed_files': len(up_to_date),
+            'pending_files': pending
+        }
+    
+    def known_clean_texts(self, texts: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """
+        Parmi ces (chemin relatif, empreinte du texte lu), ceux d'un texte analysé sans aucun secret.
+        
+        Leur masquage ne changerait rien : la génération peut l'ignorer. Les
+        empreintes sont celles du texte effectivement lu, jamais celles de
+        l'index de scan (un fichier modifié entre-temps serait jugé sur un
+        autre contenu). Un texte n'est jugé sain que sous le chemin où il a
+        été analysé : les plugins detect-secrets dépendent du nom du fichier.
+        """
+        store = self._get_findings_store()
+        if store is None:
+            return set()
+        return store.clean_texts(texts)
+    
+    def _get_findings_store(self) -> Optional[SecretFindingsStore]:
+        """Magasin des secrets détectés du projet courant, ouvert au premier accès (None sans projet)."""
+        with self._state_lock:
+            directory = self.current_directory
+            if not directory:
+                return None
+            store = self._findings_store
+            if store is None or store.project_key != os.path.normcase(os.path.realpath(directory)):
+                store_dir = self.config.get('scan_index_dir') if self.config.get('scan_index_enabled', True) else None
+                store = SecretFindingsStore(store_dir, directory, self._detectors_version(), self.logger).load()
+                self._findings_store = store
+            return store
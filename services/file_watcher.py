@@ -0,0 +1,324 @@
+"""Surveillance des fichiers d'un projet : inotify sous Linux, scrutation sinon."""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Callable, Iterable, Optional, Set
+
+
+# Constantes inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0o2000000)
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF |
+              IN_DONT_FOLLOW | IN_EXCL_UNLINK)
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# Chemin signalant qu'il faut réexaminer tout le projet (débordement de la file inotify)
+ROOT_CHANGED = ''
+
+
+def _load_libc():
+    """Charge les fonctions inotify de la libc, ou None hors Linux."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class _InotifyBackend:
+    """
+    Surveillance par inotify, un watch par répertoire non ignoré.
+
+    Les répertoires créés ou déplacés dans le projet sont ajoutés au vol.
+    Lève OSError à la construction si inotify est indisponible ou si la
+    limite fs.inotify.max_user_watches est atteinte.
+    """
+
+    name = 'inotify'
+
+    def __init__(self, root: str, ignore_spec, notify: Callable[[Iterable[str]], None],
+                 logger: logging.Logger):
+        self.libc = _load_libc()
+        if self.libc is None:
+            raise OSError(errno.ENOSYS, "inotify indisponible sur cette plateforme")
+        self.root = root
+        self.ignore_spec = ignore_spec
+        self.notify = notify
+        self.logger = logger
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+        self._dirs = {}  # wd -> répertoire relatif
+        try:
+            self._add_tree('')
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir: str):
+        path = os.path.join(self.root, *rel_dir.split('/')) if rel_dir else self.root
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "limite fs.inotify.max_user_watches atteinte")
+            return  # Répertoire disparu entre-temps
+        self._dirs[wd] = rel_dir
+
+    def _add_tree(self, rel_dir: str):
+        """Surveille rel_dir et ses sous-répertoires non ignorés."""
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            self._add_watch(current)
+            path = os.path.join(self.root, *current.split('/')) if current else self.root
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        child = f"{current}/{entry.name}" if current else entry.name
+                        if not self.ignore_spec.match_file(child + '/'):
+                            stack.append(child)
+            except OSError:
+                continue
+
+    def run(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                ready, _, _ = select.select([self.fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                if stop.is_set():
+                    return
+                raise
+            self.notify(self._parse(data))
+
+    def _parse(self, data: bytes) -> Set[str]:
+        changed = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length]
+            offset += _EVENT_HEADER.size + length
+
+            if mask & IN_Q_OVERFLOW:
+                self.logger.warning("File d'événements inotify saturée : réexamen complet du projet")
+                changed.add(ROOT_CHANGED)
+                continue
+            rel_dir = self._dirs.get(wd)
+            if rel_dir is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            name = os.fsdecode(raw_name.split(b'\0', 1)[0])
+            if not name:
+                continue  # Événement sur le répertoire lui-même (signalé par son parent)
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if not self.ignore_spec.match_file(rel_path + '/'):
+                    try:
+                        self._add_tree(rel_path)
+                    except OSError as e:
+                        self.logger.warning(f"Surveillance de {rel_path} impossible: {e}")
+            changed.add(rel_path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+            self.fd = -1
+
+
+class _PollingBackend:
+    """Scrutation périodique : detect_changes() renvoie les chemins modifiés depuis le dernier appel."""
+
+    name = 'polling'
+
+    def __init__(self, detect_changes: Callable[[], Set[str]], interval: float,
+                 notify: Callable[[Iterable[str]], None], logger: logging.Logger):
+        self.detect_changes = detect_changes
+        self.interval = max(0.05, interval)
+        self.notify = notify
+        self.logger = logger
+
+    def run(self, stop: threading.Event):
+        while not stop.wait(self.interval):
+            try:
+                changed = self.detect_changes()
+            except Exception as e:
+                self.logger.warning(f"Scrutation des fichiers en échec: {e}")
+                continue
+            if changed:
+                self.notify(changed)
+
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """
+    Surveille un projet et transmet les chemins modifiés par lots, avec anti-rebond.
+
+    Les chemins relatifs (POSIX) signalés par le backend sont accumulés ; le
+    lot est transmis à ``on_changes`` après ``debounce`` secondes sans nouvel
+    événement, ou au plus tard après ``max_delay`` secondes d'activité
+    continue (ex : checkout git, build). Un chemin peut désigner un fichier
+    ou un répertoire ; ROOT_CHANGED ('') désigne tout le projet.
+
+    Backends : 'inotify' (Linux), 'polling' (detect_changes appelé toutes les
+    ``poll_interval`` secondes), ou 'auto' : inotify si possible, sinon polling.
+    """
+
+    BACKENDS = ('auto', 'inotify', 'polling')
+
+    def __init__(self, root: str, on_changes: Callable[[Set[str]], None],
+                 ignore_spec=None,
+                 detect_changes: Optional[Callable[[], Set[str]]] = None,
+                 backend: str = 'auto',
+                 debounce: float = 0.5,
+                 max_delay: float = 3.0,
+                 poll_interval: float = 2.0,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            root: Répertoire du projet
+            on_changes: Reçoit chaque lot de chemins relatifs modifiés
+            ignore_spec: Règles d'exclusion (match_file) : répertoires non surveillés par inotify
+            detect_changes: Détection des changements pour le backend polling
+            backend: 'auto', 'inotify' ou 'polling'
+            debounce: Délai de calme avant transmission d'un lot (secondes)
+            max_delay: Délai maximal avant transmission pendant une activité continue
+            poll_interval: Intervalle de scrutation du backend polling (secondes)
+            logger: Logger optionnel
+        """
+        self.root = root
+        self.on_changes = on_changes
+        self.ignore_spec = ignore_spec
+        self.detect_changes = detect_changes
+        self.requested_backend = backend if backend in self.BACKENDS else 'auto'
+        self.debounce = max(0.0, debounce)
+        self.max_delay = max(self.debounce, max_delay)
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.backend = None
+        self._pending: Set[str] = set()
+        self._first_event: Optional[float] = None
+        self._last_event = 0.0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+
+    @property
+    def backend_name(self) -> Optional[str]:
+        return self.backend.name if self.backend else None
+
+    def start(self) -> 'FileWatcher':
+        """Démarre la surveillance (threads démons)."""
+        self.backend = self._create_backend()
+        self.logger.info(f"Surveillance de {self.root} ({self.backend.name})")
+        for target, name in ((self._run_backend, 'watch'), (self._debounce_loop, 'watch-debounce')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Arrête la surveillance ; les changements en attente sont abandonnés."""
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(2)
+        if self.backend:
+            self.backend.close()
+
+    def _create_backend(self):
+        if self.requested_backend in ('auto', 'inotify') and self.ignore_spec is not None:
+            try:
+                return _InotifyBackend(self.root, self.ignore_spec, self._add, self.logger)
+            except OSError as e:
+                if self.requested_backend == 'inotify' or self.detect_changes is None:
+                    raise
+                self.logger.info(f"inotify indisponible ({e}), repli sur la scrutation")
+        if self.detect_changes is None:
+            raise ValueError("Le backend polling nécessite detect_changes")
+        return _PollingBackend(self.detect_changes, self.poll_interval, self._add, self.logger)
+
+    def _run_backend(self):
+        try:
+            self.backend.run(self._stop)
+        except Exception as e:
+            self.logger.error(f"Surveillance de {self.root} interrompue: {e}")
+
+    def _add(self, paths: Iterable[str]):
+        paths = set(paths)
+        if not paths:
+            return
+        now = time.monotonic()
+        with self._cond:
+            self._pending.update(paths)
+            self._last_event = now
+            if self._first_event is None:
+                self._first_event = now
+            self._cond.notify()
+
+    def _debounce_loop(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._pending and not self._stop.is_set():
+                    self._cond.wait(0.5)
+                if self._stop.is_set():
+                    return
+                now = time.monotonic()
+                quiet = now - self._last_event
+                waited = now - self._first_event
+                if quiet < self.debounce and waited < self.max_delay:
+                    self._cond.wait(min(self.debounce - quiet, self.max_delay - waited))
+                    continue
+                batch, self._pending = self._pending, set()
+                self._first_event = None
+            try:
+                self.on_changes(batch)
+            except Exception as e:
+                self.logger.error(f"Application des changements en échec: {e}")
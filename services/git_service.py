@@ -1,6 +1,7 @@
+import os
 import subprocess
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from .base_service import BaseService
 from .exceptions import GitServiceException
 
@@ -133,4 +134,39 @@ class GitService(BaseService):
         except Exception as e:
             error_msg = f"Erreur inattendue lors de l'exécution de git diff: {str(e)}"
             self.logger.error(error_msg)
-            raise GitServiceException(error_msg)
\ No newline at end of file
+            raise GitServiceException(error_msg)
+    
+    def list_project_files(self, directory_path: str) -> Optional[List[str]]:
+        """
+        Liste les fichiers suivis et non suivis non ignorés via l'index git.
+        
+        Exécute `git ls-files -z --cached --others --exclude-standard` : git
+        applique lui-même tous les .gitignore, .git/info/exclude et le fichier
+        d'exclusion global, sans que le répertoire soit parcouru.
+        
+        Args:
+            directory_path: Le répertoire à lister (racine ou sous-répertoire d'un dépôt)
+            
+        Returns:
+            Liste des chemins relatifs (séparateur '/') à directory_path, ou None
+            si le répertoire n'est pas un dépôt git ou si git est indisponible
+        """
+        git_command = [self._git_path, 'ls-files', '-z', '--cached', '--others', '--exclude-standard']
+        try:
+            result = subprocess.run(
+                git_command,
+                cwd=directory_path,
+                capture_output=True
+            )
+        except OSError as e:
+            self.logger.info(f"git indisponible pour lister {directory_path}: {e}")
+            return None
+        
+        if result.returncode != 0:
+            stderr = result.stderr.decode('utf-8', errors='replace').strip()
+            self.logger.info(f"git ls-files a échoué dans {directory_path}: {stderr}")
+            return None
+        
+        # Les entrées en conflit apparaissent plusieurs fois : dédoublonner en gardant l'ordre
+        paths = (os.fsdecode(raw) for raw in result.stdout.split(b'\0') if raw)
+        return list(dict.fromkeys(paths))
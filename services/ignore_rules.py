@@ -0,0 +1,258 @@
+"""Moteur de règles d'exclusion .gitignore hiérarchiques."""
+
+import os
+import re
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Tuple
+from pathspec.patterns import GitWildMatchPattern
+
+
+# Règles appliquées à tous les projets, avec la priorité la plus faible
+DEFAULT_IGNORE_PATTERNS = ['.git/', '__pycache__/', 'node_modules/', '.vscode/', '.idea/']
+
+# Groupes nommés internes aux expressions de pathspec (ex: ps_d), neutralisés
+# pour pouvoir concaténer plusieurs motifs dans une même expression
+_NAMED_GROUP_RE = re.compile(r'\(\?P<[^>]+>')
+
+
+class CompiledIgnoreRules:
+    """
+    Règles d'un fichier d'exclusion compilées en une seule expression régulière.
+
+    Les motifs sont concaténés en ordre inverse : la première alternative qui
+    correspond est donc le dernier motif du fichier, conformément à la règle
+    git « le dernier motif correspondant l'emporte » (négations comprises).
+    """
+
+    __slots__ = ('patterns', '_regex', '_includes')
+
+    def __init__(self, lines: List[str]):
+        """
+        Args:
+            lines: Lignes brutes du fichier (commentaires et lignes vides ignorés)
+        """
+        patterns = []
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            pattern = GitWildMatchPattern(line)
+            if pattern.include is not None:
+                patterns.append(pattern)
+        self.patterns = patterns
+
+        ordered = list(reversed(patterns))
+        self._includes = [p.include for p in ordered]
+        try:
+            alternatives = [
+                f"(?P<r{i}>{_NAMED_GROUP_RE.sub('(?:', p.regex.pattern)})"
+                for i, p in enumerate(ordered)
+            ]
+            self._regex = re.compile('|'.join(alternatives)) if alternatives else None
+        except re.error:
+            self._regex = False  # Repli sur l'évaluation motif par motif
+
+    def decide(self, path: str) -> Optional[bool]:
+        """
+        Évalue un chemin relatif au répertoire du fichier de règles.
+
+        Returns:
+            True si le chemin est exclu, False s'il est ré-inclus par une négation,
+            None si aucun motif ne s'applique
+        """
+        if self._regex is None:
+            return None
+        if self._regex is False:
+            for pattern in reversed(self.patterns):
+                if pattern.regex.match(path):
+                    return pattern.include
+            return None
+        match = self._regex.match(path)
+        if match is None:
+            return None
+        return self._includes[int(match.lastgroup[1:])]
+
+
+class IgnoreRulesCache:
+    """
+    Cache thread-safe des règles compilées, indexé par (chemin, mtime).
+
+    Un fichier .gitignore inchangé entre deux scans n'est ni relu ni recompilé.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._entries: Dict[str, Tuple[Tuple[int, int], Optional[CompiledIgnoreRules]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[CompiledIgnoreRules]:
+        """Retourne les règles compilées du fichier, ou None s'il n'existe pas."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        try:
+            with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                rules = CompiledIgnoreRules(f.readlines())
+        except OSError as e:
+            self.logger.warning(f"Impossible de lire {path}: {e}")
+            rules = None
+        if rules is not None and not rules.patterns:
+            rules = None
+        with self._lock:
+            self._entries[path] = (key, rules)
+        return rules
+
+    def clear(self):
+        """Vide le cache."""
+        with self._lock:
+            self._entries.clear()
+
+
+def find_global_excludes_file() -> Optional[str]:
+    """
+    Localise le fichier d'exclusion global de git (core.excludesFile).
+
+    Lit ~/.gitconfig et $XDG_CONFIG_HOME/git/config sans invoquer git ; à défaut
+    de core.excludesFile, utilise l'emplacement par défaut $XDG_CONFIG_HOME/git/ignore.
+    """
+    home = os.path.expanduser('~')
+    xdg_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join(home, '.config')
+    excludes_file = None
+
+    for config_path in (os.path.join(xdg_home, 'git', 'config'), os.path.join(home, '.gitconfig')):
+        try:
+            with open(config_path, 'r', encoding='utf-8', errors='ignore') as f:
+                section = ''
+                for raw_line in f:
+                    line = raw_line.strip()
+                    if not line or line[0] in '#;':
+                        continue
+                    if line.startswith('['):
+                        section = line.strip('[]').strip().lower()
+                        continue
+                    if section == 'core' and '=' in line:
+                        key, value = line.split('=', 1)
+                        if key.strip().lower() == 'excludesfile':
+                            excludes_file = value.strip().strip('"')
+        except OSError:
+            continue
+
+    if excludes_file:
+        return os.path.expanduser(excludes_file)
+    return os.path.join(xdg_home, 'git', 'ignore')
+
+
+class HierarchicalIgnoreMatcher:
+    """
+    Évalue les exclusions d'un projet comme git.
+
+    Sources, par priorité croissante : règles par défaut, fichier global
+    (core.excludesFile), .git/info/exclude, puis chaque .gitignore de la racine
+    jusqu'au répertoire du chemin testé (le plus profond l'emporte).
+
+    Les .gitignore imbriqués sont chargés à la demande, lorsque le parcours
+    atteint leur répertoire ; les répertoires exclus n'étant jamais parcourus,
+    leurs règles ne sont jamais lues. S'utilise comme un PathSpec via match_file.
+    """
+
+    def __init__(self, root: str, rules_cache: IgnoreRulesCache,
+                 default_patterns: Optional[List[str]] = None,
+                 global_excludes_file: Optional[str] = None):
+        """
+        Args:
+            root: Répertoire racine du projet
+            rules_cache: Cache partagé des règles compilées
+            default_patterns: Règles par défaut (DEFAULT_IGNORE_PATTERNS si None)
+            global_excludes_file: Fichier d'exclusion global (None = détection automatique)
+        """
+        self.root = root
+        self.rules_cache = rules_cache
+        self.default_rules = CompiledIgnoreRules(
+            DEFAULT_IGNORE_PATTERNS if default_patterns is None else default_patterns
+        )
+        self.global_excludes_file = global_excludes_file
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Recharge les sources (à appeler avant chaque nouveau scan)."""
+        global_file = self.global_excludes_file or find_global_excludes_file()
+        base = [
+            self.rules_cache.get(os.path.join(self.root, '.git', 'info', 'exclude')),
+            self.rules_cache.get(global_file) if global_file else None,
+            self.default_rules
+        ]
+        # Sources de base, de la plus prioritaire à la moins prioritaire
+        self._base_rules = [rules for rules in base if rules is not None]
+        self._chains: Dict[str, List[Tuple[int, CompiledIgnoreRules]]] = {}
+
+    @property
+    def patterns(self) -> list:
+        """Motifs actuellement chargés (toutes sources confondues)."""
+        with self._lock:
+            chains = list(self._chains.values())
+        loaded = {id(rules): rules for chain in chains for _, rules in chain}
+        all_rules = list(loaded.values()) + self._base_rules
+        return [pattern for rules in all_rules for pattern in rules.patterns]
+
+    def _chain(self, rel_dir: str) -> List[Tuple[int, CompiledIgnoreRules]]:
+        """
+        Règles .gitignore applicables aux entrées de rel_dir, de la plus profonde à la racine.
+
+        Chaque élément est (longueur du préfixe à retirer du chemin, règles).
+        """
+        chain = self._chains.get(rel_dir)
+        if chain is not None:
+            return chain
+
+        if rel_dir:
+            parent = rel_dir.rpartition('/')[0]
+            parent_chain = self._chain(parent)
+            gitignore_path = os.path.join(self.root, *rel_dir.split('/'), '.gitignore')
+            offset = len(rel_dir) + 1
+        else:
+            parent_chain = []
+            gitignore_path = os.path.join(self.root, '.gitignore')
+            offset = 0
+
+        rules = self.rules_cache.get(gitignore_path)
+        chain = [(offset, rules)] + parent_chain if rules is not None else parent_chain
+        with self._lock:
+            self._chains[rel_dir] = chain
+        return chain
+
+    def match_file(self, rel_path: str) -> bool:
+        """
+        Indique si un chemin relatif (POSIX) est exclu.
+
+        Les répertoires sont testés avec un '/' final, comme avec PathSpec.
+        """
+        rel_dir = rel_path.rstrip('/').rpartition('/')[0]
+        for offset, rules in self._chain(rel_dir):
+            decision = rules.decide(rel_path[offset:])
+            if decision is not None:
+                return decision
+        for rules in self._base_rules:
+            decision = rules.decide(rel_path)
+            if decision is not None:
+                return decision
+        return False
+
+    def describe(self) -> Dict[str, Any]:
+        """Résumé des sources chargées, pour le débogage."""
+        with self._lock:
+            gitignore_dirs = sorted(d for d, chain in self._chains.items()
+                                    if chain and chain[0][0] == (len(d) + 1 if d else 0))
+        return {
+            'gitignore_files': len(gitignore_dirs),
+            'base_sources': len(self._base_rules),
+            'patterns': len(self.patterns)
+        }
@@ -0,0 +1,153 @@
+"""Lecture des fichiers texte volumineux : mmap, plafond de taille et extraits."""
+
+import os
+import mmap
+from typing import Dict, Any
+
+from .content_hash import hash_bytes
+
+
+# Taille des blocs lus pour compter les lignes sans décoder le fichier
+_COUNT_CHUNK = 1024 * 1024
+
+
+def count_lines(buffer, start: int = 0, end: int = None) -> int:
+    """
+    Compte les lignes d'un tampon (bytes, mmap) par blocs, sans le décoder.
+
+    Une dernière ligne sans retour à la ligne final est comptée.
+    """
+    end = len(buffer) if end is None else end
+    if end <= start:
+        return 0
+    newlines = 0
+    for offset in range(start, end, _COUNT_CHUNK):
+        newlines += buffer[offset:min(offset + _COUNT_CHUNK, end)].count(b'\n')
+    last_byte = buffer[end - 1:end]
+    return newlines + (0 if last_byte == b'\n' else 1)
+
+
+def decode_text(buffer) -> str:
+    """Décode comme open(..., 'r', encoding='utf-8', errors='ignore') (retours à la ligne universels)."""
+    text = str(buffer, 'utf-8', 'ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class LargeFilePolicy:
+    """
+    Politique de lecture des fichiers texte selon leur taille.
+
+    - Sous ``mmap_threshold`` : lecture classique.
+    - Entre ``mmap_threshold`` et ``max_file_bytes`` : lecture complète via mmap,
+      décodée directement depuis la projection (pas de copie intermédiaire en bytes).
+    - Au-delà de ``max_file_bytes`` : selon ``mode``, extrait début/fin avec un
+      marqueur d'élision (``excerpt``) ou fichier ignoré (``skip``).
+
+    Seuls les octets conservés sont décodés ; le nombre de lignes est compté
+    sur les octets bruts.
+    """
+
+    MODES = ('excerpt', 'skip')
+
+    def __init__(self, mmap_threshold: int = 4 * 1024 * 1024,
+                 max_file_bytes: int = 10 * 1024 * 1024,
+                 mode: str = 'excerpt',
+                 head_bytes: int = 256 * 1024,
+                 tail_bytes: int = 64 * 1024):
+        """
+        Args:
+            mmap_threshold: Taille à partir de laquelle le fichier est lu via mmap
+            max_file_bytes: Plafond au-delà duquel le fichier n'est pas lu en entier (0 = aucun)
+            mode: 'excerpt' (début + fin) ou 'skip' pour les fichiers au-delà du plafond
+            head_bytes: Octets conservés au début du fichier en mode extrait
+            tail_bytes: Octets conservés à la fin du fichier en mode extrait
+        """
+        self.mmap_threshold = max(0, mmap_threshold)
+        self.max_file_bytes = max(0, max_file_bytes)
+        self.mode = mode if mode in self.MODES else 'excerpt'
+        self.head_bytes = max(0, head_bytes)
+        self.tail_bytes = max(0, tail_bytes)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'LargeFilePolicy':
+        """Construit la politique depuis la configuration du FileService."""
+        defaults = cls()
+
+        def read_int(key: str, default: int) -> int:
+            try:
+                return int(config.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            mmap_threshold=read_int('mmap_threshold', defaults.mmap_threshold),
+            max_file_bytes=read_int('max_file_bytes', defaults.max_file_bytes),
+            mode=str(config.get('large_file_mode', defaults.mode)).strip().lower(),
+            head_bytes=read_int('excerpt_head_bytes', defaults.head_bytes),
+            tail_bytes=read_int('excerpt_tail_bytes', defaults.tail_bytes)
+        )
+
+    def needs_special_read(self, size: int) -> bool:
+        """Indique si un fichier de cette taille sort de la lecture classique."""
+        return size >= self.mmap_threshold or (self.max_file_bytes and size > self.max_file_bytes)
+
+    def read(self, path: str) -> Dict[str, Any]:
+        """
+        Lit un fichier selon la politique.
+
+        Returns:
+            Dict avec les clés :
+            - content (str | None): Texte lu, extrait, ou None si le fichier est ignoré
+            - size (int): Taille réelle du fichier sur disque
+            - line_count (int): Nombre de lignes du fichier complet
+            - truncated (bool): True si le contenu est un extrait
+            - skipped (bool): True si le fichier dépasse le plafond en mode 'skip'
+            - content_hash (str | None): Empreinte des octets lus (fichier complet, même
+              pour un extrait ; voir content_hash.hash_file), None si le fichier est ignoré
+        """
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return {'content': '', 'size': 0, 'line_count': 0, 'truncated': False, 'skipped': False,
+                        'content_hash': hash_bytes(b'')}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                line_count = count_lines(mm)
+                if not self.max_file_bytes or size <= self.max_file_bytes:
+                    with memoryview(mm) as view:
+                        content = decode_text(view)
+                        content_hash = hash_bytes(view)
+                    return {'content': content, 'size': size, 'line_count': line_count,
+                            'truncated': False, 'skipped': False, 'content_hash': content_hash}
+                if self.mode == 'skip':
+                    return {'content': None, 'size': size, 'line_count': line_count,
+                            'truncated': False, 'skipped': True, 'content_hash': None}
+                content = self._excerpt(mm, size, line_count)
+                with memoryview(mm) as view:
+                    content_hash = hash_bytes(view)
+        return {'content': content, 'size': size, 'line_count': line_count,
+                'truncated': True, 'skipped': False, 'content_hash': content_hash}
+
+    def _excerpt(self, mm, size: int, line_count: int) -> str:
+        """Début et fin du fichier, coupés sur des fins de ligne, séparés par un marqueur."""
+        head_end = min(self.head_bytes, size)
+        if head_end < size:
+            newline = mm.rfind(b'\n', 0, head_end)
+            head_end = newline + 1 if newline >= 0 else head_end
+
+        tail_start = max(size - self.tail_bytes, head_end)
+        if tail_start > head_end:
+            newline = mm.find(b'\n', tail_start - 1, size)
+            tail_start = newline + 1 if 0 <= newline < size - 1 else tail_start
+
+        omitted_lines = count_lines(mm, head_end, tail_start)
+        head = decode_text(mm[:head_end])
+        tail = decode_text(mm[tail_start:])
+        marker = (
+            f"[... {omitted_lines:,} lignes ({tail_start - head_end:,} octets) omises sur "
+            f"{line_count:,} lignes / {size:,} octets ...]"
+        )
+        if head and not head.endswith('\n'):
+            head += '\n'
+        return f"{head}{marker}\n{tail}"
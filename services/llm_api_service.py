@@ -10,6 +10,7 @@ from configparser import ConfigParser
 from .base_service import BaseService
 from .exceptions import LlmApiServiceException, NetworkException, RateLimitException
 from .retry_manager import RetryManager
+from .tokenizer import get_tokenizer
 
 
 class LlmApiService(BaseService):
@@ -156,7 +157,8 @@ class LlmApiService(BaseService):
     def get_available_models(self) -> List[Dict[str, Any]]:
         """Retourne la liste des modèles LLM disponibles."""
         models = [
-            {'id': llm_id, 'name': model['name'], 'default': model.get('default', False)}
+            {'id': llm_id, 'name': model['name'], 'default': model.get('default', False),
+             'context_window': model.get('context_window')}
             for llm_id, model in self._llm_models.items()
         ]
         
@@ -169,6 +171,24 @@ class LlmApiService(BaseService):
         
         return models
     
+    def get_context_limits(self, llm_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Retourne la fenêtre de contexte et la longueur de réponse d'un modèle.
+        
+        Args:
+            llm_id: Identifiant du modèle (défaut : modèle par défaut)
+            
+        Returns:
+            Dict contenant llm_id, context_window et max_tokens (None si non configurés)
+        """
+        target_llm_id = llm_id if llm_id and llm_id in self._llm_models else self._default_llm_id
+        model = self._llm_models.get(target_llm_id, {})
+        return {
+            'llm_id': target_llm_id,
+            'context_window': model.get('context_window'),
+            'max_tokens': model.get('max_tokens')
+        }
+    
     def get_endpoints_health(self) -> Optional[Dict[str, Any]]:
         """Retourne le statut de santé de tous les endpoints."""
         if self.retry_manager:
@@ -928,9 +948,17 @@ class LlmApiService(BaseService):
             return len(str(chat_history)) // 4  # Approximation grossière
     
     def _estimate_tokens(self, text: str) -> int:
-        """Estime le nombre de tokens dans un texte donné."""
+        """
+        Compte le nombre de tokens dans un texte donné (tokeniseur partagé, voir services/tokenizer.py).
+        
+        Sans tokeniseur réel (ni tiktoken ni vocabulaire configuré), l'estimation
+        repose sur les mots et la ponctuation plutôt que sur le nombre de caractères.
+        """
         if not text:
             return 0
+        tokenizer = get_tokenizer()
+        if tokenizer.exact:
+            return tokenizer.count_tokens(text)
         
         # Approximation basée sur l'analyse des patterns de tokenization GPT/Claude
         words = text.split()
@@ -0,0 +1,76 @@
+"""Résultats du masquage des secrets, mémorisés d'une génération à l'autre."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+# Coût forfaitaire d'une entrée (clé, marqueur), en caractères : les
+# contenus sans secret occupent aussi le cache, même sans texte conservé
+_ENTRY_CHARS = 256
+
+
+class MaskingCache:
+    """
+    Cache LRU des résultats du masquage des secrets.
+
+    Les clés identifient un contenu (empreinte), le mode de masquage, le
+    chemin et la version des détecteurs. Un contenu sans secret n'est pas
+    conservé : seul un marqueur (aucun texte, 0 secret) est mémorisé, et
+    get() rend alors le contenu fourni par l'appelant. Le cache est borné
+    par le nombre total de caractères des contenus masqués conservés.
+    """
+
+    def __init__(self, max_chars: int = 64 * 1024 * 1024, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_chars: Nombre maximal de caractères conservés (0 = cache désactivé)
+            logger: Logger optionnel
+        """
+        self.max_chars = max_chars
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._results = OrderedDict()  # clé -> (contenu masqué ou None si aucun secret, nombre de secrets)
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, content: str) -> Optional[Tuple[str, int]]:
+        """Retourne le résultat mémorisé pour cette clé (content si aucun secret), ou None."""
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                return None
+            self._results.move_to_end(key)
+        redacted, secrets_count = result
+        return (content if redacted is None else redacted), secrets_count
+
+    def put(self, key: tuple, content: str, result: Tuple[str, int]):
+        """Mémorise le résultat du masquage de content ; les moins récemment utilisés sont oubliés."""
+        redacted, secrets_count = result
+        if redacted is content or (not secrets_count and redacted == content):
+            redacted = None  # Aucun secret : le contenu d'origine suffit
+        entry_chars = _ENTRY_CHARS + (len(redacted) if redacted is not None else 0)
+        if entry_chars > self.max_chars:
+            return
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self._chars -= self._entry_chars(previous)
+            self._results[key] = (redacted, secrets_count)
+            self._chars += entry_chars
+            while self._chars > self.max_chars:
+                _, evicted = self._results.popitem(last=False)
+                self._chars -= self._entry_chars(evicted)
+
+    def clear(self):
+        """Oublie tous les résultats."""
+        with self._lock:
+            self._results.clear()
+            self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @staticmethod
+    def _entry_chars(result: Tuple[Optional[str], int]) -> int:
+        return _ENTRY_CHARS + (len(result[0]) if result[0] is not None else 0)
@@ -0,0 +1,143 @@
+"""Limites de scan et jeton d'arrêt coopératif."""
+
+import time
+import threading
+from typing import Dict, Any, Optional
+from .exceptions import ScanCancelledException
+
+
+class ScanLimits:
+    """
+    Bornes d'un scan : nombre de fichiers, profondeur et durée.
+
+    Une valeur à 0 désactive la limite correspondante.
+    """
+
+    __slots__ = ('max_files', 'max_depth', 'max_seconds')
+
+    def __init__(self, max_files: int = 0, max_depth: int = 0, max_seconds: float = 0.0):
+        """
+        Args:
+            max_files: Nombre maximal de fichiers retenus par le parcours
+            max_depth: Profondeur maximale des répertoires parcourus (1 = sous-répertoires directs)
+            max_seconds: Durée maximale du scan, en secondes
+        """
+        self.max_files = max(0, int(max_files))
+        self.max_depth = max(0, int(max_depth))
+        self.max_seconds = max(0.0, float(max_seconds))
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ScanLimits':
+        """Construit les limites depuis la configuration du FileService (scan_max_*)."""
+        def read(key: str, cast, default):
+            try:
+                return cast(config.get(key, default))
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            max_files=read('scan_max_files', int, 0),
+            max_depth=read('scan_max_depth', int, 0),
+            max_seconds=read('scan_max_seconds', float, 0.0)
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'max_files': self.max_files, 'max_depth': self.max_depth, 'max_seconds': self.max_seconds}
+
+
+class ScanCancelToken:
+    """
+    Jeton d'arrêt partagé par les phases d'un scan (parcours, stat, filtre binaire).
+
+    Deux causes d'arrêt sont distinguées :
+    - l'annulation par l'utilisateur (cancel) : check() lève ScanCancelledException
+      et le scan est abandonné ;
+    - une limite atteinte (fichiers, durée) : should_stop() renvoie True, les
+      phases s'arrêtent proprement et le scan renvoie des résultats partiels
+      signalés par truncation().
+
+    La limite de profondeur n'arrête pas le scan : depth_allowed() élague les
+    répertoires trop profonds et le résultat est marqué comme tronqué.
+    """
+
+    def __init__(self, limits: Optional[ScanLimits] = None):
+        self.limits = limits or ScanLimits()
+        self.stop_reason: Optional[str] = None
+        self.depth_pruned = 0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._deadline: Optional[float] = None
+
+    def start(self, limits: Optional[ScanLimits] = None) -> 'ScanCancelToken':
+        """Arme le jeton pour un nouveau scan (démarre le chronomètre)."""
+        if limits is not None:
+            self.limits = limits
+        self.stop_reason = None
+        self.depth_pruned = 0
+        self._deadline = time.monotonic() + self.limits.max_seconds if self.limits.max_seconds else None
+        return self
+
+    def cancel(self):
+        """Demande l'annulation du scan."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self):
+        """Lève ScanCancelledException si l'annulation a été demandée."""
+        if self._cancelled.is_set():
+            raise ScanCancelledException("Scan annulé")
+
+    def should_stop(self, files_count: Optional[int] = None) -> bool:
+        """
+        Indique si le scan doit s'arrêter (limite atteinte).
+
+        Args:
+            files_count: Nombre de fichiers retenus jusqu'ici, comparé à max_files
+
+        Raises:
+            ScanCancelledException: Si l'annulation a été demandée
+        """
+        self.check()
+        if self.stop_reason is not None:
+            return True
+        reason = None
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            reason = 'max_seconds'
+        elif self.limits.max_files and files_count is not None and files_count >= self.limits.max_files:
+            reason = 'max_files'
+        if reason is not None:
+            with self._lock:
+                if self.stop_reason is None:
+                    self.stop_reason = reason
+            return True
+        return False
+
+    @property
+    def stopped(self) -> bool:
+        """True si une limite de fichiers ou de durée a été atteinte."""
+        return self.stop_reason is not None
+
+    def depth_allowed(self, rel_dir: str) -> bool:
+        """Indique si le répertoire relatif (POSIX) peut être parcouru."""
+        if not self.limits.max_depth or rel_dir.count('/') + 1 <= self.limits.max_depth:
+            return True
+        with self._lock:
+            self.depth_pruned += 1
+        return False
+
+    def truncation(self) -> Dict[str, Any]:
+        """Décrit la troncature du résultat (truncated=False si le scan est complet)."""
+        reasons = []
+        if self.stop_reason:
+            reasons.append(self.stop_reason)
+        if self.depth_pruned:
+            reasons.append('max_depth')
+        return {
+            'truncated': bool(reasons),
+            'reasons': reasons,
+            'depth_pruned_directories': self.depth_pruned,
+            'limits': self.limits.as_dict()
+        }
@@ -0,0 +1,193 @@
+"""Index persistant des fichiers scannés, par projet."""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Any, Optional, Iterable
+
+
+class ScanIndex:
+    """
+    Index sur disque des fichiers d'un projet.
+
+    Pour chaque fichier, l'index conserve la signature (taille, mtime, inode),
+    le verdict binaire/texte issu de l'analyse de contenu et, une fois
+    calculée, l'empreinte du contenu. Lors d'un nouveau scan, un fichier dont
+    la signature est inchangée réutilise son verdict et son empreinte au lieu
+    d'être rouvert.
+
+    Le fichier d'index est identifié par la clé projet normalisée
+    (``normcase(realpath)``), comme le cache de sélection.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_dir: Optional[str], directory_path: str,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            index_dir: Répertoire de stockage des index (None = index en mémoire uniquement)
+            directory_path: Répertoire du projet indexé
+            logger: Logger optionnel
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.project_key = os.path.normcase(os.path.realpath(directory_path))
+        self.index_path = None
+        if index_dir:
+            digest = hashlib.sha1(self.project_key.encode('utf-8')).hexdigest()[:16]
+            self.index_path = os.path.join(index_dir, f"{digest}.json")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+
+    @staticmethod
+    def signature(file_info) -> tuple:
+        """Retourne la signature (taille, mtime, inode) d'un enregistrement de fichier."""
+        return (file_info['size'], file_info.get('mtime', 0), file_info.get('inode', 0))
+
+    def load(self) -> 'ScanIndex':
+        """Charge l'index depuis le disque (index vide si absent ou corrompu)."""
+        self.entries = {}
+        if not self.index_path or not os.path.exists(self.index_path):
+            return self
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('project') == self.project_key:
+                self.entries = data.get('files', {})
+            else:
+                self.logger.info("Index de scan obsolète ou d'un autre projet — reconstruction")
+        except (json.JSONDecodeError, OSError, AttributeError) as e:
+            self.logger.warning(f"Index de scan illisible ({e}) — reconstruction")
+            self.entries = {}
+        return self
+
+    def get_verdict(self, file_info) -> Optional[bool]:
+        """
+        Retourne le verdict binaire mémorisé si la signature du fichier est inchangée.
+
+        Returns:
+            True (binaire), False (texte) ou None si le fichier doit être réanalysé
+        """
+        entry = self.entries.get(file_info['relative_path'])
+        if entry is None or tuple(entry['sig']) != self.signature(file_info):
+            return None
+        return entry.get('binary')
+
+    def set_verdict(self, file_info, is_binary: Optional[bool]):
+        """Enregistre le verdict binaire d'un fichier avec sa signature courante."""
+        entry = self.entries.get(file_info['relative_path'])
+        sig = list(self.signature(file_info))
+        if entry is not None and entry['sig'] == sig:
+            if entry.get('binary') == is_binary:
+                return
+            entry['binary'] = is_binary  # L'empreinte éventuelle reste valable
+        else:
+            self.entries[file_info['relative_path']] = {'sig': sig, 'binary': is_binary}
+        self._dirty = True
+
+    def get_hash(self, relative_path: str, signature: tuple) -> Optional[str]:
+        """Retourne l'empreinte mémorisée si elle correspond à la signature donnée."""
+        entry = self.entries.get(relative_path)
+        if entry is None or tuple(entry['sig']) != tuple(signature):
+            return None
+        return entry.get('hash')
+
+    def set_hash(self, relative_path: str, signature: tuple, content_hash: str):
+        """Enregistre l'empreinte du contenu ; une signature différente remplace l'entrée."""
+        entry = self.entries.get(relative_path)
+        sig = list(signature)
+        if entry is not None and entry['sig'] == sig:
+            if entry.get('hash') == content_hash:
+                return
+            entry['hash'] = content_hash
+        else:
+            self.entries[relative_path] = {'sig': sig, 'binary': None, 'hash': content_hash}
+        self._dirty = True
+
+    def reconcile(self, scanned_files: Iterable, partial: bool = False) -> Dict[str, int]:
+        """
+        Compare les fichiers scannés à l'index et met à jour les signatures.
+
+        Les entrées absentes du scan sont supprimées de l'index, sauf pour un
+        scan partiel (tronqué par une limite) où elles sont conservées.
+
+        Args:
+            scanned_files: Enregistrements issus du parcours du répertoire
+            partial: True si le scan n'a pas couvert tout le projet
+
+        Returns:
+            Dict avec les compteurs 'unchanged', 'modified', 'added' et 'removed'
+        """
+        stats = {'unchanged': 0, 'modified': 0, 'added': 0, 'removed': 0}
+        seen = set()
+        for file_info in scanned_files:
+            seen.add(file_info['relative_path'])
+            stats[self._update_entry(file_info)] += 1
+
+        if not partial:
+            stats['removed'] = self.remove([path for path in self.entries if path not in seen])
+        return stats
+
+    def update(self, files: Iterable) -> Dict[str, int]:
+        """Met à jour les signatures de quelques fichiers (changements détectés hors scan complet)."""
+        stats = {'unchanged': 0, 'modified': 0, 'added': 0}
+        for file_info in files:
+            stats[self._update_entry(file_info)] += 1
+        return stats
+
+    def remove(self, paths: Iterable[str]) -> int:
+        """Supprime des entrées de l'index ; retourne le nombre d'entrées supprimées."""
+        removed = 0
+        for path in paths:
+            if self.entries.pop(path, None) is not None:
+                removed += 1
+        if removed:
+            self._dirty = True
+        return removed
+
+    def _update_entry(self, file_info) -> str:
+        """Enregistre la signature courante ; verdict et empreinte sont oubliés si elle a changé."""
+        rel_path = file_info['relative_path']
+        entry = self.entries.get(rel_path)
+        sig = list(self.signature(file_info))
+        if entry is not None and entry['sig'] == sig:
+            return 'unchanged'
+        self.entries[rel_path] = {'sig': sig, 'binary': None}
+        self._dirty = True
+        return 'added' if entry is None else 'modified'
+
+    def save(self):
+        """Écrit l'index sur disque de manière atomique s'il a été modifié."""
+        if not self.index_path or not self._dirty:
+            return
+        tmppath = None
+        try:
+            dir_path = os.path.dirname(self.index_path)
+            os.makedirs(dir_path, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', delete=False, dir=dir_path,
+                                             encoding='utf-8', suffix='.tmp') as tf:
+                tmppath = tf.name
+                json.dump({
+                    'version': self.VERSION,
+                    'project': self.project_key,
+                    'files': self.entries
+                }, tf, ensure_ascii=False, separators=(',', ':'))
+                tf.flush()
+                os.fsync(tf.fileno())
+            os.replace(tmppath, self.index_path)
+            tmppath = None
+            try:
+                os.chmod(self.index_path, 0o600)
+            except OSError:
+                pass  # Sur Windows, chmod peut ne pas fonctionner
+            self._dirty = False
+        except Exception as e:
+            self.logger.warning(f"Impossible de sauvegarder l'index de scan: {e}")
+        finally:
+            if tmppath and os.path.exists(tmppath):
+                try:
+                    os.unlink(tmppath)
+                except OSError:
+                    pass
@@ -0,0 +1,222 @@
+"""Scans progressifs : suivi, envoi des fichiers par lots et annulation."""
+
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, Any, Optional, List, Callable
+from .exceptions import ScanCancelledException
+from .scan_control import ScanCancelToken
+
+
+class ScanProgress:
+    """
+    Suivi d'un scan en cours, partagé entre FileService et l'appelant.
+
+    FileService signale l'avancement (répertoires parcourus, fichiers
+    découverts, fichiers retenus) et vérifie l'annulation à chaque étape via
+    le jeton d'arrêt ``token``. Les fichiers retenus sont regroupés en lots de ``batch_size``
+    transmis à ``on_files`` ; les compteurs sont transmis à ``on_counts`` au
+    plus une fois par ``counts_interval`` secondes. Thread-safe : le parcours
+    parallèle signale l'avancement depuis plusieurs threads.
+    """
+
+    def __init__(self, on_files: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 on_counts: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 batch_size: int = 500, counts_interval: float = 0.25,
+                 token: Optional[ScanCancelToken] = None):
+        """
+        Args:
+            on_files: Reçoit chaque lot de fichiers retenus ({path, size, mtime})
+            on_counts: Reçoit les compteurs courants (voir counts)
+            batch_size: Nombre de fichiers par lot
+            counts_interval: Intervalle minimal entre deux envois de compteurs (secondes)
+            token: Jeton d'arrêt (annulation et limites), créé si absent
+        """
+        self.on_files = on_files
+        self.on_counts = on_counts
+        self.batch_size = max(1, batch_size)
+        self.counts_interval = counts_interval
+        self.phase = 'pending'
+        self.directories = 0
+        self.discovered = 0
+        self.accepted = 0
+        self._pending: List[Dict[str, Any]] = []
+        self.token = token or ScanCancelToken()
+        self._lock = threading.Lock()
+        self._last_counts = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self):
+        """Demande l'arrêt du scan (pris en compte au prochain check())."""
+        self.token.cancel()
+
+    def check(self):
+        """Lève ScanCancelledException si l'annulation a été demandée."""
+        self.token.check()
+
+    @property
+    def counts(self) -> Dict[str, Any]:
+        return {
+            'phase': self.phase,
+            'directories': self.directories,
+            'discovered': self.discovered,
+            'accepted': self.accepted
+        }
+
+    def set_phase(self, phase: str):
+        """Change de phase et publie immédiatement les compteurs."""
+        self.check()
+        self.phase = phase
+        self._publish_counts(force=True)
+
+    def directory_scanned(self, files_found: int):
+        """Signale un répertoire parcouru et le nombre de fichiers qu'il contient."""
+        with self._lock:
+            self.directories += 1
+            self.discovered += files_found
+        self.check()
+        self._publish_counts()
+
+    def files_discovered(self, count: int):
+        """Signale des fichiers découverts hors parcours de répertoires (index git)."""
+        with self._lock:
+            self.discovered += count
+        self.check()
+        self._publish_counts()
+
+    def files_accepted(self, entries: List[Dict[str, Any]]):
+        """Ajoute des fichiers retenus ; un lot est publié dès qu'il est complet."""
+        with self._lock:
+            self.accepted += len(entries)
+            self._pending.extend(entries)
+            batches = []
+            while len(self._pending) >= self.batch_size:
+                batches.append(self._pending[:self.batch_size])
+                del self._pending[:self.batch_size]
+        for batch in batches:
+            self._publish_files(batch)
+        self.check()
+        self._publish_counts()
+
+    def flush(self):
+        """Publie le dernier lot incomplet et les compteurs finaux."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._publish_files(batch)
+        self._publish_counts(force=True)
+
+    def _publish_files(self, batch: List[Dict[str, Any]]):
+        if self.on_files:
+            self.on_files(batch)
+
+    def _publish_counts(self, force: bool = False):
+        if not self.on_counts:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_counts < self.counts_interval:
+                return
+            self._last_counts = now
+        self.on_counts(self.counts)
+
+
+class ScanJob:
+    """
+    Scan exécuté en arrière-plan, identifié par un job_id.
+
+    Les événements sont transmis à ``emit(event, job_id, payload)`` :
+    'progress' (compteurs), 'files' (lot de fichiers), puis un événement
+    final 'complete' (résultat), 'cancelled' ou 'error'.
+    """
+
+    def __init__(self, directory_path: str,
+                 emit: Callable[[str, str, Any], None],
+                 batch_size: int = 500,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            directory_path: Répertoire à scanner
+            emit: Fonction de publication des événements vers l'interface
+            batch_size: Nombre de fichiers par lot envoyé
+            logger: Logger optionnel
+        """
+        self.job_id = uuid.uuid4().hex[:12]
+        self.directory_path = directory_path
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.status = 'pending'
+        self.error: Optional[str] = None
+        self._emit = emit
+        self.progress = ScanProgress(
+            on_files=lambda batch: self._safe_emit('files', batch),
+            on_counts=lambda counts: self._safe_emit('progress', counts),
+            batch_size=batch_size
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, scan: Callable[[ScanProgress], Dict[str, Any]],
+              on_success: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+              wait_for: Optional[List['ScanJob']] = None):
+        """
+        Lance le scan dans un thread.
+
+        Args:
+            scan: Exécute le scan avec le ScanProgress du job et retourne la réponse finale
+            on_success: Transforme la réponse avant l'événement 'complete'
+            wait_for: Jobs (annulés) dont la fin doit être attendue avant de démarrer
+        """
+        def run():
+            for job in wait_for or []:
+                job.join()
+            self.status = 'running'
+            try:
+                response = scan(self.progress)
+                self.progress.flush()
+                if on_success:
+                    response = on_success(response)
+                self.status = 'completed'
+                self._safe_emit('complete', response)
+            except ScanCancelledException:
+                self.status = 'cancelled'
+                self._safe_emit('cancelled', self.progress.counts)
+            except Exception as e:
+                self.status = 'error'
+                self.error = str(e)
+                self.logger.error(f"Scan {self.job_id} en échec: {e}")
+                self._safe_emit('error', {'error': self.error})
+
+        self._thread = threading.Thread(target=run, name=f"scan-{self.job_id}", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Demande l'annulation du scan."""
+        self.progress.cancel()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('completed', 'cancelled', 'error')
+
+    def snapshot(self) -> Dict[str, Any]:
+        """État courant du job, pour un suivi par interrogation."""
+        return {
+            'job_id': self.job_id,
+            'directory': self.directory_path,
+            'status': self.status,
+            'counts': self.progress.counts,
+            'error': self.error
+        }
+
+    def _safe_emit(self, event: str, payload: Any):
+        try:
+            self._emit(event, self.job_id, payload)
+        except Exception as e:
+            # Une fenêtre fermée ne doit pas interrompre le scan
+            self.logger.warning(f"Envoi de l'événement de scan '{event}' impossible: {e}")
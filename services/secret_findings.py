@@ -0,0 +1,184 @@
+"""Résultats persistants de la détection des secrets, par projet."""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class SecretFinding(NamedTuple):
+    """Secret détecté dans un fichier."""
+    line: int      # Numéro de ligne (à partir de 1)
+    type: str      # Type du secret (motif regex ou type detect-secrets)
+    detector: str  # 'regex' ou 'detect-secrets'
+
+
+class SecretFindingsStore:
+    """
+    Secrets détectés dans les fichiers d'un projet, conservés sur disque.
+
+    Les résultats sont indexés par empreinte du contenu (voir content_hash) :
+    un fichier inchangé n'est pas réanalysé, et deux fichiers identiques
+    partagent leurs résultats. Le chemin de chaque fichier analysé est associé
+    à l'empreinte de son dernier contenu connu, pour le rapport d'audit.
+
+    Pour chaque fichier sans secret, le magasin retient aussi l'empreinte du
+    texte exactement analysé (hash_text) : la génération ne saute le masquage
+    que d'un texte lu identique sous le même chemin (voir clean_texts), jamais
+    d'après la seule signature du fichier sur disque. Le chemin fait partie de
+    la clé car detect-secrets choisit ses plugins selon le nom et le type du
+    fichier : un même texte peut être sain sous un nom et non sous un autre.
+
+    Le magasin est invalidé si la version des détecteurs (motifs regex,
+    plugins detect-secrets) change. Le fichier est identifié par la clé
+    projet normalisée, comme l'index de scan.
+    """
+
+    VERSION = 2
+
+    def __init__(self, store_dir: Optional[str], directory_path: str, detectors_version: str,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            store_dir: Répertoire de stockage (None = résultats en mémoire uniquement)
+            directory_path: Répertoire du projet
+            detectors_version: Identifiant de la version des détecteurs
+            logger: Logger optionnel
+        """
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.project_key = os.path.normcase(os.path.realpath(directory_path))
+        self.detectors_version = detectors_version
+        self.store_path = None
+        if store_dir:
+            digest = hashlib.sha1(self.project_key.encode('utf-8')).hexdigest()[:16]
+            self.store_path = os.path.join(store_dir, f"{digest}.findings.json")
+        self.findings: Dict[str, List[list]] = {}  # empreinte -> [[ligne, type, détecteur], ...]
+        self.files: Dict[str, str] = {}  # chemin relatif -> empreinte du dernier contenu analysé
+        self.clean: Dict[str, str] = {}  # chemin relatif -> empreinte du texte analysé sans secret
+        self._dirty = False
+
+    def load(self) -> 'SecretFindingsStore':
+        """Charge les résultats depuis le disque (magasin vide si absent, corrompu ou obsolète)."""
+        self.findings, self.files, self.clean = {}, {}, {}
+        if not self.store_path or not os.path.exists(self.store_path):
+            return self
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get('version') == self.VERSION and data.get('project') == self.project_key
+                    and data.get('detectors') == self.detectors_version):
+                self.findings = data.get('findings', {})
+                self.files = data.get('files', {})
+                self.clean = data.get('clean', {})
+            else:
+                self.logger.info("Résultats de détection des secrets obsolètes — réanalyse")
+        except (json.JSONDecodeError, OSError, AttributeError) as e:
+            self.logger.warning(f"Résultats de détection des secrets illisibles ({e}) — réanalyse")
+            self.findings, self.files, self.clean = {}, {}, {}
+        return self
+
+    def get(self, content_hash: str) -> Optional[List[SecretFinding]]:
+        """Retourne les secrets connus pour ce contenu, ou None s'il n'a pas été analysé."""
+        entries = self.findings.get(content_hash)
+        return None if entries is None else [SecretFinding(*entry) for entry in entries]
+
+    def record(self, relative_path: str, content_hash: str,
+               findings: Optional[Iterable[SecretFinding]] = None, text_hash: Optional[str] = None):
+        """
+        Associe un fichier à l'empreinte de son contenu et, si fournis, enregistre ses secrets.
+
+        Args:
+            relative_path: Chemin relatif du fichier
+            content_hash: Empreinte du contenu analysé
+            findings: Secrets détectés (None si le contenu est déjà connu du magasin)
+            text_hash: Empreinte du texte analysé (hash_text), retenue s'il est sans secret
+        """
+        if findings is not None:
+            findings = [list(finding) for finding in findings]
+            self.findings[content_hash] = findings
+            self._dirty = True
+            if text_hash and not findings:
+                self.clean[relative_path] = text_hash
+            else:
+                self.clean.pop(relative_path, None)
+        if self.files.get(relative_path) != content_hash:
+            self.files[relative_path] = content_hash
+            if findings is None:
+                self.clean.pop(relative_path, None)
+            self._dirty = True
+
+    def clean_texts(self, texts: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Parmi ces (chemin relatif, empreinte du texte), ceux d'un texte analysé sans aucun secret sous ce chemin."""
+        return {(path, text_hash) for path, text_hash in texts if self.clean.get(path) == text_hash}
+
+    def forget(self, paths: Iterable[str]) -> int:
+        """Oublie des fichiers (supprimés du projet) ; retourne le nombre de fichiers oubliés."""
+        removed = 0
+        for path in paths:
+            self.clean.pop(path, None)
+            if self.files.pop(path, None) is not None:
+                removed += 1
+        if removed:
+            self._dirty = True
+        return removed
+
+    def report(self, paths: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Liste les secrets des fichiers analysés, triés par chemin puis par ligne.
+
+        Args:
+            paths: Fichiers à inclure (défaut : tous les fichiers analysés)
+
+        Returns:
+            Liste de dicts {'path', 'line', 'type', 'detector'}
+        """
+        selected = self.files.keys() if paths is None else [path for path in paths if path in self.files]
+        report = []
+        for path in sorted(selected):
+            for line, secret_type, detector in self.findings.get(self.files[path], ()):
+                report.append({'path': path, 'line': line, 'type': secret_type, 'detector': detector})
+        report.sort(key=lambda finding: (finding['path'], finding['line'], finding['detector']))
+        return report
+
+    def save(self):
+        """Écrit les résultats sur disque de manière atomique s'ils ont été modifiés."""
+        if not self.store_path or not self._dirty:
+            return
+        # Les contenus qui ne correspondent plus à aucun fichier sont oubliés
+        referenced = set(self.files.values())
+        self.findings = {content_hash: entries for content_hash, entries in self.findings.items()
+                         if content_hash in referenced}
+        tmppath = None
+        try:
+            dir_path = os.path.dirname(self.store_path)
+            os.makedirs(dir_path, exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', delete=False, dir=dir_path,
+                                             encoding='utf-8', suffix='.tmp') as tf:
+                tmppath = tf.name
+                json.dump({
+                    'version': self.VERSION,
+                    'project': self.project_key,
+                    'detectors': self.detectors_version,
+                    'files': self.files,
+                    'findings': self.findings,
+                    'clean': self.clean
+                }, tf, ensure_ascii=False, separators=(',', ':'))
+                tf.flush()
+                os.fsync(tf.fileno())
+            os.replace(tmppath, self.store_path)
+            tmppath = None
+            try:
+                os.chmod(self.store_path, 0o600)
+            except OSError:
+                pass  # Sur Windows, chmod peut ne pas fonctionner
+            self._dirty = False
+        except Exception as e:
+            self.logger.warning(f"Impossible de sauvegarder les résultats de détection des secrets: {e}")
+        finally:
+            if tmppath and os.path.exists(tmppath):
+                try:
+                    os.unlink(tmppath)
+                except OSError:
+                    pass
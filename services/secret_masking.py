@@ -0,0 +1,195 @@
+"""Masquage des secrets réparti sur plusieurs processus."""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .file_service import FileService
+from .content_hash import hash_text
+
+
+# Taille maximale (caractères) d'un lot envoyé à un processus : un gros
+# fichier n'entraîne pas ses voisins dans le même lot
+_BATCH_MAX_CHARS = 1024 * 1024
+
+# Taille maximale (caractères) d'un groupe de fichiers masqués au fil des
+# lectures (voir MaskingExecutor.mask_stream)
+_STREAM_MAX_CHARS = 16 * 1024 * 1024
+
+# FileService propre à chaque processus de masquage (plugins et cache locaux)
+_worker_service: Optional[FileService] = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    global _worker_service
+    # Les résultats sont mémorisés par le seul FileService appelant
+    _worker_service = FileService({**config, 'secrets_cache_mb': 0})
+
+
+def _mask_batch(batch: List[Tuple[str, str]], redact_mode: str) -> List[Tuple[str, int]]:
+    return [_worker_service.mask_secrets(content, path, redact_mode) for path, content in batch]
+
+
+class MaskingExecutor:
+    """
+    Masque les secrets d'une sélection de fichiers sur plusieurs cœurs.
+
+    L'analyse (detect-secrets puis expressions régulières) est du Python pur
+    qui ne libère pas le GIL : les fichiers sont donc répartis par lots sur
+    un ProcessPoolExecutor, chaque processus disposant de son propre
+    FileService. Les résultats sont rendus dans l'ordre des fichiers. Les
+    petites sélections sont traitées en série par le FileService appelant.
+
+    Les résultats sont mémorisés dans le cache du FileService appelant
+    (voir FileService.get_cached_masking), y compris ceux calculés par les
+    processus : d'une génération à l'autre, seuls les fichiers modifiés sont
+    de nouveau analysés, et le seuil du parallélisme porte sur ces seuls
+    fichiers.
+
+    Un texte identique à un texte analysé sans secret sous le même chemin
+    par la détection en arrière-plan (FileService.known_clean_texts) n'est
+    pas masqué.
+
+    Configuration (celle du FileService) :
+        masking_workers: Nombre de processus (0 = nombre de cœurs, 1 = toujours en série)
+        masking_batch_size: Nombre maximal de fichiers par lot
+        masking_min_files: En dessous de ce nombre de fichiers à analyser, masquage en série
+    """
+
+    def __init__(self, file_service: FileService, workers: int = 0, batch_size: int = 32,
+                 min_parallel_files: int = 64,
+                 logger: Optional[logging.Logger] = None):
+        self.file_service = file_service
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.min_parallel_files = min_parallel_files
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._pool = None  # Créé au premier masquage parallèle, puis réutilisé
+
+    @classmethod
+    def from_service(cls, file_service: FileService, logger: Optional[logging.Logger] = None) -> 'MaskingExecutor':
+        """Construit l'exécuteur depuis la configuration du FileService."""
+        return cls(
+            file_service,
+            workers=file_service._get_int_config('masking_workers', 0),
+            batch_size=file_service._get_int_config('masking_batch_size', 32),
+            min_parallel_files=file_service._get_int_config('masking_min_files', 64),
+            logger=logger
+        )
+
+    def mask_all(self, files: List[Tuple[str, str]], redact_mode: str = 'mask') -> List[Tuple[str, int]]:
+        """
+        Masque les secrets de chaque fichier.
+
+        Args:
+            files: (chemin relatif, contenu) de chaque fichier
+            redact_mode: 'mask' ou 'remove' (voir FileService.detect_and_redact_secrets)
+
+        Returns:
+            (contenu masqué, nombre de secrets) pour chaque fichier, dans le même ordre
+        """
+        text_hashes = [hash_text(content) for _, content in files]
+        # Textes lus identiques à un texte analysé sans secret (scan_secret_findings) : rien à masquer
+        clean_texts = self.file_service.known_clean_texts(
+            [(path, text_hash) for text_hash, (path, _) in zip(text_hashes, files)])
+        results = [
+            (content, 0) if (path, text_hash) in clean_texts
+            else self.file_service.get_cached_masking(content, text_hash, path, redact_mode)
+            for text_hash, (path, content) in zip(text_hashes, files)
+        ]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        masked = self._mask_uncached([files[i] for i in missing], redact_mode, [text_hashes[i] for i in missing])
+        for i, result in zip(missing, masked):
+            results[i] = result
+        return results
+
+    def mask_stream(self, files: Iterable[Tuple[str, str]],
+                    redact_mode: str = 'mask') -> Iterator[Tuple[str, str, int]]:
+        """
+        Masque les secrets de fichiers produits au fil des lectures.
+
+        Les fichiers sont masqués par groupes bornés (assez de fichiers pour
+        occuper les processus, au plus _STREAM_MAX_CHARS caractères) dès que
+        chaque groupe est complet : le traitement commence avant la dernière
+        lecture et seuls les contenus d'un groupe sont en mémoire à la fois.
+
+        Args:
+            files: (chemin relatif, contenu) de chaque fichier, par exemple au fil de
+                   FileService.iter_file_contents
+            redact_mode: 'mask' ou 'remove' (voir FileService.detect_and_redact_secrets)
+
+        Yields:
+            (chemin relatif, contenu masqué, nombre de secrets), dans l'ordre des fichiers
+        """
+        max_files = max(self.min_parallel_files, self.workers * self.batch_size, 1)
+        group, group_chars = [], 0
+        for path, content in files:
+            group.append((path, content))
+            group_chars += len(content)
+            if len(group) >= max_files or group_chars >= _STREAM_MAX_CHARS:
+                yield from self._mask_group(group, redact_mode)
+                group, group_chars = [], 0
+        if group:
+            yield from self._mask_group(group, redact_mode)
+
+    def _mask_group(self, group: List[Tuple[str, str]], redact_mode: str) -> Iterator[Tuple[str, str, int]]:
+        for (path, _), (content, secrets_count) in zip(group, self.mask_all(group, redact_mode)):
+            yield path, content, secrets_count
+
+    def _mask_uncached(self, files: List[Tuple[str, str]], redact_mode: str,
+                       text_hashes: List[str]) -> List[Tuple[str, int]]:
+        if self.workers <= 1 or len(files) < self.min_parallel_files:
+            return self._mask_serial(files, redact_mode)
+
+        batches = list(self._batches(files))
+        try:
+            pool = self._get_pool()
+            results = []
+            for batch_results in pool.map(_mask_batch, batches, [redact_mode] * len(batches)):
+                results.extend(batch_results)
+            for (path, content), text_hash, result in zip(files, text_hashes, results):
+                self.file_service.store_masking(content, text_hash, path, redact_mode, result)
+            return results
+        except Exception as e:
+            # Processus indisponibles (environnement figé, ressources) : masquage en série
+            self.logger.warning(f"Masquage parallèle impossible, passage en série: {e}")
+            self.shutdown()
+            self.workers = 1
+            return self._mask_serial(files, redact_mode)
+
+    def shutdown(self):
+        """Arrête les processus de masquage."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _mask_serial(self, files: List[Tuple[str, str]], redact_mode: str) -> List[Tuple[str, int]]:
+        return [self.file_service.mask_secrets(content, path, redact_mode) for path, content in files]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.file_service.config,)
+            )
+            self.logger.info(f"Masquage des secrets réparti sur {self.workers} processus")
+        return self._pool
+
+    def _batches(self, files: List[Tuple[str, str]]) -> Iterator[List[Tuple[str, str]]]:
+        """Lots consécutifs d'au plus batch_size fichiers et _BATCH_MAX_CHARS caractères."""
+        # Assez de lots pour occuper chaque processus, même avec une grande taille de lot
+        batch_size = max(1, min(self.batch_size, -(-len(files) // (self.workers * 4))))
+        batch, batch_chars = [], 0
+        for path, content in files:
+            if batch and (len(batch) >= batch_size or batch_chars + len(content) > _BATCH_MAX_CHARS):
+                yield batch
+                batch, batch_chars = [], 0
+            batch.append((path, content))
+            batch_chars += len(content)
+        if batch:
+            yield batch
@@ -0,0 +1,306 @@
+"""Détection des secrets par expressions régulières, compilées une fois."""
+
+import re
+import hashlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Motifs de secrets, par ordre de priorité : une ligne est étiquetée avec le
+# premier motif qui y correspond
+SECRET_PATTERNS: List[Tuple[str, str]] = [
+    # API Keys - différents formats courants
+    ('api_key', r'(?i)(api[_-]?key|apikey|api_token|auth_token|authorization_token|bearer_token)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z\-_\.]{16,128})["\']?'),
+    # Tokens divers (OAuth, JWT, etc.)
+    ('token', r'(?i)(access_token|auth_token|token)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z._\-]{8,64})["\']?'),
+    # Clés AWS
+    ('aws_key', r'(?i)(AKIA[0-9A-Z]{16})'),
+    # URLs contenant username:password
+    ('url_auth', r'(?i)https?://[^:@/\s]+:[^:@/\s]+@[^/\s]+'),
+    # Clés privées
+    ('private_key_pem', r'-----BEGIN ((RSA|EC|OPENSSH|PGP) )?PRIVATE KEY-----'),
+    # Documentation de credentials/variables sensibles avec valeurs
+    ('credentials_doc', r'(?i)# ?(password|secret|key|token|credential).*[=:] ?"[^"]{3,}"'),
+    # Clés AWS
+    ('aws_secret', r'(?i)(aws[\w_\-]*secret[\w_\-]*key)["\']?\s*[:=]\s*["\']?([0-9a-zA-Z\-_\/+]{40})["\']?'),
+    # Clés privées
+    ('private_key', r'(?i)(-----BEGIN [A-Z]+ PRIVATE KEY-----)'),
+    # Connection strings
+    ('connection_string', r'(?i)(mongodb|mysql|postgresql|sqlserver|redis|amqp)://[^:]+:[^@]+@[:\w\.\-]+[/:\w\d\?=&%\-\.]*'),
+]
+
+# Littéraux (en minuscules) dont l'un au moins figure dans toute correspondance
+# du motif : une ligne qui n'en contient aucun ne peut pas lui correspondre
+PATTERN_LITERALS: Dict[str, Tuple[str, ...]] = {
+    'api_key': ('key', 'token'),
+    'token': ('token',),
+    'aws_key': ('akia',),
+    'url_auth': ('://',),
+    'private_key_pem': ('private key',),
+    'credentials_doc': ('#',),
+    'aws_secret': ('secret',),
+    'private_key': ('private key',),
+    'connection_string': ('://',),
+}
+
+# Caractères que re.IGNORECASE rapproche d'une lettre ASCII sans que str.lower() le fasse
+# (ſ ~ s, ı ~ i) : leur présence impose le préfiltre insensible à la casse
+_CASEFOLD_ONLY = ('\u017f', '\u0131')
+
+# Séparateurs de lignes reconnus par str.splitlines
+_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+_LINE_BREAK = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Taille des fenêtres mises en minuscules pour le préfiltre : str.lower()
+# réserve un tampon temporaire de 12 octets par caractère hors ASCII
+WINDOW_CHARS = 256 * 1024
+
+# Bloc PEM : après une ligne BEGIN, les lignes jusqu'à END sont masquées
+# elles aussi, si elles ressemblent à un corps de clé (base64, en-têtes
+# 'Nom: valeur', lignes vides) et que END arrive dans les PEM_MAX_LINES lignes
+PEM_LABELS = ('private_key_pem', 'private_key')
+PEM_MAX_LINES = 200
+_PEM_END = re.compile(r'-----END [A-Z0-9 ]*PRIVATE KEY-----')
+_PEM_BODY = re.compile(r'[A-Za-z0-9+/=\s]*|[A-Za-z][A-Za-z0-9-]*: .*')
+
+
+class RegexSecretScanner:
+    """
+    Détecteur de secrets par expressions régulières, en une passe sur le contenu.
+
+    Les motifs sont compilés une fois. Une expression préfiltre réunissant
+    les littéraux obligatoires des motifs (PATTERN_LITERALS), cherchée dans
+    le contenu en minuscules, saute directement aux lignes candidates ; sur
+    une ligne candidate, seuls les motifs dont un littéral est présent sont
+    essayés, par priorité. L'étiquette d'une ligne est identique à un test
+    de chaque motif sur chaque ligne ; le corps d'un bloc PEM qui suit une
+    ligne BEGIN est masqué avec elle.
+
+    Deux entrées : redact() pour un contenu en mémoire (réécrit par tranches,
+    sans liste de lignes intermédiaire), redact_stream() pour des lignes lues
+    au fil de l'eau (fichier ouvert en mode texte).
+    """
+
+    def __init__(self, patterns: List[Tuple[str, str]] = None,
+                 pattern_literals: Dict[str, Tuple[str, ...]] = None):
+        """
+        Args:
+            patterns: (nom, expression) par ordre de priorité (défaut: SECRET_PATTERNS)
+            pattern_literals: Littéraux obligatoires par motif (défaut: PATTERN_LITERALS) ;
+                              un motif sans littéral connu est essayé sur toutes les lignes
+        """
+        self.patterns = list(patterns or SECRET_PATTERNS)
+        # Identifie les règles de détection (résultats persistants, voir SecretFindingsStore)
+        self.version = hashlib.sha1(repr((self.patterns, PEM_LABELS, PEM_MAX_LINES)).encode('utf-8')).hexdigest()[:16]
+        pattern_literals = PATTERN_LITERALS if pattern_literals is None else pattern_literals
+        self._compiled = [
+            (name, re.compile(pattern), tuple(literal.lower() for literal in pattern_literals.get(name, ())))
+            for name, pattern in self.patterns
+        ]
+        # Un motif sans littéral peut correspondre n'importe où : pas de préfiltre possible
+        self._unfiltered = any(not literals for _, _, literals in self._compiled)
+        all_literals = sorted({literal for _, _, literals in self._compiled for literal in literals})
+        literals = '|'.join(re.escape(literal) for literal in all_literals) or '(?!)'
+        # Recherche sensible à la casse sur le contenu en minuscules : nettement plus rapide
+        self._prefilter = re.compile(literals)
+        self._prefilter_ignorecase = re.compile(literals, re.IGNORECASE)
+
+    def label_line(self, line: str, lowered: Optional[str] = None) -> Optional[str]:
+        """
+        Nom du premier motif (par priorité) présent dans la ligne, ou None.
+
+        Args:
+            line: Ligne analysée
+            lowered: line.lower(), s'il est déjà calculé
+        """
+        if lowered is None:
+            if any(char in line for char in _CASEFOLD_ONLY):
+                return self._label_unfiltered(line)
+            lowered = line.lower()
+        for name, regex, literals in self._compiled:
+            if literals and not any(literal in lowered for literal in literals):
+                continue
+            if regex.search(line):
+                return name
+        return None
+
+    def _label_unfiltered(self, line: str) -> Optional[str]:
+        """Comme label_line, en essayant tous les motifs sans tenir compte des littéraux."""
+        for name, regex, _ in self._compiled:
+            if regex.search(line):
+                return name
+        return None
+
+    def _label_candidate(self, line: str) -> Optional[str]:
+        """label_line précédé du préfiltre (ligne isolée, sans retour à la ligne)."""
+        if self._unfiltered:
+            return self._label_unfiltered(line)
+        lowered = line.lower()
+        if len(lowered) != len(line) or any(char in line for char in _CASEFOLD_ONLY):
+            return self._label_unfiltered(line) if self._prefilter_ignorecase.search(line) else None
+        return self.label_line(line, lowered) if self._prefilter.search(lowered) else None
+
+    def iter_findings(self, content: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Parcourt les lignes à masquer.
+
+        Args:
+            content: Contenu analysé
+
+        Yields:
+            (début, fin, nom du motif) : position de la ligne dans content, sans
+            son retour à la ligne, dans l'ordre des lignes
+        """
+        breaks = [char for char in _LINE_BREAKS if char in content]
+        floor = 0  # Début de la première ligne non traitée
+        while floor < len(content):
+            # Fenêtre alignée sur les fins de ligne : une ligne n'est jamais coupée
+            window_end = _line_end(content, min(floor + WINDOW_CHARS, len(content)))[1]
+            floor = yield from self._window_findings(content, floor, window_end, breaks)
+
+    def _window_findings(self, content: str, floor: int, window_end: int,
+                         breaks: List[str]) -> Iterator[Tuple[int, int, str]]:
+        """Lignes à masquer de content[floor:window_end] ; retourne le début de la ligne suivante."""
+        window_start = floor
+        window = content[window_start:window_end]
+        haystack = window.lower()
+        if self._unfiltered or len(haystack) != len(window) or any(char in window for char in _CASEFOLD_ONLY):
+            # Positions décalées par les minuscules, ou motif sans littéral : ligne par ligne
+            haystack = None
+            match = None
+        else:
+            match = self._prefilter.search(haystack)
+        while floor < window_end:
+            if haystack is None:
+                start = floor
+                end, next_start = _line_end(content, start)
+                name = self._label_candidate(content[start:end])
+            elif match is None:
+                return window_end
+            else:
+                position = window_start + match.start()
+                start = max(floor, max([content.rfind(char, floor, position) for char in breaks], default=-1) + 1)
+                end, next_start = _line_end(content, position)
+                name = self.label_line(content[start:end], haystack[start - window_start:end - window_start])
+            if name is not None:
+                yield start, end, name
+                if name in PEM_LABELS and not _PEM_END.search(content, start, end):
+                    for block_start, block_end in _pem_block(content, next_start):
+                        yield block_start, block_end, name
+                        next_start = _line_end(content, block_end)[1]
+            floor = next_start
+            if haystack is not None and floor < window_end:
+                # Les autres littéraux de la même ligne n'apportent rien
+                match = self._prefilter.search(haystack, floor - window_start)
+        return floor
+
+    def iter_line_findings(self, content: str) -> Iterator[Tuple[int, str]]:
+        """(numéro de ligne à partir de 1, nom du motif) de chaque ligne à masquer."""
+        line_number = 1
+        position = 0
+        for start, _, name in self.iter_findings(content):
+            line_number += sum(1 for _ in _LINE_BREAK.finditer(content, position, start))
+            position = start
+            yield line_number, name
+
+    def redact(self, content: str) -> Tuple[str, int]:
+        """
+        Remplace chaque ligne contenant un secret par un marqueur.
+
+        Les retours à la ligne d'origine sont conservés ; la sortie est
+        assemblée à partir des tranches situées entre les lignes masquées.
+
+        Returns:
+            tuple: (contenu redacté, nombre de lignes masquées) ; le contenu est
+            renvoyé tel quel si aucun secret n'est trouvé
+        """
+        parts = []
+        position = 0
+        for start, end, name in self.iter_findings(content):
+            parts.append(content[position:start])
+            parts.append(f"[LINE CONTAINING SENSITIVE DATA: {name}]")
+            position = end
+        if not parts:
+            return content, 0
+        parts.append(content[position:])
+        return "".join(parts), len(parts) // 2
+
+    def redact_stream(self, lines: Iterable[str], write: Callable[[str], Any]) -> int:
+        """
+        Masque des lignes lues au fil de l'eau (ex : fichier ouvert en mode texte).
+
+        Chaque ligne, retour à la ligne compris, est écrite aussitôt avec
+        write, ou remplacée par un marqueur ; seules les lignes d'un bloc
+        PEM en cours (au plus PEM_MAX_LINES) sont retenues jusqu'à sa fin.
+
+        Args:
+            lines: Lignes avec leur retour à la ligne
+            write: Fonction d'écriture de la sortie (ex : io.StringIO().write)
+
+        Returns:
+            Nombre de lignes masquées
+        """
+        count = 0
+        pending = None  # (nom, lignes retenues) pendant un bloc PEM
+        for line in lines:
+            text = line.rstrip(_LINE_BREAKS)
+            if pending is not None:
+                name, held = pending
+                if _PEM_END.search(text):
+                    for held_line in held:
+                        write(_marker(name, held_line))
+                    write(_marker(name, line))
+                    count += len(held) + 1
+                    pending = None
+                    continue
+                if _PEM_BODY.fullmatch(text) and len(held) < PEM_MAX_LINES:
+                    held.append(line)
+                    continue
+                # Pas un bloc PEM : les lignes retenues sont analysées normalement
+                pending = None
+                count += self.redact_stream(held, write)
+            name = self._label_candidate(text)
+            if name is None:
+                write(line)
+                continue
+            write(_marker(name, line))
+            count += 1
+            if name in PEM_LABELS and not _PEM_END.search(text):
+                pending = (name, [])
+        if pending is not None:
+            count += self.redact_stream(pending[1], write)
+        return count
+
+
+def _marker(name: str, line: str) -> str:
+    """Marqueur remplaçant une ligne, suivi de son retour à la ligne d'origine."""
+    return f"[LINE CONTAINING SENSITIVE DATA: {name}]{line[len(line.rstrip(_LINE_BREAKS)):]}"
+
+
+def _line_end(content: str, position: int) -> Tuple[int, int]:
+    """(fin de la ligne contenant position, début de la ligne suivante)."""
+    match = _LINE_BREAK.search(content, position)
+    return (match.start(), match.end()) if match else (len(content), len(content))
+
+
+def _pem_block(content: str, start: int) -> List[Tuple[int, int]]:
+    """
+    Lignes du corps d'un bloc PEM commençant à start, END compris.
+
+    Returns:
+        (début, fin) de chaque ligne, ou liste vide si END n'arrive pas dans
+        les PEM_MAX_LINES lignes ou si une ligne ne ressemble pas à un corps de clé
+    """
+    lines = []
+    while start < len(content) and len(lines) <= PEM_MAX_LINES:
+        end, next_start = _line_end(content, start)
+        lines.append((start, end))
+        if _PEM_END.search(content, start, end):
+            return lines
+        if not _PEM_BODY.fullmatch(content, start, end):
+            return []
+        start = next_start
+    return []
+
+
+# Détecteur partagé (les motifs sont compilés à l'import)
+DEFAULT_SCANNER = RegexSecretScanner()
@@ -0,0 +1,80 @@
+"""Sections formatées du contexte, mémorisées d'une génération à l'autre."""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+
+class CachedSection(NamedTuple):
+    """Section d'un fichier prête à être insérée dans le contexte."""
+    text: str           # Section formatée (voir ContextBuilderService.format_section)
+    size: int           # Nombre de caractères du contenu inclus
+    line_count: int     # Nombre de lignes du fichier (réel, même pour un extrait)
+    secrets_count: int  # Nombre de secrets masqués dans le contenu
+
+
+# Clé d'une section : (chemin relatif, empreinte des octets lus, masquage)
+SectionKey = Tuple[str, str, Optional[str]]
+
+
+class SectionCache:
+    """
+    Cache LRU des sections formatées du contexte.
+
+    Une section est identifiée par le chemin du fichier, l'empreinte des
+    octets effectivement lus pour la produire (FileService.get_file_content)
+    et le mode de masquage (None si désactivé). Elle est recherchée avec
+    l'empreinte du fichier sur disque (FileService.get_content_hashes),
+    calculée de la même manière sur les octets bruts : elle n'est reprise que
+    si le fichier n'a pas changé depuis la lecture, quels que soient ses
+    retours à la ligne ou son encodage. Le cache est borné par le nombre
+    total de caractères des sections conservées.
+
+    Seules les sections complètes sont mémorisées : les générations ajustées
+    à un budget de tokens (fichiers compactés, réduits à leurs signatures ou
+    omis selon le plan) ne passent jamais par ce cache.
+    """
+
+    def __init__(self, max_chars: int = 256 * 1024 * 1024, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            max_chars: Nombre maximal de caractères conservés (0 = cache désactivé)
+            logger: Logger optionnel
+        """
+        self.max_chars = max_chars
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self._sections = OrderedDict()  # SectionKey -> CachedSection
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: SectionKey) -> Optional[CachedSection]:
+        """Retourne la section mémorisée pour cette clé, ou None."""
+        with self._lock:
+            section = self._sections.get(key)
+            if section is not None:
+                self._sections.move_to_end(key)
+            return section
+
+    def put(self, key: SectionKey, section: CachedSection):
+        """Mémorise une section ; les moins récemment utilisées sont oubliées au-delà de max_chars."""
+        if len(section.text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._sections.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous.text)
+            self._sections[key] = section
+            self._chars += len(section.text)
+            while self._chars > self.max_chars:
+                _, evicted = self._sections.popitem(last=False)
+                self._chars -= len(evicted.text)
+
+    def clear(self):
+        """Oublie toutes les sections."""
+        with self._lock:
+            self._sections.clear()
+            self._chars = 0
+
+    def __len__(self) -> int:
+        return len(self._sections)
@@ -0,0 +1,341 @@
+"""
+Comptage de tokens hors ligne : byte-pair encoding (BPE) sur un vocabulaire
+tiktoken configuré, bibliothèque tiktoken si elle est installée, ou à défaut
+estimation (4 caractères par token).
+"""
+
+import re
+import base64
+import heapq
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Union
+
+from .content_hash import hash_bytes
+
+try:
+    import tiktoken
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+
+# Caractères par token de l'estimation utilisée sans tokeniseur
+CHARS_PER_TOKEN = 4
+
+# Encodage tiktoken utilisé par défaut (modèles GPT-3.5 / GPT-4)
+DEFAULT_ENCODING = 'cl100k_base'
+
+# Découpage préalable du texte en mots (celui de cl100k_base, exprimé avec le
+# module re : les classes \p{L} et \p{N} sont approchées par [^\W\d_] et \d)
+PRETOKENIZE_PATTERN = re.compile(
+    r"(?i:'s|'t|'re|'ve|'m|'ll|'d)"
+    r"|(?:[^\r\n\w]|_)?[^\W\d_]+"
+    r"|\d{1,3}"
+    r"| ?(?:[^\s\w]|_)+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+"
+)
+
+# Au-delà de cette taille (octets), un mot est fusionné avec un tas plutôt
+# que par recherche linéaire de la meilleure paire (coût quadratique)
+_HEAP_MERGE_MIN_BYTES = 256
+
+# Nombre de mots dont le nombre de tokens est mémorisé
+_PIECE_CACHE_SIZE = 1 << 16
+
+
+def load_tiktoken_ranks(path: str) -> Dict[bytes, int]:
+    """
+    Charge un vocabulaire au format tiktoken : une ligne '<token en base64> <rang>' par token.
+
+    Args:
+        path: Chemin du fichier, par exemple cl100k_base.tiktoken. Le découpage
+              préalable (PRETOKENIZE_PATTERN) n'étant qu'une approximation de celui
+              de cl100k_base, les comptes sont proches de ceux des modèles OpenAI
+              sans leur être identiques (lettres et chiffres non latins notamment)
+
+    Returns:
+        Rang de fusion de chaque séquence d'octets
+    """
+    ranks = {}
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+    return ranks
+
+
+class CharEstimator:
+    """
+    Estimation du nombre de tokens sans vocabulaire : CHARS_PER_TOKEN caractères
+    par token, arrondi au supérieur.
+
+    Ce n'est qu'un ordre de grandeur : l'écart avec un tokeniseur réel dépend
+    du langage et du style du code (plusieurs dizaines de pourcents).
+    """
+
+    exact = False  # Simple ordre de grandeur (voir LlmApiService._estimate_tokens)
+
+    def count(self, text: str) -> int:
+        """Nombre de tokens estimé d'un texte."""
+        return -(-len(text) // CHARS_PER_TOKEN)
+
+    def count_tokens(self, text: str) -> int:
+        """Comme count (l'estimation ne coûte qu'une longueur)."""
+        return self.count(text)
+
+    def count_parts(self, parts: Iterable[str]) -> int:
+        """Nombre de tokens estimé de la concaténation de plusieurs morceaux."""
+        return -(-sum(len(part) for part in parts) // CHARS_PER_TOKEN)
+
+
+class _CachedCounter:
+    """
+    Comptes mémorisés par empreinte du contenu (LRU), communs aux tokeniseurs
+    réels : d'une génération à l'autre, seuls les fichiers modifiés sont de
+    nouveau tokenisés. Les sous-classes fournissent count().
+    """
+
+    exact = True
+
+    def __init__(self, cache_size: int = 4096):
+        """
+        Args:
+            cache_size: Nombre de comptes mémorisés par empreinte de contenu (0 = désactivé)
+        """
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # empreinte du contenu -> nombre de tokens
+        self._cache_lock = threading.Lock()
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+    def count_tokens(self, text: str) -> int:
+        """Nombre de tokens d'un texte, mémorisé par empreinte de son contenu."""
+        if not self.cache_size or len(text) < 64:
+            return self.count(text)
+        key = hash_bytes(text.encode('utf-8', 'surrogatepass'))
+        with self._cache_lock:
+            tokens = self._cache.get(key)
+            if tokens is not None:
+                self._cache.move_to_end(key)
+                return tokens
+        tokens = self.count(text)
+        with self._cache_lock:
+            self._cache[key] = tokens
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_parts(self, parts: Iterable[str]) -> int:
+        """
+        Nombre de tokens de la concaténation de plusieurs morceaux, comptés un
+        à un (voir count_tokens) : un token à cheval sur deux morceaux est
+        compté deux fois, si bien que le compte majore légèrement celui du
+        texte assemblé (moins de 1 % sur du code découpé en lignes).
+        """
+        return sum(self.count_tokens(part) for part in parts)
+
+
+class TiktokenCounter(_CachedCounter):
+    """Comptage par la bibliothèque tiktoken (encodages exacts des modèles OpenAI)."""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING, cache_size: int = 4096):
+        """
+        Args:
+            encoding_name: Nom de l'encodage tiktoken (cl100k_base, o200k_base...)
+            cache_size: Nombre de comptes mémorisés par empreinte de contenu (0 = désactivé)
+        """
+        super().__init__(cache_size)
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        """Nombre de tokens d'un texte (sans mémorisation par empreinte)."""
+        return len(self.encoding.encode_ordinary(text))
+
+
+class BpeTokenizer(_CachedCounter):
+    """
+    Tokeniseur BPE au niveau des octets, compatible avec les fichiers de vocabulaire tiktoken.
+
+    Le texte est découpé en mots (PRETOKENIZE_PATTERN), puis chaque mot est
+    encodé en UTF-8 et ses octets sont fusionnés deux à deux, par rang
+    croissant, tant qu'une paire adjacente figure dans le vocabulaire. Les
+    mots d'un texte se répétant beaucoup (identifiants, indentation), seuls
+    les mots distincts sont fusionnés, et le nombre de tokens de chaque mot
+    est mémorisé.
+
+    Utilisé quand un fichier de vocabulaire est configuré ([Tokens] vocab_path),
+    sans dépendre de la bibliothèque tiktoken.
+    """
+
+    def __init__(self, ranks: Dict[bytes, int], cache_size: int = 4096):
+        """
+        Args:
+            ranks: Rang de fusion de chaque séquence d'octets (tous les octets isolés inclus)
+            cache_size: Nombre de comptes mémorisés par empreinte de contenu (0 = désactivé)
+        """
+        missing = [i for i in range(256) if bytes([i]) not in ranks]
+        if missing:
+            raise ValueError(f"Vocabulaire BPE incomplet : {len(missing)} octets isolés absents")
+        super().__init__(cache_size)
+        self.ranks = ranks
+        self.decoder = {rank: token for token, rank in ranks.items()}
+        self._no_merge = max(ranks.values()) + 1  # Plus grand que tout rang
+        self._piece_counts: Dict[str, int] = {}
+
+    @classmethod
+    def from_file(cls, path: str, cache_size: int = 4096) -> 'BpeTokenizer':
+        """Construit le tokeniseur depuis un fichier de vocabulaire tiktoken."""
+        return cls(load_tiktoken_ranks(path), cache_size)
+
+    def encode(self, text: str) -> List[int]:
+        """Encode un texte en rangs de tokens."""
+        tokens = []
+        for piece in PRETOKENIZE_PATTERN.findall(text):
+            data = piece.encode('utf-8', 'surrogatepass')
+            rank = self.ranks.get(data)
+            if rank is not None:
+                tokens.append(rank)
+            else:
+                tokens.extend(self.ranks[part] for part in self._merge(data))
+        return tokens
+
+    def decode(self, tokens: List[int]) -> str:
+        """Décode des rangs de tokens en texte."""
+        return b''.join(self.decoder[token] for token in tokens).decode('utf-8', 'replace')
+
+    def count(self, text: str) -> int:
+        """Nombre de tokens d'un texte (sans mémorisation par empreinte)."""
+        piece_counts = self._piece_counts
+        total = 0
+        for piece, occurrences in Counter(PRETOKENIZE_PATTERN.findall(text)).items():
+            tokens = piece_counts.get(piece)
+            if tokens is None:
+                tokens = self._count_piece(piece)
+            total += tokens * occurrences
+        return total
+
+    def _count_piece(self, piece: str) -> int:
+        data = piece.encode('utf-8', 'surrogatepass')
+        tokens = 1 if data in self.ranks else len(self._merge(data))
+        if len(self._piece_counts) >= _PIECE_CACHE_SIZE:
+            self._piece_counts.clear()
+        self._piece_counts[piece] = tokens
+        return tokens
+
+    def _merge(self, data: bytes) -> List[bytes]:
+        """Fusionne les octets d'un mot selon les rangs du vocabulaire ; retourne ses tokens."""
+        if len(data) >= _HEAP_MERGE_MIN_BYTES:
+            return self._merge_heap(data)
+        ranks = self.ranks
+        parts = [data[i:i + 1] for i in range(len(data))]
+        no_merge = self._no_merge
+        pair_ranks = [ranks.get(parts[i] + parts[i + 1], no_merge) for i in range(len(parts) - 1)]
+        while pair_ranks:
+            best = min(pair_ranks)
+            if best == no_merge:
+                break
+            i = pair_ranks.index(best)
+            parts[i:i + 2] = [parts[i] + parts[i + 1]]
+            del pair_ranks[i]
+            if i > 0:
+                pair_ranks[i - 1] = ranks.get(parts[i - 1] + parts[i], no_merge)
+            if i < len(pair_ranks):
+                pair_ranks[i] = ranks.get(parts[i] + parts[i + 1], no_merge)
+        return parts
+
+    def _merge_heap(self, data: bytes) -> List[bytes]:
+        """Comme _merge, en O(n log n) : liste chaînée des parties et tas des paires fusionnables."""
+        ranks = self.ranks
+        parts = [data[i:i + 1] for i in range(len(data))]
+        next_index = list(range(1, len(parts) + 1))
+        prev_index = list(range(-1, len(parts) - 1))
+        heap = []
+        for i in range(len(parts) - 1):
+            rank = ranks.get(parts[i] + parts[i + 1])
+            if rank is not None:
+                heap.append((rank, i, parts[i], parts[i + 1]))
+        heapq.heapify(heap)
+
+        while heap:
+            rank, i, left, right = heapq.heappop(heap)
+            j = next_index[i]
+            # Entrée périmée : la partie i ou sa voisine a été fusionnée depuis
+            if parts[i] is not left or j >= len(parts) or parts[j] is not right:
+                continue
+            parts[i] = left + right
+            parts[j] = None
+            next_index[i] = next_index[j]
+            if next_index[i] < len(parts):
+                prev_index[next_index[i]] = i
+                pair_rank = ranks.get(parts[i] + parts[next_index[i]])
+                if pair_rank is not None:
+                    heapq.heappush(heap, (pair_rank, i, parts[i], parts[next_index[i]]))
+            p = prev_index[i]
+            if p >= 0:
+                pair_rank = ranks.get(parts[p] + parts[i])
+                if pair_rank is not None:
+                    heapq.heappush(heap, (pair_rank, p, parts[p], parts[i]))
+        return [part for part in parts if part is not None]
+
+
+Tokenizer = Union[CharEstimator, TiktokenCounter, BpeTokenizer]
+
+_default_tokenizer: Optional[Tokenizer] = None
+_default_lock = threading.Lock()
+
+
+def configure_tokenizer(vocab_path: Optional[str] = None, cache_size: int = 4096,
+                        logger: Optional[logging.Logger] = None,
+                        encoding_name: str = DEFAULT_ENCODING) -> Tokenizer:
+    """
+    Charge le tokeniseur partagé (voir get_tokenizer).
+
+    Par ordre de préférence : le vocabulaire configuré (BpeTokenizer), la
+    bibliothèque tiktoken si elle est installée et que son encodage est
+    disponible (TiktokenCounter), et à défaut l'estimation à CHARS_PER_TOKEN
+    caractères par token (CharEstimator).
+
+    Args:
+        vocab_path: Fichier de vocabulaire tiktoken (optionnel)
+        cache_size: Nombre de comptes mémorisés par empreinte de contenu
+        logger: Logger optionnel
+        encoding_name: Encodage tiktoken utilisé sans vocabulaire configuré
+
+    Returns:
+        Le tokeniseur partagé
+    """
+    global _default_tokenizer
+    logger = logger or logging.getLogger(__name__)
+    tokenizer = None
+    if vocab_path:
+        try:
+            tokenizer = BpeTokenizer.from_file(vocab_path, cache_size)
+            logger.info(f"Tokeniseur BPE chargé ({len(tokenizer.ranks)} tokens)")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Vocabulaire BPE illisible ({vocab_path}: {e})")
+    if tokenizer is None and HAS_TIKTOKEN:
+        try:
+            tokenizer = TiktokenCounter(encoding_name or DEFAULT_ENCODING, cache_size)
+            logger.info(f"Tokeniseur tiktoken chargé ({tokenizer.encoding.name})")
+        except Exception as e:
+            # Encodage inconnu, ou absent du cache de tiktoken sans accès réseau
+            logger.warning(f"Encodage tiktoken indisponible ({encoding_name}: {e})")
+    if tokenizer is None:
+        logger.warning(f"Aucun tokeniseur disponible, estimation à {CHARS_PER_TOKEN} caractères par token")
+        tokenizer = CharEstimator()
+    with _default_lock:
+        _default_tokenizer = tokenizer
+    return tokenizer
+
+
+def get_tokenizer() -> Tokenizer:
+    """Retourne le tokeniseur partagé (tiktoken ou estimation s'il n'a pas été configuré)."""
+    with _default_lock:
+        tokenizer = _default_tokenizer
+    return tokenizer if tokenizer is not None else configure_tokenizer()
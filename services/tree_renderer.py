@@ -0,0 +1,143 @@
+"""Arbre des répertoires d'une sélection de fichiers, commun aux deux générateurs de contexte."""
+
+from typing import Iterable, List
+
+
+def _format_count(count: int) -> str:
+    """Nombre avec une espace comme séparateur de milliers (1 234)."""
+    return f"{count:,}".replace(",", " ")
+
+
+def _files_label(count: int, other: bool = False) -> str:
+    """« 1 fichier », « 2 fichiers » ; « 1 autre fichier », « 2 autres fichiers »."""
+    if count == 1:
+        return "1 autre fichier" if other else "1 fichier"
+    return f"{_format_count(count)} {'autres fichiers' if other else 'fichiers'}"
+
+
+def _normalize(path: str) -> str:
+    """Chemin sans séparateur en tête, en fin ou en double."""
+    if path.startswith('/') or path.endswith('/') or '//' in path:
+        return '/'.join(part for part in path.split('/') if part)
+    return path
+
+
+def render_tree(file_paths: Iterable[str], root_name: str,
+                max_depth: int = 0, max_files_per_dir: int = 0) -> List[str]:
+    """
+    Lignes de l'arbre des fichiers (connecteurs ├──, └── et │).
+
+    Les fichiers sont regroupés par répertoire, puis les répertoires triés
+    une seule fois de sorte que chacun précède ses sous-répertoires : l'arbre
+    est produit par un parcours linéaire de cette liste, sans arbre
+    intermédiaire ni récursion, chaque répertoire apparaissant une seule fois.
+    À chaque niveau, les répertoires précèdent les fichiers, dans l'ordre
+    alphabétique sans tenir compte de la casse (le nom exact départage les
+    homonymes).
+
+    Args:
+        file_paths: Chemins relatifs des fichiers, séparés par des '/'
+        root_name: Nom de la racine affiché en tête de l'arbre
+        max_depth: Nombre de niveaux affichés sous la racine (0 = illimité) ;
+            un répertoire non développé indique le nombre de fichiers qu'il contient
+        max_files_per_dir: Nombre maximal de fichiers affichés par répertoire
+            (0 = illimité) ; les suivants sont résumés par « … N autres fichiers »
+
+    Returns:
+        Lignes de l'arbre, la racine en premier
+    """
+    files_by_dir = {}
+    for path in file_paths:
+        path = _normalize(path)
+        if path:
+            directory, _, name = path.rpartition('/')
+            names = files_by_dir.get(directory)
+            if names is None:
+                files_by_dir[directory] = names = set()
+            names.add(name)
+
+    # Clé de tri d'un répertoire : la clé de son parent suivie de son nom, de
+    # sorte qu'un répertoire précède ses sous-répertoires (chaîne plutôt que
+    # tuple : comparaisons plus rapides). Calculée une fois par répertoire.
+    dir_keys = {'': ''}
+
+    def dir_key(directory: str) -> str:
+        key = dir_keys.get(directory)
+        if key is None:
+            parent, _, name = directory.rpartition('/')
+            key = f"{dir_key(parent)}\x01{name.lower()}\x00{name}\x00"
+            dir_keys[directory] = key
+        return key
+
+    # Nœuds dans l'ordre d'affichage : profondeur et nom ; fichiers masqués
+    # par max_depth, par indice du répertoire non développé
+    depths = []
+    names = []
+    hidden_below = {}
+    capped = -1  # Indice du répertoire ouvert à la profondeur maximale
+
+    def close_directory(directory: str, depth: int):
+        """Ajoute les fichiers d'un répertoire, après ses sous-répertoires."""
+        files = files_by_dir.get(directory)
+        if not files:
+            return
+        if max_depth and depth >= max_depth:
+            hidden_below[capped] = hidden_below.get(capped, 0) + len(files)
+            return
+        files = sorted(files, key=lambda name: (name.lower(), name))
+        if max_files_per_dir and len(files) > max_files_per_dir:
+            hidden = len(files) - max_files_per_dir
+            files = files[:max_files_per_dir]
+            files.append(f"… {_files_label(hidden, other=True)}")
+        depths.extend([depth] * len(files))
+        names.extend(files)
+
+    current = []  # Composants du répertoire ouvert le plus profond
+    for directory in sorted((d for d in files_by_dir if d), key=dir_key):
+        dirs = directory.split('/')
+        common = 0
+        for left, right in zip(current, dirs):
+            if left != right:
+                break
+            common += 1
+        for level in range(len(current), common, -1):
+            close_directory('/'.join(current[:level]), level)
+        for depth in range(common, len(dirs)):
+            if max_depth and depth >= max_depth:
+                break
+            if depth == max_depth - 1:
+                capped = len(names)
+            depths.append(depth)
+            names.append(f"{dirs[depth]}/")
+        current = dirs
+    for level in range(len(current), -1, -1):
+        close_directory('/'.join(current[:level]), level)
+
+    for index, hidden in hidden_below.items():
+        names[index] = f"{names[index]} (… {_files_label(hidden)})"
+
+    # Dernier enfant de son parent : aucun nœud de même profondeur avant le
+    # prochain nœud moins profond (parcours à rebours ; la profondeur augmente
+    # d'au plus un niveau d'un nœud au suivant)
+    is_last = [False] * len(depths)
+    next_depth = -1
+    has_next_sibling = [False] * (max(depths, default=0) + 1)
+    for index in range(len(depths) - 1, -1, -1):
+        depth = depths[index]
+        if depth < next_depth:
+            has_next_sibling[depth + 1] = False
+        is_last[index] = not has_next_sibling[depth]
+        has_next_sibling[depth] = True
+        next_depth = depth
+
+    lines = [f"{root_name}/"]
+    prefixes = [""] * (len(has_next_sibling) + 1)  # Préfixe des enfants de chaque profondeur
+    for depth, name, last in zip(depths, names, is_last):
+        prefix = prefixes[depth]
+        if last:
+            lines.append(f"{prefix}└── {name}")
+            prefixes[depth + 1] = prefix + "    "
+        else:
+            lines.append(f"{prefix}├── {name}")
+            prefixes[depth + 1] = prefix + "│   "
+    return lines
@@ -69,6 +69,8 @@ document.addEventListener('DOMContentLoaded', () => {
     const summarizerOptionsDiv = document.getElementById('summarizer-options');
     const summarizerModelSelect = document.getElementById('summarizerModelSelect');
     const summarizerWorkersSelect = document.getElementById('summarizerWorkersSelect');
+    const budgetOptionsDiv = document.getElementById('budget-options');
+    const budgetModelSelect = document.getElementById('budgetModelSelect');
 // NOUVEAU: Gestionnaire d'événements pour les options de compression
     if (compressionMenu) {
         compressionMenu.addEventListener('click', (event) => {
@@ -96,6 +98,12 @@ document.addEventListener('DOMContentLoaded', () => {
                 } else {
                     summarizerOptionsDiv?.classList.add('d-none');
                 }
+                // Le budget de tokens est celui du modèle choisi
+                if (selectedValue === 'budget') {
+                    budgetOptionsDiv?.classList.remove('d-none');
+                } else {
+                    budgetOptionsDiv?.classList.add('d-none');
+                }
             }
         });
     }
@@ -305,6 +313,156 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // --- Mode Desktop : Scan progressif ---
+    // Les fichiers arrivent par lots via window.onScanEvent ; au plus toutes
+    // les SCAN_RENDER_INTERVAL ms, seuls les fichiers reçus depuis le rendu
+    // précédent sont insérés dans l'arbre affiché pendant le scan.
+    const cancelScanBtn = document.getElementById('cancelScanBtn');
+    const SCAN_RENDER_INTERVAL = 400;
+    let activeScan = null;
+
+    function formatScanCounts(counts) {
+        const phase = counts.phase === 'binary_filter' ? 'Analyse des fichiers' : 'Parcours';
+        return `${phase}… ${counts.accepted} fichiers retenus • ${counts.discovered} découverts • ${counts.directories} répertoires`;
+    }
+
+    function renderScanProgress() {
+        if (!activeScan) return;
+        activeScan.renderTimer = null;
+        if (!activeScan.tree) {
+            fileListDiv.innerHTML = '';
+            activeScan.status = document.createElement('p');
+            activeScan.status.className = 'text-muted text-center placeholder-message';
+            activeScan.tree = document.createElement('ul');
+            activeScan.folders = new Map([['', activeScan.tree]]);
+            fileListDiv.append(activeScan.status, activeScan.tree);
+        }
+        appendToScanTree(activeScan, activeScan.pending);
+        activeScan.pending = [];
+        activeScan.status.textContent = formatScanCounts(activeScan.counts);
+    }
+
+    // Insère les fichiers d'un lot dans l'arbre du scan, en créant les dossiers manquants
+    function appendToScanTree(scan, files) {
+        files.forEach(file => {
+            const parts = file.path.split('/').filter(part => part);
+            if (parts.length === 0) return;
+            let ul = scan.tree;
+            let folderPath = '';
+            for (const part of parts.slice(0, -1)) {
+                folderPath = folderPath ? `${folderPath}/${part}` : part;
+                let childUl = scan.folders.get(folderPath);
+                if (!childUl) {
+                    const li = createTreeItem(part, folderPath, true);
+                    childUl = document.createElement('ul');
+                    li.appendChild(childUl);
+                    insertTreeItem(ul, li);
+                    scan.folders.set(folderPath, childUl);
+                }
+                ul = childUl;
+            }
+            insertTreeItem(ul, createTreeItem(parts[parts.length - 1], file.path, false));
+        });
+    }
+
+    // Insère un élément à sa place dans l'ordre des noms (même ordre que createTreeElement)
+    function insertTreeItem(ul, li) {
+        const items = ul.children;
+        let low = 0;
+        let high = items.length;
+        while (low < high) {
+            const middle = (low + high) >> 1;
+            if (items[middle].dataset.name < li.dataset.name) {
+                low = middle + 1;
+            } else {
+                high = middle;
+            }
+        }
+        ul.insertBefore(li, items[low] || null);
+    }
+
+    window.onScanEvent = function(event, jobId, payload) {
+        if (!activeScan || activeScan.jobId !== jobId) return;
+        if (event === 'files') {
+            activeScan.files.push(...payload);
+            activeScan.pending.push(...payload);
+        } else if (event === 'progress') {
+            activeScan.counts = payload;
+        } else {
+            const scan = activeScan;
+            activeScan = null;
+            if (scan.renderTimer) clearTimeout(scan.renderTimer);
+            if (event === 'complete') {
+                payload.files = scan.files;
+                scan.resolve(payload);
+            } else if (event === 'cancelled') {
+                scan.resolve({ success: false, cancelled: true, files: scan.files, counts: payload });
+            } else {
+                scan.resolve({ success: false, error: payload.error });
+            }
+            return;
+        }
+        if (!activeScan.renderTimer) {
+            activeScan.renderTimer = setTimeout(renderScanProgress, SCAN_RENDER_INTERVAL);
+        }
+    };
+
+    async function runProgressiveScan(directory) {
+        const started = await pywebview.api.start_scan(directory);
+        if (!started.success) return started;
+        return new Promise(resolve => {
+            activeScan = {
+                jobId: started.job_id,
+                files: [],
+                pending: [],  // Fichiers reçus, pas encore insérés dans l'arbre
+                tree: null,
+                counts: { phase: 'walk', accepted: 0, discovered: 0, directories: 0 },
+                renderTimer: null,
+                resolve
+            };
+        });
+    }
+
+    if (cancelScanBtn) {
+        cancelScanBtn.addEventListener('click', async () => {
+            if (activeScan) {
+                cancelScanBtn.disabled = true;
+                await pywebview.api.cancel_scan(activeScan.jobId);
+            }
+        });
+    }
+
+    // --- Mode Desktop : Surveillance du projet ---
+    // Les fichiers ajoutés, modifiés ou supprimés après le scan arrivent via
+    // window.onFileChanges ; l'arbre est redessiné en conservant la sélection.
+    window.onFileChanges = function(delta) {
+        if (activeScan || !isDesktopMode || currentFilesData.length === 0) return;
+
+        const unchecked = new Set(
+            Array.from(fileListDiv.querySelectorAll('li.file > .form-check > .form-check-input'))
+                .filter(cb => !cb.checked)
+                .map(cb => cb.value)
+        );
+        const removed = new Set(delta.removed);
+        const modified = new Map(delta.modified.map(f => [f.path, f]));
+        currentFilesData = currentFilesData
+            .filter(f => !removed.has(f.path))
+            .map(f => modified.get(f.path) || f)
+            .concat(delta.added);
+        currentFiles = currentFilesData.map(f => f.path);
+        includedFilePaths = currentFiles;
+
+        renderFileList(currentFilesData);
+        // Les nouveaux fichiers sont cochés, comme après un scan
+        fileListDiv.querySelectorAll('li.file > .form-check > .form-check-input').forEach(cb => {
+            if (unchecked.has(cb.value)) {
+                cb.checked = false;
+                updateParentCheckboxes(cb);
+            }
+        });
+        console.log(`Projet modifié : ${delta.added.length} ajoutés, ${delta.modified.length} modifiés, ${delta.removed.length} retirés`);
+    };
+
     // --- Mode Desktop : Scanner le répertoire ---
     if (scanDirectoryBtn) {
         scanDirectoryBtn.addEventListener('click', async () => {
@@ -329,10 +487,22 @@ document.addEventListener('DOMContentLoaded', () => {
             currentFilesData = [];
             includedFilePaths = [];
             
+            const progressive = typeof pywebview.api.start_scan === 'function';
+            if (progressive && cancelScanBtn) {
+                cancelScanBtn.disabled = false;
+                showElement(cancelScanBtn);
+            }
+            
             try {
-                const result = await pywebview.api.scan_local_directory(currentSelectedDirectory);
+                const result = progressive
+                    ? await runProgressiveScan(currentSelectedDirectory)
+                    : await pywebview.api.scan_local_directory(currentSelectedDirectory);
                 
-                if (result.success) {
+                if (result.cancelled) {
+                    console.log("Scan annulé:", result.counts);
+                    fileListDiv.innerHTML = '<p class="text-muted text-center placeholder-message">Scan annulé.</p>';
+                    showElement(fileSelectionSection);
+                } else if (result.success) {
                     console.log("Scan terminé:", result);
                     console.log("Sélection sauvegardée reçue:", result.saved_selection);
                     console.log("Nombre de fichiers sauvegardés:", result.saved_selection_count);
@@ -461,6 +631,25 @@ document.addEventListener('DOMContentLoaded', () => {
                     `;
                     fileListDiv.appendChild(noteDiv);
                     
+                    // Scan interrompu par une limite : résultats partiels
+                    if (result.truncated) {
+                        const limits = result.truncation.limits;
+                        const reasonLabels = {
+                            max_files: `limite de ${limits.max_files} fichiers atteinte`,
+                            max_seconds: `durée maximale de ${limits.max_seconds} s atteinte`,
+                            max_depth: `profondeur limitée à ${limits.max_depth} niveaux`
+                        };
+                        const truncatedDiv = document.createElement('div');
+                        truncatedDiv.className = 'alert alert-warning mt-2';
+                        truncatedDiv.innerHTML = `
+                            <i class="fas fa-exclamation-triangle me-2"></i>
+                            <strong>Scan partiel</strong> :
+                            ${result.truncation.reasons.map(r => reasonLabels[r] || r).join(', ')}.
+                            Sélectionnez un sous-répertoire ou ajustez les limites [FileService] de config.ini.
+                        `;
+                        fileListDiv.appendChild(truncatedDiv);
+                    }
+                    
                     generationSection.scrollIntoView({ behavior: 'smooth' });
                     
                 } else {
@@ -478,6 +667,7 @@ document.addEventListener('DOMContentLoaded', () => {
             } finally {
                 hideSpinner(analyzeSpinner);
                 scanDirectoryBtn.disabled = false;
+                if (cancelScanBtn) hideElement(cancelScanBtn);
             }
         });
     }
@@ -683,40 +873,46 @@ document.addEventListener('DOMContentLoaded', () => {
         keys.forEach(key => {
             // Calculate the full path for the current node
             const fullPath = basePath ? `${basePath}/${key}` : key;
-            const li = document.createElement('li');
-            const div = document.createElement('div');
-            div.classList.add('form-check');
-
-            const input = document.createElement('input');
-            input.type = 'checkbox';
-            input.classList.add('form-check-input');
-            // Using the full path as the value (e.g., "static/script.js")
-            input.value = fullPath;
-            // Select by default only files that are in the included file paths list
-            // For folders, always select by default
-            input.checked = true;
-
-            const label = document.createElement('label');
-            label.classList.add('form-check-label');
-            label.textContent = key;
-
-            div.appendChild(input);
-            div.appendChild(label);
-            li.appendChild(div);
-
             if (node[key] && typeof node[key] === 'object' && node[key]._children && Object.keys(node[key]._children).length > 0) {
-                li.classList.add('folder');
+                const li = createTreeItem(key, fullPath, true);
                 // Recursive call passing the fullPath to accumulate the full path
                 const childrenUl = createTreeElement(node[key]._children, fullPath);
                 li.appendChild(childrenUl);
+                ul.appendChild(li);
             } else {
-                li.classList.add('file');
+                ul.appendChild(createTreeItem(key, fullPath, false));
             }
-            ul.appendChild(li);
         });
         return ul;
     }
 
+    // --- Create one tree item (folder or file), selected by default ---
+    function createTreeItem(name, fullPath, isFolder) {
+        const li = document.createElement('li');
+        li.classList.add(isFolder ? 'folder' : 'file');
+        li.dataset.name = name;
+        const div = document.createElement('div');
+        div.classList.add('form-check');
+
+        const input = document.createElement('input');
+        input.type = 'checkbox';
+        input.classList.add('form-check-input');
+        // Using the full path as the value (e.g., "static/script.js")
+        input.value = fullPath;
+        // Select by default only files that are in the included file paths list
+        // For folders, always select by default
+        input.checked = true;
+
+        const label = document.createElement('label');
+        label.classList.add('form-check-label');
+        label.textContent = name;
+
+        div.appendChild(input);
+        div.appendChild(label);
+        li.appendChild(div);
+        return li;
+    }
+
     // --- Handling selection via checkboxes ---
     fileListDiv.addEventListener('change', (event) => {
         if (event.target.matches('.form-check-input')) {
@@ -924,6 +1120,13 @@ document.addEventListener('DOMContentLoaded', () => {
             "Total characters included": summary.total_chars,
             "Estimated tokens (approximate)": summary.estimated_tokens
         };
+        if (summary.packing) {
+            // Contexte ajusté au budget de tokens du modèle
+            const counts = summary.packing.counts;
+            items["Token budget"] = summary.packing.token_budget;
+            items["Files in full / compacted / signatures only"] = `${counts.full} / ${counts.compact} / ${counts.outline}`;
+            items["Files omitted (budget)"] = counts.omitted;
+        }
 
         for (const [key, value] of Object.entries(items)) {
             if (value !== undefined && value !== null) {
@@ -1102,7 +1305,11 @@ document.addEventListener('DOMContentLoaded', () => {
             showSpinner(generateSpinner);
             
             try {
-                const result = await pywebview.api.generate_context_from_selection(selectedFiles, instructions);
+                // Compression "budget" : fichiers complets, compactés, réduits à leurs signatures ou omis
+                const packingOptions = selectedCompression === 'budget'
+                    ? { enabled: true, llm_id: budgetModelSelect ? budgetModelSelect.value : null }
+                    : null;
+                const result = await pywebview.api.generate_context_from_selection(selectedFiles, instructions, maskingOptions, packingOptions);
                 
                 if (result.success) {
                     // Afficher le contexte dans la zone de texte
@@ -1157,7 +1364,8 @@ document.addEventListener('DOMContentLoaded', () => {
                             instructions: instructions,
                             compression_mode: selectedCompression,
                             summarizer_model: summarizerModelSelect ? summarizerModelSelect.value : null,
-                            summarizer_max_workers: summarizerWorkersSelect ? summarizerWorkersSelect.value : null
+                            summarizer_max_workers: summarizerWorkersSelect ? summarizerWorkersSelect.value : null,
+                            llm_id: budgetModelSelect ? budgetModelSelect.value : null
                         })
                     });
 
@@ -1230,7 +1438,8 @@ document.addEventListener('DOMContentLoaded', () => {
                             instructions: instructions,
                             compression_mode: selectedCompression,
                             summarizer_model: summarizerModelSelect ? summarizerModelSelect.value : null,
-                            summarizer_max_workers: summarizerWorkersSelect ? summarizerWorkersSelect.value : null
+                            summarizer_max_workers: summarizerWorkersSelect ? summarizerWorkersSelect.value : null,
+                            llm_id: budgetModelSelect ? budgetModelSelect.value : null
                         })
                     });
                     const data = await response.json();
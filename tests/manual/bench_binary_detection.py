@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark : détection des fichiers binaires, ancienne boucle contre BinaryClassifier.
+
+Crée un corpus mixte (images PNG, JavaScript minifié, code source avec et
+sans caractères accentués) dans un répertoire temporaire, puis compare :
+- la boucle d'origine (un open + NUL + décodage UTF-8 par fichier, en série) ;
+- le classement seul (échantillons en mémoire) ;
+- BinaryClassifier, lectures séquentielles puis parallèles.
+
+Usage : python tests/manual/bench_binary_detection.py [nb_fichiers]
+"""
+
+import sys
+import os
+import time
+import random
+import tempfile
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.binary_detection import BinaryClassifier, read_sample
+
+
+def png_bytes(rng: random.Random) -> bytes:
+    return b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR' + rng.randbytes(12000)
+
+
+def minified_js(rng: random.Random) -> bytes:
+    names = ['a', 'b', 'c', 'e', 'n', 't', 'r']
+    parts = [f"function {rng.choice(names)}{i}(n,t){{return n+t*{i}}};" for i in range(400)]
+    return ''.join(parts).encode('utf-8')
+
+
+def source_code(rng: random.Random, accents: bool) -> bytes:
+    comment = "# Vérifie l'entrée de l'utilisateur" if accents else "# Check user input"
+    lines = [f"{comment}\ndef handler_{i}(value):\n    return value * {rng.randint(1, 99)}\n" for i in range(150)]
+    return ''.join(lines).encode('utf-8')
+
+
+def build_corpus(directory: str, count: int):
+    rng = random.Random(42)
+    makers = [
+        ('png', png_bytes),
+        ('js', minified_js),
+        ('py', lambda r: source_code(r, False)),
+        ('txt', lambda r: source_code(r, True)),
+    ]
+    paths = []
+    for i in range(count):
+        ext, maker = makers[i % len(makers)]
+        path = os.path.join(directory, f'file_{i}.{ext}')
+        with open(path, 'wb') as f:
+            f.write(maker(rng))
+        paths.append(path)
+    return paths
+
+
+def original_loop(paths):
+    """Boucle de FileService._filter_binary_files avant BinaryClassifier."""
+    verdicts = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            sample = f.read(min(os.path.getsize(path), 8192))
+        if b'\x00' in sample:
+            verdicts.append(True)
+            continue
+        try:
+            sample.decode('utf-8')
+            verdicts.append(False)
+        except UnicodeDecodeError:
+            verdicts.append(True)
+    return verdicts
+
+
+def measure(label: str, classify, paths, reference=None):
+    start = time.perf_counter()
+    verdicts = classify(paths)
+    duration = time.perf_counter() - start
+    same = '' if reference is None else ('  (verdicts identiques)' if verdicts == reference else '  (VERDICTS DIFFÉRENTS)')
+    print(f"{label:32s} {duration:7.3f} s  {len(paths) / duration:9.0f} fichiers/s{same}")
+    return verdicts
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as directory:
+        paths = build_corpus(directory, count)
+        print("=" * 70)
+        print(f"Détection binaire : {count} fichiers (PNG, JS minifié, Python, texte accentué)")
+        print("=" * 70)
+
+        reference = measure("Boucle d'origine", original_loop, paths)
+        # Le classement seul, échantillons déjà en mémoire
+        samples = [read_sample(p) for p in paths]
+        measure("Classement seul", lambda _: BinaryClassifier().classify(samples), paths, reference)
+        measure("Classifieur (1 thread)", BinaryClassifier(1).classify_files, paths, reference)
+        measure("Classifieur (8 threads)", BinaryClassifier(8).classify_files, paths, reference)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark : pic de mémoire (RSS) de la construction du contexte, chaîne contre flux.
+
+Crée une sélection de fichiers source dans un répertoire temporaire (200 Mo
+par défaut), puis mesure dans un processus séparé par variante le pic de
+mémoire résidente (ru_maxrss) :
+- build_context : contenus lus en mémoire, contexte assemblé en une chaîne ;
+- write_context : mêmes contenus en mémoire, contexte écrit dans un fichier ;
+- write_context (lecture à la demande) : chaque fichier est lu au moment
+  d'être écrit, un seul contenu est en mémoire à la fois.
+
+Unix uniquement (module resource).
+
+Usage : python tests/manual/bench_context_writer.py [taille_mo]
+"""
+
+import sys
+import os
+import time
+import resource
+import tempfile
+import subprocess
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.context_builder_service import ContextBuilderService
+
+FILE_SIZE = 512 * 1024
+VARIANTS = ('build_context', 'write_context', 'write_context_lazy')
+LABELS = {
+    'build_context': "build_context (chaîne)",
+    'write_context': "write_context (fichier)",
+    'write_context_lazy': "write_context (lecture à la demande)",
+}
+
+
+def build_selection(directory: str, size_mb: int):
+    line = "    total = compute_total(items, tax_rate=0.2)  # ligne de code\n"
+    content = line * (FILE_SIZE // len(line))
+    for i in range(size_mb * 1024 * 1024 // FILE_SIZE):
+        sub = os.path.join(directory, f"pkg_{i % 20}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"module_{i}.py"), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def read_file(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def run_variant(variant: str, directory: str):
+    """Exécuté dans un processus séparé : construit le contexte et affiche le pic RSS."""
+    paths = sorted(os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+                   for root, _, names in os.walk(directory) for name in names)
+    builder = ContextBuilderService({})
+    start = time.perf_counter()
+    if variant == 'write_context_lazy':
+        file_contents = [{'path': p, 'size': os.path.getsize(os.path.join(directory, p)),
+                          'content': lambda p=p: read_file(os.path.join(directory, p))} for p in paths]
+    else:
+        file_contents = []
+        for p in paths:
+            content = read_file(os.path.join(directory, p))
+            file_contents.append({'path': p, 'content': content, 'size': len(content)})
+
+    if variant == 'build_context':
+        chars = len(builder.build_context('bench', directory, file_contents)['context'])
+    else:
+        with tempfile.TemporaryFile('w', encoding='utf-8') as sink:
+            chars = builder.write_context(sink, 'bench', directory, file_contents)['stats']['context_chars']
+    duration = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Ko sous Linux
+    print(f"{peak_kb} {duration} {chars}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--variant':
+        run_variant(sys.argv[2], sys.argv[3])
+        return
+
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as directory:
+        build_selection(directory, size_mb)
+        print("=" * 70)
+        print(f"Construction du contexte : sélection de {size_mb} Mo")
+        print("=" * 70)
+        for variant in VARIANTS:
+            output = subprocess.run([sys.executable, __file__, '--variant', variant, directory],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            peak_kb, duration, chars = int(output[0]), float(output[1]), int(output[2])
+            print(f"{LABELS[variant]:38s} pic RSS {peak_kb / 1024:8.1f} Mo  {duration:6.2f} s  "
+                  f"({chars / 1024 / 1024:.0f} Mo de contexte)")
+
+
+if __name__ == "__main__":
+    main()
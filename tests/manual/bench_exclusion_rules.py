@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark : exclusion par motifs, boucle fnmatch contre ExclusionRules.
+
+Génère des centaines de motifs réalistes (suffixes, noms exacts, motifs à
+jokers) et des noms de fichiers, puis compare la boucle d'origine
+(fnmatch.fnmatch par fichier et par motif) au moteur compilé, en vérifiant
+que le premier motif trouvé est identique.
+
+Usage : python tests/manual/bench_exclusion_rules.py [nb_motifs] [nb_fichiers]
+"""
+
+import sys
+import os
+import time
+import fnmatch
+import random
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.exclusion_rules import ExclusionRules
+
+EXTENSIONS = ['py', 'js', 'ts', 'json', 'css', 'md', 'map', 'lock', 'txt', 'html', 'yml', 'go']
+
+
+def build_patterns(count: int, rng: random.Random):
+    patterns = ['*.min.js', '*.min.css', '*-lock.json', '*.map', 'yarn.lock']
+    while len(patterns) < count:
+        kind = rng.random()
+        word = f"gen{len(patterns)}"
+        ext = rng.choice(EXTENSIONS)
+        if kind < 0.5:
+            patterns.append(f"*.{word}.{ext}")
+        elif kind < 0.8:
+            patterns.append(f"{word}.{ext}")
+        else:
+            patterns.append(f"{word}-*.{ext}")
+    return patterns
+
+
+def build_names(count: int, patterns, rng: random.Random):
+    names = [f"module_{i}.{rng.choice(EXTENSIONS)}" for i in range(count)]
+    # Environ 5 % de fichiers exclus
+    for i in range(0, count, 20):
+        pattern = rng.choice(patterns)
+        names[i] = pattern.replace('*', f'x{i}')
+    return names
+
+
+def original_loop(names, patterns):
+    return [next((p for p in patterns if fnmatch.fnmatch(name, p)), None) for name in names]
+
+
+def main():
+    pattern_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    file_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    rng = random.Random(42)
+    patterns = build_patterns(pattern_count, rng)
+    names = build_names(file_count, patterns, rng)
+
+    print("=" * 60)
+    print(f"Exclusion : {len(patterns)} motifs, {len(names)} fichiers")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    expected = original_loop(names, patterns)
+    loop_duration = time.perf_counter() - start
+    print(f"Boucle fnmatch      {loop_duration:8.3f} s")
+
+    start = time.perf_counter()
+    rules = ExclusionRules(pattern_blacklist=patterns)
+    compile_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    found = [rules.match_pattern(name) for name in names]
+    match_duration = time.perf_counter() - start
+    print(f"Moteur compilé      {match_duration:8.3f} s  (compilation {compile_duration:.3f} s)")
+    print(f"Accélération        {loop_duration / match_duration:8.1f}x")
+    print(f"Fichiers exclus     {sum(p is not None for p in found)}  "
+          f"({'résultats identiques' if found == expected else 'RÉSULTATS DIFFÉRENTS'})")
+
+
+if __name__ == "__main__":
+    main()
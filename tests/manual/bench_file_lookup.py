@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark : recherche des fichiers sélectionnés dans file_cache.
+
+Compare le parcours linéaire historique (next(...) sur file_cache) à l'index
+relative_path -> enregistrement de FileService, pour une grande sélection
+parmi un grand nombre de fichiers scannés. Les lectures disque sont exclues :
+seule la recherche est mesurée.
+
+Usage : python tests/manual/bench_file_lookup.py [nb_fichiers_scannés] [nb_sélectionnés]
+"""
+
+import sys
+import os
+import time
+import random
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.file_service import FileService
+
+
+def build_file_cache(count: int):
+    """Enregistrements synthétiques au format de scan_local_directory."""
+    return [
+        {
+            'absolute_path': f'/project/pkg{i % 500}/module{i}.py',
+            'relative_path': f'pkg{i % 500}/module{i}.py',
+            'name': f'module{i}.py',
+            'size': 1000
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    scanned = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    selected_count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+
+    file_cache = build_file_cache(scanned)
+    selected = [f['relative_path'] for f in random.Random(42).sample(file_cache, selected_count)]
+
+    print("=" * 60)
+    print(f"{selected_count} fichiers sélectionnés parmi {scanned} scannés")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    linear = [next((f for f in file_cache if f['relative_path'] == p), None) for p in selected]
+    linear_duration = time.perf_counter() - start
+    print(f"{'Parcours linéaire':30s} {linear_duration:8.3f} s")
+
+    service = FileService({})
+    start = time.perf_counter()
+    index = service._get_file_index(file_cache)
+    build_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    indexed = [service._get_file_index(file_cache).get(p) for p in selected]
+    lookup_duration = time.perf_counter() - start
+    label = "Construction de l'index"
+    print(f"{label:30s} {build_duration:8.3f} s  ({len(index)} entrées)")
+    print(f"{'Recherches indexées':30s} {lookup_duration:8.3f} s")
+
+    assert indexed == linear
+    print(f"Accélération : x{linear_duration / max(build_duration + lookup_duration, 1e-9):.0f}")
+
+
+if __name__ == "__main__":
+    main()
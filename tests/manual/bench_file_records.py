@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark : mémoire du cache de scan, dictionnaires contre FileRecord.
+
+Construit le même ensemble de fichiers synthétiques sous les deux formes et
+mesure la mémoire allouée avec tracemalloc, ainsi que le coût des accès
+utilisés par les appelants (relative_path, size, absolute_path).
+
+Usage : python tests/manual/bench_file_records.py [nb_fichiers]
+"""
+
+import sys
+import os
+import time
+import tracemalloc
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.file_records import FileRecord
+
+ROOT = os.path.join(os.sep, 'home', 'user', 'projects', 'monorepo')
+
+
+def layout(count: int):
+    """(répertoire, nom) répartis sur 2 000 répertoires de profondeur 3."""
+    directories = [f'packages/pkg{i % 100}/src/module{i}' for i in range(2000)]
+    return [(directories[i % len(directories)], f'file_{i}.ts') for i in range(count)]
+
+
+def build_dicts(entries):
+    files = []
+    for directory, name in entries:
+        rel_path = f'{directory}/{name}'
+        files.append({
+            'absolute_path': os.path.join(ROOT, rel_path.replace('/', os.sep)),
+            'relative_path': rel_path,
+            'name': name,
+            'size': 4096,
+            'mtime': 1700000000.5,
+            'inode': 123456789
+        })
+    return files
+
+
+def build_records(entries):
+    # Comme dans le parcours : une seule chaîne par répertoire
+    shared = {}
+    return [
+        FileRecord(ROOT, shared.setdefault(directory, directory), name, 4096, 1700000000.5, 123456789)
+        for directory, name in entries
+    ]
+
+
+def measure(label: str, builder, entries):
+    tracemalloc.start()
+    start = time.perf_counter()
+    files = builder(entries)
+    build_duration = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for f in files:
+        f['relative_path'], f['size'], f['absolute_path']
+    access_duration = time.perf_counter() - start
+    print(f"{label:15s} {current / 1024 / 1024:8.1f} Mo  "
+          f"construction {build_duration:6.3f} s  accès {access_duration:6.3f} s")
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    entries = layout(count)
+
+    print("=" * 60)
+    print(f"Cache de scan : {count} fichiers")
+    print("=" * 60)
+    dict_bytes = measure("Dictionnaires", build_dicts, entries)
+    record_bytes = measure("FileRecord", build_records, entries)
+    saved = dict_bytes - record_bytes
+    print(f"Mémoire économisée : {saved / 1024 / 1024:.1f} Mo ({saved / dict_bytes:.0%})")
+
+
+if __name__ == "__main__":
+    main()
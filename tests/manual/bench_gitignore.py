@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark : règles .gitignore hiérarchiques contre le PathSpec unique (racine seule).
+
+Génère un monorepo synthétique dont chaque sous-paquet possède son propre
+.gitignore excluant ses artefacts de build, puis compare :
+  1. le scan avec le seul .gitignore racine (artefacts parcourus et conservés) ;
+  2. le scan avec les règles hiérarchiques (artefacts élagués pendant le parcours) ;
+  3. le débit brut de match_file sur les mêmes chemins.
+
+Usage : python tests/manual/bench_gitignore.py [nb_paquets] [fichiers_par_build]
+"""
+
+import sys
+import os
+import time
+import shutil
+import tempfile
+import warnings
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+
+from services.file_service import FileService
+from services.ignore_rules import HierarchicalIgnoreMatcher, IgnoreRulesCache
+
+
+def build_monorepo(root: str, packages: int, build_files: int):
+    """Crée packages/pkgN/{src,build,dist} avec un .gitignore par paquet."""
+    with open(os.path.join(root, '.gitignore'), 'w') as f:
+        f.write('*.log\n.env\n')
+    for i in range(packages):
+        pkg = os.path.join(root, 'packages', f'pkg{i}')
+        for sub in ('src', 'build', 'dist'):
+            os.makedirs(os.path.join(pkg, sub))
+        with open(os.path.join(pkg, '.gitignore'), 'w') as f:
+            f.write('/build/\n/dist/\n*.gen.ts\n')
+        for j in range(20):
+            with open(os.path.join(pkg, 'src', f'module{j}.ts'), 'w') as f:
+                f.write(f'export const value{j} = {j};\n')
+        for j in range(build_files):
+            for sub in ('build', 'dist'):
+                with open(os.path.join(pkg, sub, f'chunk{j}.js'), 'w') as f:
+                    f.write('var a=1;' * 20)
+
+
+def timed_scan(config: dict, root: str):
+    service = FileService(config)
+    start = time.perf_counter()
+    result = service.scan_local_directory(root)
+    return time.perf_counter() - start, result['response_for_frontend']['count']
+
+
+def main():
+    packages = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    build_files = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    root = tempfile.mkdtemp(prefix='bench_gitignore_')
+    try:
+        print("=" * 60)
+        print(f"Monorepo synthétique : {packages} paquets, {build_files} fichiers par build/ et dist/")
+        print("=" * 60)
+        build_monorepo(root, packages, build_files)
+
+        for label, config in (
+            ("PathSpec unique (.gitignore racine)", {'hierarchical_gitignore': False}),
+            ("Règles hiérarchiques", {'hierarchical_gitignore': True, 'global_excludes_file': os.devnull}),
+        ):
+            duration, count = timed_scan(config, root)
+            print(f"{label:40s} {duration:8.3f} s  {count:7d} fichiers retenus")
+
+        # Débit de match_file sur les chemins du projet (sans accès disque)
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+            for name in filenames:
+                paths.append(name if rel_dir == '.' else f"{rel_dir}/{name}")
+
+        legacy_spec = FileService({'hierarchical_gitignore': False})._load_root_gitignore_spec(root)
+        matcher = HierarchicalIgnoreMatcher(root, IgnoreRulesCache(), global_excludes_file=os.devnull)
+        for label, spec in (("PathSpec.match_file", legacy_spec), ("HierarchicalIgnoreMatcher", matcher)):
+            start = time.perf_counter()
+            ignored = sum(1 for p in paths if spec.match_file(p))
+            duration = time.perf_counter() - start
+            print(f"{label:40s} {len(paths) / duration:10.0f} chemins/s  ({ignored} exclus)")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
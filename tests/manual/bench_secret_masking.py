@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark : masquage des secrets d'une sélection, en série contre MaskingExecutor.
+
+Génère une sélection de fichiers source (quelques-uns contenant des secrets),
+puis compare le masquage fichier par fichier du FileService au masquage
+réparti sur un ProcessPoolExecutor (un processus par cœur par défaut),
+puis mesure une régénération où seuls 1 % des fichiers ont changé (les
+autres résultats viennent du cache). Le gain du parallélisme dépend du
+nombre de cœurs disponibles.
+
+Usage : python tests/manual/bench_secret_masking.py [nb_fichiers] [nb_processus]
+"""
+
+import sys
+import os
+import time
+import random
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.file_service import FileService
+from services.secret_masking import MaskingExecutor
+
+
+def source_file(rng: random.Random, index: int) -> str:
+    lines = []
+    for i in range(rng.randint(100, 400)):
+        lines.append(f"    result_{i} = compute(value, {rng.randint(1, 999)})  # étape {i}")
+    if index % 10 == 0:
+        lines.append(f'    api_key = "{rng.randbytes(16).hex()}"')
+    return f"def handler_{index}(value):\n" + "\n".join(lines)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(42)
+    files = [(f"src/module_{i}.py", source_file(rng, i)) for i in range(count)]
+    size_mb = sum(len(content) for _, content in files) / 1e6
+
+    print("=" * 70)
+    print(f"Masquage des secrets : {count} fichiers ({size_mb:.1f} Mo), {os.cpu_count()} cœurs")
+    print("=" * 70)
+
+    # Caches de masquage désactivés : chaque passe analyse réellement le contenu
+    config = {'global_excludes_file': os.devnull, 'secrets_cache_mb': 0}
+    start = time.perf_counter()
+    serial = MaskingExecutor(FileService(config), workers=1).mask_all(files)
+    duration = time.perf_counter() - start
+    print(f"{'En série':32s} {duration:7.3f} s  {count / duration:9.0f} fichiers/s")
+
+    executor = MaskingExecutor(FileService(config), workers=workers, min_parallel_files=0)
+    try:
+        for label in ("Processus (démarrage compris)", "Processus (pool démarré)"):
+            start = time.perf_counter()
+            parallel = executor.mask_all(files)
+            duration = time.perf_counter() - start
+            same = '  (résultats identiques)' if parallel == serial else '  (RÉSULTATS DIFFÉRENTS)'
+            print(f"{label:32s} {duration:7.3f} s  {count / duration:9.0f} fichiers/s{same}")
+
+        executor.file_service._masking_cache.max_chars = 1024 * 1024 * 1024
+        executor.mask_all(files)
+        changed = list(files)
+        for i in range(0, count, 100):
+            changed[i] = (changed[i][0], changed[i][1] + "\n# modifié")
+        start = time.perf_counter()
+        executor.mask_all(changed)
+        duration = time.perf_counter() - start
+        print(f"{'Régénération (1 % modifié)':32s} {duration:7.3f} s  {count / duration:9.0f} fichiers/s")
+    finally:
+        executor.shutdown()
+    print(f"Processus utilisés : {executor.workers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark : régénération du contexte après modification d'un seul fichier.
+
+Crée un projet de N fichiers source (2000 par défaut), le scanne avec l'Api
+du mode desktop, génère le contexte de toute la sélection, modifie un
+fichier puis régénère : seule la section du fichier modifié est relue,
+masquée et reformatée, les autres sont reprises du cache des sections.
+La même régénération est ensuite mesurée cache des sections vidé.
+
+Usage : python tests/manual/bench_section_cache.py [nombre_fichiers]
+"""
+
+import sys
+import os
+import time
+import tempfile
+from unittest.mock import patch
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from main_desktop import Api
+
+MODULE_TEMPLATE = '''"""Module {index} du projet de test."""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Service{index}:
+    """Service métier numéro {index}."""
+
+    def __init__(self, repository, cache=None):
+        self.repository = repository
+        self.cache = cache or {{}}
+
+    def compute_total(self, items, tax_rate=0.2):
+        # Retourne le total TTC des articles
+        total = sum(item.price * item.quantity for item in items)
+        logger.info(f"Total calculé pour {{len(items)}} articles")
+        return round(total * (1 + tax_rate), 2)
+'''
+
+
+def create_project(directory: str, file_count: int):
+    for index in range(file_count):
+        sub = os.path.join(directory, f"pkg_{index % 40}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"service_{index}.py"), 'w', encoding='utf-8') as f:
+            f.write(MODULE_TEMPLATE.format(index=index) * 4)
+
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    result = function()
+    duration = time.perf_counter() - start
+    print(f"{label:45s} {duration * 1000:9.1f} ms  ({result['stats']['estimated_tokens']} tokens)")
+    return result
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as work_dir:
+        project = os.path.join(work_dir, 'project')
+        create_project(project, file_count)
+        with patch('main_desktop.SERVICE_CONFIGS', {
+            'git_service': {},
+            'llm_service': {},
+            'file_service': {'scan_index_dir': os.path.join(work_dir, 'index'), 'secrets_precompute': False}
+        }), patch('main_desktop.SELECTION_CACHE_PATH', os.path.join(work_dir, 'selections.json')):
+            api = Api()
+            api.scan_local_directory(project)
+            selection = sorted(f['relative_path'] for f in api.file_cache)
+
+            print("=" * 70)
+            print(f"Régénération du contexte : {len(selection)} fichiers, un fichier modifié")
+            print("=" * 70)
+            first = timed("Première génération", lambda: api.generate_context_from_selection(selection))
+
+            edited = os.path.join(project, selection[len(selection) // 2])
+            with open(edited, 'a', encoding='utf-8') as f:
+                f.write("\n# Modification\n")
+            incremental = timed("Régénération (sections mémorisées)",
+                                lambda: api.generate_context_from_selection(selection))
+
+            with open(edited, 'a', encoding='utf-8') as f:
+                f.write("# Seconde modification\n")
+            api.section_cache.clear()
+            api.file_service._masking_cache.clear()
+            full = timed("Régénération (caches vidés)", lambda: api.generate_context_from_selection(selection))
+
+            assert len(incremental['context']) > len(first['context'])
+            assert len(full['context']) > len(incremental['context'])
+            api.masking_executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark : comptage de tokens par le tokeniseur BPE contre les estimations.
+
+Compte les tokens des fichiers source du dépôt avec un vocabulaire de
+fournisseur (fichier .tiktoken donné en argument, sinon l'encodage
+cl100k_base de la bibliothèque tiktoken) et affiche l'écart de l'estimation
+à 4 caractères par token et de l'ancienne heuristique mots/ponctuation de
+LlmApiService. Mesure ensuite le débit du comptage à froid, puis celui
+d'une nouvelle génération sur les mêmes contenus (comptes mémorisés par
+empreinte).
+
+Usage : python tests/manual/bench_tokenizer.py [chemin/vers/cl100k_base.tiktoken]
+"""
+
+import sys
+import os
+import re
+import time
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.tokenizer import BpeTokenizer, CharEstimator, TiktokenCounter, HAS_TIKTOKEN
+
+EXTENSIONS = ('.py', '.js', '.html', '.css', '.md')
+
+
+def legacy_word_estimate(text: str) -> int:
+    """Ancienne estimation de LlmApiService._estimate_tokens."""
+    if not text:
+        return 0
+    words = text.split()
+    punctuation_count = len(re.findall(r'[.,!?;:()\[\]{}"\'`\-–—…]', text))
+    number_tokens = sum(len(num) // 3 + 1 for num in re.findall(r'\d+', text))
+    extra_tokens_long_words = sum((len(w) - 5) // 5 for w in words if len(w) > 10)
+    estimated = len(words) + punctuation_count // 2 + number_tokens + text.count('\n') + extra_tokens_long_words
+    return int(estimated * 1.3)
+
+
+def load_sources():
+    contents = []
+    for root, dirs, names in os.walk(repo_root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__pycache__')
+        for name in sorted(names):
+            if name.endswith(EXTENSIONS):
+                with open(os.path.join(root, name), 'r', encoding='utf-8', errors='replace') as f:
+                    contents.append((name, f.read()))
+    return contents
+
+
+def main():
+    if len(sys.argv) > 1:
+        tokenizer = BpeTokenizer.from_file(sys.argv[1])
+        make_cold = lambda: BpeTokenizer(tokenizer.ranks)
+        label = f"{os.path.basename(sys.argv[1])} ({len(tokenizer.ranks)} tokens)"
+    elif HAS_TIKTOKEN:
+        tokenizer = TiktokenCounter('cl100k_base')
+        make_cold = lambda: TiktokenCounter('cl100k_base')
+        label = "tiktoken cl100k_base"
+    else:
+        sys.exit(__doc__)
+    estimator = CharEstimator()
+    contents = load_sources()
+    total_chars = sum(len(content) for _, content in contents)
+
+    print("=" * 70)
+    print(f"Vocabulaire : {label}")
+    print(f"Corpus : {len(contents)} fichiers du dépôt, {total_chars / 1024 / 1024:.2f} Mo")
+    print("=" * 70)
+
+    for extension in EXTENSIONS:
+        texts = [content for name, content in contents if name.endswith(extension)]
+        if not texts:
+            continue
+        bpe = sum(tokenizer.count(text) for text in texts)
+        chars = sum(estimator.count(text) for text in texts)
+        words = sum(legacy_word_estimate(text) for text in texts)
+        print(f"{extension:6s} BPE {bpe:8d}  |  caractères / 4 {chars:8d} ({(chars - bpe) / bpe:+6.1%})"
+              f"  |  mots/ponctuation {words:8d} ({(words - bpe) / bpe:+6.1%})")
+
+    cold = make_cold()
+    start = time.perf_counter()
+    for _, content in contents:
+        cold.count_tokens(content)
+    cold_duration = time.perf_counter() - start
+    start = time.perf_counter()
+    for _, content in contents:
+        cold.count_tokens(content)
+    warm_duration = time.perf_counter() - start
+    print(f"\nComptage à froid : {cold_duration:.3f} s ({total_chars / 1024 / 1024 / cold_duration:.1f} Mo/s)")
+    print(f"Nouvelle génération (comptes mémorisés) : {warm_duration:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
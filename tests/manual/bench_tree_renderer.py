@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark : arbre des fichiers d'une sélection de 200 000 chemins.
+
+Compare le rendu commun (services.tree_renderer : regroupement par répertoire,
+un seul tri des répertoires puis un parcours linéaire) à l'ancien rendu de
+web_server (dictionnaires imbriqués, tri à chaque niveau, récursion), avec et
+sans les limites de profondeur et de fichiers par répertoire.
+
+Usage : python tests/manual/bench_tree_renderer.py [nombre_chemins]
+"""
+
+import sys
+import os
+import random
+import time
+from collections import defaultdict
+
+# Ajouter la racine du dépôt au PYTHONPATH
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from services.tree_renderer import render_tree
+
+
+def legacy_tree(relative_paths, root_name):
+    """Ancien generate_tree_from_paths de web_server."""
+    tree = defaultdict(dict)
+    for rel_path in relative_paths:
+        parts = rel_path.split('/')
+        current_level = tree
+        for i, part in enumerate(parts):
+            if not part:
+                continue
+            if i == len(parts) - 1:
+                current_level[part] = True
+            else:
+                if part not in current_level or not isinstance(current_level[part], dict):
+                    current_level[part] = {}
+                current_level = current_level[part]
+    lines = [f"{root_name}/"]
+    def format_level(level, prefix=""):
+        items = sorted(level.keys(), key=lambda k: (not isinstance(level[k], dict), k.lower()))
+        for i, key in enumerate(items):
+            connector = "└── " if i == len(items)-1 else "├── "
+            lines.append(prefix + connector + key)
+            if isinstance(level[key], dict) and level[key]:
+                new_prefix = prefix + ("    " if i == len(items)-1 else "│   ")
+                format_level(level[key], new_prefix)
+    format_level(tree)
+    return "\n".join(lines)
+
+
+def generate_paths(count: int):
+    """Arborescence réaliste : environ 25 fichiers par répertoire, profondeur 1 à 6, un répertoire très peuplé."""
+    rng = random.Random(1234)
+    directories = []
+    for _ in range(max(1, count // 25)):
+        depth = rng.randint(1, 6)
+        directories.append("/".join(f"{'pkg' if level % 2 else 'mod'}_{rng.randint(0, 7)}" for level in range(depth)))
+    paths = []
+    for index in range(count):
+        if index % 10 == 0:
+            paths.append(f"assets/generated/img_{index}.png")
+        else:
+            paths.append(f"{rng.choice(directories)}/file_{index}.py")
+    rng.shuffle(paths)
+    return paths
+
+
+def timed(label: str, function):
+    start = time.perf_counter()
+    output = function()
+    duration = time.perf_counter() - start
+    line_count = output.count("\n") + 1
+    print(f"{label:45s} {duration * 1000:9.1f} ms  ({line_count} lignes)")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    paths = generate_paths(count)
+    print("=" * 70)
+    print(f"Arbre des fichiers : {count} chemins")
+    print("=" * 70)
+    timed("Ancien rendu (dictionnaires, récursion)", lambda: legacy_tree(paths, 'projet'))
+    timed("render_tree", lambda: "\n".join(render_tree(paths, 'projet')))
+    timed("render_tree (200 fichiers par répertoire)",
+          lambda: "\n".join(render_tree(paths, 'projet', max_files_per_dir=200)))
+    timed("render_tree (profondeur 3)", lambda: "\n".join(render_tree(paths, 'projet', max_depth=3)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import pytest
+import os
+from services.binary_detection import BinaryClassifier, is_binary_string
+from services.file_service import FileService
+
+
+SAMPLES = [
+    b'',
+    b'print("hello")\n',
+    'café crème\n'.encode('utf-8'),
+    'été'.encode('latin-1'),
+    b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR',
+    b'ESC \x1b[31m couleur\x0c',
+    b'\x01\x02\x03',
+]
+
+
+class TestBinaryClassifier:
+    """Tests du classifieur binaire partagé."""
+
+    def test_utf8_rule(self):
+        """Octets nuls ou UTF-8 invalide : binaire."""
+        verdicts = BinaryClassifier().classify(SAMPLES)
+        assert verdicts == [False, False, False, True, True, False, False]
+
+    def test_textchars_rule_matches_is_binary_string(self):
+        """La règle 'textchars' reproduit is_binary_string (détection des uploads)."""
+        verdicts = BinaryClassifier().classify(SAMPLES, rule='textchars')
+        assert verdicts == [is_binary_string(s) for s in SAMPLES]
+        assert verdicts == [False, False, False, False, True, False, True]
+
+    def test_classify_files(self, tmp_path):
+        """Les échantillons sont lus dans l'ordre ; un fichier illisible donne None."""
+        paths = []
+        for i, sample in enumerate(SAMPLES):
+            path = tmp_path / f'f{i}'
+            path.write_bytes(sample)
+            paths.append(str(path))
+        paths.insert(2, str(tmp_path / 'absent'))
+
+        verdicts = BinaryClassifier(workers=3).classify_files(paths)
+        assert verdicts == [False, False, None, False, True, True, False, False]
+
+    def test_scan_stores_verdicts_in_index(self, tmp_path):
+        """Les verdicts du scan sont mémorisés dans l'index et réutilisés."""
+        (tmp_path / 'text.dat').write_text('texte')
+        (tmp_path / 'image.dat').write_bytes(b'\x00\x01')
+        service = FileService({'global_excludes_file': os.devnull, 'scan_backend': 'walk'})
+
+        service.scan_local_directory(str(tmp_path))
+        assert [f['relative_path'] for f in service.file_cache] == ['text.dat']
+        assert service.scan_index.entries['image.dat']['binary'] is True
+        assert service.scan_index.entries['text.dat']['binary'] is False
@@ -0,0 +1,40 @@
+import os
+from unittest.mock import patch
+from services.content_hash import hash_bytes, hash_file, HASH_ALGORITHM
+from services.file_service import FileService
+
+
+class TestContentHash:
+    """Tests des empreintes de contenu et de leur persistance dans l'index de scan."""
+
+    def test_hash_format(self, tmp_path):
+        path = tmp_path / 'a.txt'
+        path.write_bytes(b'contenu')
+        assert hash_file(str(path)) == hash_bytes(b'contenu')
+        assert hash_bytes(b'contenu').startswith(f"{HASH_ALGORITHM}:")
+        assert hash_bytes(b'contenu') != hash_bytes(b'contenu modifie')
+
+    def test_hashes_are_persisted_and_invalidated(self, tmp_path):
+        """Les empreintes sont réutilisées d'un service à l'autre tant que le fichier est inchangé."""
+        project = tmp_path / 'project'
+        project.mkdir()
+        (project / 'a.py').write_text('a = 1')
+        (project / 'b.py').write_text('b = 2')
+        config = {'global_excludes_file': os.devnull, 'scan_index_dir': str(tmp_path / 'index')}
+
+        service = FileService(config)
+        service.scan_local_directory(str(project))
+        hashes = service.get_content_hashes(['a.py', 'b.py', 'absent.py'])
+        assert hashes['a.py'] == hash_bytes(b'a = 1')
+        assert hashes['absent.py'] is None
+
+        other = FileService(config)
+        other.scan_local_directory(str(project))
+        with patch('services.file_service.hash_file', wraps=hash_file) as spy:
+            assert other.get_content_hash('a.py') == hashes['a.py']
+            assert spy.call_count == 0
+
+            # Une modification est détectée sans nouveau scan
+            (project / 'a.py').write_text('a = 10')
+            assert other.get_content_hash('a.py') == hash_bytes(b'a = 10')
+            assert spy.call_count == 1
@@ -1,3 +1,4 @@
+import io
 import pytest
 from services.context_builder_service import ContextBuilderService, ContextBuilderException
 
@@ -63,7 +64,9 @@ class TestContextBuilderService:
         stats = result['stats']
         assert stats['files_count'] == 3
         assert stats['total_chars'] == 101  # 35 + 37 + 29
-        assert stats['estimated_tokens'] == 25  # 101 // 4
+        # Tokens du contexte complet, comptés section par section (légèrement majorés)
+        full_count = context_builder.count_tokens(context)
+        assert full_count <= stats['estimated_tokens'] <= full_count * 1.1
     
     def test_build_context_no_files(self, context_builder):
         """Test avec aucun fichier."""
@@ -99,6 +102,9 @@ class TestContextBuilderService:
         assert any('utils.py' in line for line in tree)
         assert any('README.md' in line for line in tree)
         assert any('test_main.py' in line for line in tree)
+        # Chaque répertoire est affiché une seule fois, avant son contenu
+        assert tree.count('├── src/') == 1
+        assert tree.index('├── src/') < tree.index('│   ├── main.py')
     
     def test_file_sorting_by_size(self, context_builder):
         """Test que les fichiers sont triés par taille décroissante."""
@@ -180,4 +186,92 @@ class TestContextBuilderService:
         assert stats[1] == '- Fichiers traités: 10'
         assert stats[2] == '- Taille totale: 5,000 caractères'
         assert any('big.txt (2.0 KB)' in line for line in stats)
-        assert any('medium.txt (1.0 KB)' in line for line in stats)
\ No newline at end of file
+        assert any('medium.txt (1.0 KB)' in line for line in stats)
+    
+    def test_write_context_streams_same_context(self, context_builder, sample_file_contents):
+        """write_context écrit le même contexte que build_context, contenus chargés à la demande."""
+        expected = context_builder.build_context('MyProject', '/path', sample_file_contents, 'Instructions')
+        
+        loaded = []
+        lazy_contents = [
+            dict(f, content=lambda f=f: loaded.append(f['path']) or f['content'])
+            for f in sample_file_contents
+        ]
+        sink = io.StringIO()
+        result = context_builder.write_context(sink, 'MyProject', '/path', lazy_contents, 'Instructions')
+        
+        assert sink.getvalue() == expected['context']
+        assert result['stats']['context_chars'] == len(expected['context'])
+        assert result['stats']['total_chars'] == expected['stats']['total_chars']
+        assert loaded == ['README.md', 'main.py', 'utils/helper.py']  # Par taille décroissante
+        assert ''.join(context_builder.iter_context('MyProject', '/path', sample_file_contents,
+                                                    'Instructions')) == expected['context']
+    
+    def test_outline_code(self, context_builder):
+        """outline_code ne conserve que les lignes de déclaration."""
+        code = (
+            "import os\n"
+            "class Foo(Base):\n"
+            "    def bar(self, x):\n"
+            "        return x\n"
+            "export async function load(url) {\n"
+            "  return fetch(url);\n"
+            "}\n"
+        )
+        assert context_builder.outline_code(code) == (
+            "class Foo(Base):\n    def bar(self, x):\nexport async function load(url) {"
+        )
+    
+    def test_plan_packing_everything_fits(self, context_builder, sample_file_contents):
+        """Tous les fichiers sont inclus en entier si la sélection tient dans le budget."""
+        plan = context_builder.plan_packing(sample_file_contents, 10000)
+        
+        assert [f['mode'] for f in plan['files']] == ['full', 'full', 'full']
+        assert plan['counts']['full'] == 3
+        assert plan['used_tokens'] <= 10000
+    
+    def test_plan_packing_degrades_within_budget(self, context_builder):
+        """Sous contrainte, les fichiers sont compactés, réduits à leurs signatures ou omis."""
+        body = "    # commentaire\n    value = compute(value)\n" * 200
+        file_contents = [
+            {'path': f'mod_{i}.py', 'content': f"def func_{i}(value):\n{body}", 'size': 0}
+            for i in range(10)
+        ]
+        full = context_builder.plan_packing(file_contents, 10 ** 9)['used_tokens']
+        
+        for budget in (full // 2, full // 4, 200, 0):
+            plan = context_builder.plan_packing(file_contents, budget)
+            assert plan['used_tokens'] <= budget
+            assert sum(plan['counts'].values()) == 10
+            for f in plan['files']:
+                if f['mode'] == 'outline':
+                    assert f['content'] == f"def func_{f['path'][4:-3]}(value):"
+                elif f['mode'] == 'omitted':
+                    assert f['content'] is None and f['tokens'] == 0
+        
+        plan = context_builder.plan_packing(file_contents, full // 2)
+        assert plan['counts']['compact'] > 0  # Les commentaires supprimés rapportent plus que des fichiers omis
+        assert plan['counts']['omitted'] == 0
+    
+    def test_build_packed_context(self, context_builder, sample_file_contents):
+        """Le contexte ajusté respecte le budget et l'arbre liste aussi les fichiers omis."""
+        budget = 150
+        result = context_builder.build_packed_context('MyProject', '/path', sample_file_contents, budget)
+        
+        assert result['success'] is True
+        packing = result['packing']
+        assert packing['token_budget'] == budget
+        assert packing['fits'] is True
+        assert context_builder.count_tokens(result['context']) <= budget
+        assert packing['counts']['omitted'] > 0
+        assert '## Ajustement au budget de tokens' in result['context']
+        for f in packing['files']:
+            assert 'content' not in f
+            assert f['path'].split('/')[-1] in result['context']
+            assert (f"## Fichier: {f['path']}" in result['context']) == (f['mode'] != 'omitted')
+    
+    def test_token_budget(self, context_builder):
+        """Le budget réserve max_tokens, ou une part de la fenêtre pour la réponse."""
+        assert context_builder.token_budget(128000, 4096) == 123904
+        assert context_builder.token_budget(128000) == 128000 - 8192
+        assert context_builder.token_budget(8192) == 6144
@@ -0,0 +1,60 @@
+import pytest
+import os
+import pathspec
+from pathspec.patterns import GitWildMatchPattern
+from services.directory_walker import ParallelDirectoryWalker
+from services.file_service import FileService
+
+
+class TestParallelDirectoryWalker:
+    """Tests du parcours parallèle comparé au parcours séquentiel."""
+
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        """Arborescence avec sous-répertoires, fichiers ignorés et lien symbolique."""
+        for i in range(5):
+            sub = tmp_path / f'pkg{i}' / 'sub'
+            sub.mkdir(parents=True)
+            (tmp_path / f'pkg{i}' / 'module.py').write_text(f'x = {i}')
+            (sub / 'deep.py').write_text('pass')
+            (sub / 'debug.log').write_text('log')
+        (tmp_path / 'node_modules' / 'lib').mkdir(parents=True)
+        (tmp_path / 'node_modules' / 'lib' / 'index.js').write_text('module.exports = {}')
+        (tmp_path / 'main.py').write_text('print(1)')
+        try:
+            os.symlink(tmp_path / 'pkg0', tmp_path / 'link_to_pkg0')
+        except (OSError, NotImplementedError):
+            pass
+        return str(tmp_path)
+
+    @pytest.fixture
+    def spec(self):
+        """Règles d'exclusion communes aux deux parcours."""
+        return pathspec.PathSpec.from_lines(GitWildMatchPattern, ['node_modules/', '*.log'])
+
+    def test_same_output_as_serial_walk(self, project_dir, spec):
+        """Le parcours parallèle produit exactement la liste du parcours séquentiel."""
+        serial = FileService({'scan_workers': 1})._scan_files_with_gitignore(project_dir, spec)
+        parallel = FileService({'scan_workers': 4})._scan_files_with_gitignore(project_dir, spec)
+
+        assert parallel == serial
+        paths = {f['relative_path'] for f in parallel}
+        assert 'pkg3/sub/deep.py' in paths
+        assert not any(p.startswith('node_modules/') or p.endswith('.log') for p in paths)
+        assert not any(p.startswith('link_to_pkg0/') for p in paths)
+
+    def test_stats(self, project_dir, spec):
+        """Les statistiques du parcours sont renseignées."""
+        walker = ParallelDirectoryWalker(3)
+        files = walker.walk(project_dir, spec)
+
+        assert walker.stats['workers'] == 3
+        assert walker.stats['files'] == len(files) == 11
+        assert walker.stats['walk_seconds'] >= 0
+
+    def test_scan_reports_timings(self, project_dir):
+        """Le scan renvoie la durée de chaque phase."""
+        result = FileService({'scan_workers': 2}).scan_local_directory(project_dir)
+        timings = result['response_for_frontend']['debug']['timings']
+
+        assert set(timings) >= {'gitignore', 'walk', 'index', 'binary_filter', 'total'}
@@ -0,0 +1,41 @@
+import fnmatch
+from services.exclusion_rules import ExclusionRules, ExclusionRule
+
+
+PATTERNS = ['*.min.js', '*.min.css', '*-lock.json', '*.map', '*~', 'yarn.lock',
+            'test-*.js', 'a?c.*', '[!x]*.tmp', '*.js.map']
+NAMES = ['a.min.js', 'x.js', 'foo-lock.json', '.map', 'app.js.map', 'notes~', 'a.b~',
+         'yarn.lock', 'test-1.js', 'abc.py', 'q.tmp', 'x.tmp', 'min.js', '.min.js', 'main.py']
+
+
+class TestExclusionRules:
+    """Tests du moteur d'exclusion compilé."""
+
+    def test_same_matches_as_fnmatch(self):
+        """Le premier motif trouvé est celui de la boucle fnmatch d'origine."""
+        rules = ExclusionRules(pattern_blacklist=PATTERNS)
+        for name in NAMES:
+            expected = next((p for p in PATTERNS if fnmatch.fnmatch(name, p)), None)
+            assert rules.match_pattern(name) == expected, name
+
+    def test_decide_priority_and_rule(self):
+        """Nom exclu, motif, extension binaire puis extension texte ; la règle est renvoyée."""
+        rules = ExclusionRules(
+            file_blacklist={'package-lock.json'},
+            pattern_blacklist=['*-lock.json', '*.min.js'],
+            binary_blacklist={'.png', '.js'},
+            binary_whitelist={'.md'}
+        )
+        assert rules.decide('package-lock.json') == (False, ExclusionRule('file_blacklist', 'package-lock.json'))
+        assert rules.decide('yarn-lock.json') == (False, ExclusionRule('pattern_blacklist', '*-lock.json'))
+        assert rules.decide('app.min.js') == (False, ExclusionRule('pattern_blacklist', '*.min.js'))
+        assert rules.decide('Logo.PNG') == (False, ExclusionRule('binary_blacklist', '.png'))
+        assert rules.decide('README.md') == (True, ExclusionRule('binary_whitelist', '.md'))
+        assert rules.decide('main.py') == (None, None)
+        assert str(rules.decide('logo.png')[1]) == 'binary_blacklist:.png'
+
+    def test_from_config(self):
+        rules = ExclusionRules.from_config({'pattern_blacklist': ['*.log'], 'file_blacklist': {'.DS_Store'}})
+        assert rules.decide('debug.log')[0] is False
+        assert rules.decide('.DS_Store')[0] is False
+        assert rules.decide('app.py') == (None, None)
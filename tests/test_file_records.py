@@ -0,0 +1,46 @@
+import os
+import pickle
+from services.file_records import FileRecord, DirectoryInterner
+from services.file_service import FileService
+
+
+class TestFileRecord:
+    """Tests de l'enregistrement compact des fichiers scannés."""
+
+    def test_dict_compatible_view(self):
+        """L'enregistrement se lit comme l'ancien dictionnaire."""
+        record = FileRecord('/project', 'src/utils', 'helpers.py', 120, 1700000000.0, 42)
+        expected = {
+            'absolute_path': os.path.join('/project', 'src', 'utils', 'helpers.py'),
+            'relative_path': 'src/utils/helpers.py',
+            'name': 'helpers.py',
+            'size': 120,
+            'mtime': 1700000000.0,
+            'inode': 42
+        }
+
+        assert dict(record) == expected
+        assert record == expected
+        assert record['size'] == 120
+        assert record.get('mtime', 0) == 1700000000.0
+        assert record.get('missing', 'default') == 'default'
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert FileRecord('.', '', 'main.py', 1, 0.0)['absolute_path'] == 'main.py'
+
+    def test_shared_directory_strings(self, tmp_path):
+        """Les fichiers d'un même répertoire partagent la chaîne du répertoire."""
+        interner = DirectoryInterner()
+        first = interner.split('pkg/sub/a.py')[0]
+        assert interner.split(''.join(['pkg/sub/', 'b.py']))[0] is first
+
+        (tmp_path / 'pkg').mkdir()
+        for name in ('a.py', 'b.py'):
+            (tmp_path / 'pkg' / name).write_text('x = 1')
+        result = FileService({'global_excludes_file': os.devnull}).scan_local_directory(str(tmp_path))
+        records = result['file_cache']
+
+        assert all(isinstance(r, FileRecord) for r in records)
+        assert records[0].directory is records[1].directory
+        assert sorted(r['absolute_path'] for r in records) == [
+            str(tmp_path / 'pkg' / 'a.py'), str(tmp_path / 'pkg' / 'b.py')
+        ]
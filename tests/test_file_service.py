@@ -81,7 +81,7 @@ class TestFileService:
         assert result['success'] == False
         assert 'non trouvé' in result['error']
     
-    @patch('builtins.open', new_callable=mock_open, read_data='print("Hello World")')
+    @patch('builtins.open', new_callable=mock_open, read_data=b'print("Hello World")')
     def test_get_file_content_success(self, mock_file, file_service, mock_file_structure):
         """Test de lecture réussie d'un fichier."""
         file_cache = [mock_file_structure[0]]  # main.py
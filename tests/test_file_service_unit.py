@@ -173,7 +173,7 @@ print(f"Result: {result}")
         assert len(file_service.file_cache) == 2
         assert file_service.current_directory == '/test'
     
-    @patch('builtins.open', new_callable=mock_open, read_data='print("Hello")')
+    @patch('builtins.open', new_callable=mock_open, read_data=b'print("Hello")')
     def test_get_file_content_with_state(self, mock_file, file_service):
         """Test de get_file_content utilisant l'état interne."""
         # Configurer l'état interne
@@ -200,4 +200,72 @@ print(f"Result: {result}")
         
         # Devrait échouer car les fichiers ne sont pas dans le cache
         assert result['success'] == True
-        assert len(result['failed_files']) == 2
\ No newline at end of file
+        assert len(result['failed_files']) == 2
+    
+    @patch('builtins.open', new_callable=mock_open, read_data=b'x = 1')
+    def test_file_index_follows_file_cache(self, mock_file, file_service):
+        """L'index des chemins est reconstruit quand file_cache change."""
+        file_service.current_directory = '/test'
+        file_service.file_cache = [
+            {'absolute_path': '/test/a.py', 'relative_path': 'a.py', 'name': 'a.py', 'size': 5}
+        ]
+        assert file_service.get_file_content('a.py')['success'] == True
+        assert file_service.get_file_content('b.py')['success'] == False
+        
+        # Nouvelle liste affectée directement
+        file_service.file_cache = [
+            {'absolute_path': '/test/b.py', 'relative_path': 'b.py', 'name': 'b.py', 'size': 5}
+        ]
+        assert file_service.get_file_content('a.py')['success'] == False
+        
+        # Ajout dans la même liste
+        file_service.file_cache.append(
+            {'absolute_path': '/test/c.py', 'relative_path': 'c.py', 'name': 'c.py', 'size': 5}
+        )
+        result = file_service.get_file_contents_batch(['b.py', 'c.py'])
+        assert [f['path'] for f in result['file_contents']] == ['b.py', 'c.py']
+    
+    def test_iter_file_contents_ordered_with_budget(self, tmp_path):
+        """Lectures concurrentes : ordre de sélection conservé et budget appliqué."""
+        file_cache = []
+        for i in range(20):
+            path = tmp_path / f'f{i:02d}.py'
+            path.write_text('x' * 100)
+            file_cache.append({'absolute_path': str(path), 'relative_path': path.name,
+                               'name': path.name, 'size': 100})
+        selected = [f['relative_path'] for f in reversed(file_cache)]
+        service = FileService({'read_workers': 4})
+        
+        results = list(service.iter_file_contents(selected, str(tmp_path), file_cache))
+        assert [path for path, _ in results] == selected
+        assert all(r['success'] and r['content'] == 'x' * 100 for _, r in results)
+        
+        results = list(service.iter_file_contents(selected, str(tmp_path), file_cache, max_total_bytes=550))
+        assert [r['success'] for _, r in results] == [True] * 5 + [False] * 15
+        assert all(r.get('budget_exceeded') for _, r in results[5:])
+        
+        batch = FileService({'read_workers': 4, 'max_read_bytes': 1000}).get_file_contents_batch(
+            selected, str(tmp_path), file_cache)
+        assert batch['stats']['successful'] == 10
+        assert batch['stats']['skipped_budget'] == 10
+    
+    @patch('services.file_service.HAS_DETECT_SECRETS', True)
+    @patch('services.file_service.SecretsCollection')
+    @patch('services.file_service.initialize_detect_secrets_plugins')
+    def test_mask_secrets_cached(self, mock_init_plugins, mock_collection, file_service):
+        """Plugins initialisés une fois ; un contenu déjà masqué n'est pas réanalysé."""
+        mock_secrets = MagicMock()
+        mock_secrets.data = {'test.py': [{'line_number': 1, 'type': 'API Key'}]}
+        mock_collection.return_value = mock_secrets
+        mock_init_plugins.from_parser_builder.return_value = [MagicMock()]
+        
+        content = "api_key = 'secret'\nprint('hello')"
+        first = file_service.mask_secrets(content, 'test.py', 'mask')
+        assert file_service.mask_secrets(content, 'test.py', 'mask') == first
+        assert mock_collection.call_count == 1
+        
+        # Autre mode ou autre contenu : nouvelle analyse, sans réinitialiser les plugins
+        file_service.mask_secrets(content, 'test.py', 'remove')
+        file_service.mask_secrets(content + '\n', 'test.py', 'mask')
+        assert mock_collection.call_count == 3
+        assert mock_init_plugins.from_parser_builder.call_count == 1
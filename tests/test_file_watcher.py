@@ -0,0 +1,143 @@
+import pytest
+import os
+import sys
+import time
+import threading
+from services.file_service import FileService
+from services.file_watcher import FileWatcher, _load_libc
+
+
+requires_inotify = pytest.mark.skipif(
+    not sys.platform.startswith('linux') or _load_libc() is None, reason="inotify indisponible"
+)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestApplyChanges:
+    """Tests de l'application incrémentale des changements à file_cache."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / '.gitignore').write_text('*.log\n')
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'src' / 'app.py').write_text('print(1)')
+        (tmp_path / 'src' / 'old.py').write_text('pass')
+        (tmp_path / 'README.md').write_text('# Projet')
+        return tmp_path
+
+    @pytest.fixture
+    def service(self, project):
+        service = FileService({'global_excludes_file': os.devnull, 'scan_backend': 'walk'})
+        service.scan_local_directory(str(project))
+        yield service
+        service.stop_watching()
+
+    def test_add_modify_remove(self, project, service):
+        """Ajouts, modifications et suppressions sont répercutés en place dans file_cache."""
+        shared = service.file_cache
+        (project / 'src' / 'new.py').write_text('x = 1')
+        (project / 'src' / 'app.py').write_text('print("modifié")')
+        (project / 'src' / 'old.py').unlink()
+        (project / 'debug.log').write_text('ignoré')
+        (project / 'image.dat').write_bytes(b'\x00\x01\x02')
+
+        delta = service.apply_changes({'src/new.py', 'src/app.py', 'src/old.py', 'debug.log', 'image.dat'})
+
+        assert [f['path'] for f in delta['added']] == ['src/new.py']
+        assert [f['path'] for f in delta['modified']] == ['src/app.py']
+        assert delta['removed'] == ['src/old.py']
+        assert delta['count'] == 3
+        assert service.file_cache is shared
+        assert sorted(f['relative_path'] for f in shared) == ['.gitignore', 'README.md', 'src/app.py', 'src/new.py']
+        assert service.get_file_content('src/app.py')['content'] == 'print("modifié")'
+
+        # Les mêmes chemins, inchangés, ne produisent plus de delta
+        assert service.apply_changes({'src/new.py', 'src/app.py'})['count'] == 0
+
+    def test_directory_changes(self, project, service):
+        """Un répertoire signalé est réexaminé, un répertoire supprimé retire son contenu."""
+        (project / 'lib' / 'sub').mkdir(parents=True)
+        (project / 'lib' / 'sub' / 'util.py').write_text('pass')
+        delta = service.apply_changes({'lib'})
+        assert [f['path'] for f in delta['added']] == ['lib/sub/util.py']
+
+        (project / 'lib' / 'sub' / 'util.py').unlink()
+        (project / 'lib' / 'sub').rmdir()
+        (project / 'lib').rmdir()
+        delta = service.apply_changes({'lib'})
+        assert delta['removed'] == ['lib/sub/util.py']
+        assert 'lib/sub/util.py' not in service.scan_index.entries
+
+    def test_polling_detection(self, project, service):
+        """Le backend polling détecte les changements par comparaison avec l'index de scan."""
+        assert service._detect_changes_from_index() == set()
+        (project / 'src' / 'new.py').write_text('x = 1')
+        (project / 'src' / 'old.py').unlink()
+        assert service._detect_changes_from_index() == {'src/new.py', 'src/old.py'}
+
+    def test_watcher_polling_pushes_delta(self, project, service):
+        """La surveillance polling applique les changements et transmet le delta."""
+        service.config.update({'watch_backend': 'polling', 'watch_poll_interval': 0.05, 'watch_debounce_ms': 50})
+        deltas = []
+        assert service.start_watching(deltas.append) == 'polling'
+
+        (project / 'src' / 'new.py').write_text('x = 1')
+        assert wait_for(lambda: deltas)
+        assert [f['path'] for f in deltas[0]['added']] == ['src/new.py']
+        assert 'src/new.py' in {f['relative_path'] for f in service.file_cache}
+
+        service.scan_local_directory(str(project))
+        assert service.watcher is None
+
+
+class TestFileWatcher:
+    """Tests de l'anti-rebond et du backend inotify."""
+
+    def test_debounce_batches_events(self, tmp_path):
+        """Les événements rapprochés sont transmis en un seul lot."""
+        batches = []
+        watcher = FileWatcher(str(tmp_path), batches.append, detect_changes=set,
+                              backend='polling', debounce=0.1, poll_interval=10)
+        watcher.start()
+        try:
+            for name in ('a.py', 'b.py', 'a.py'):
+                watcher._add([name])
+            assert wait_for(lambda: batches)
+            time.sleep(0.2)
+            assert batches == [{'a.py', 'b.py'}]
+        finally:
+            watcher.stop()
+
+    @requires_inotify
+    def test_inotify_reports_new_directories(self, tmp_path):
+        """inotify signale les fichiers créés, y compris dans un répertoire créé après le démarrage."""
+        from services.ignore_rules import HierarchicalIgnoreMatcher, IgnoreRulesCache
+        (tmp_path / 'node_modules').mkdir()
+        spec = HierarchicalIgnoreMatcher(str(tmp_path), IgnoreRulesCache(), global_excludes_file=os.devnull)
+        changed = set()
+        lock = threading.Lock()
+
+        def on_changes(paths):
+            with lock:
+                changed.update(paths)
+
+        watcher = FileWatcher(str(tmp_path), on_changes, ignore_spec=spec, backend='inotify', debounce=0.05)
+        watcher.start()
+        try:
+            assert watcher.backend_name == 'inotify'
+            (tmp_path / 'pkg').mkdir()
+            assert wait_for(lambda: 'pkg' in changed)
+            (tmp_path / 'pkg' / 'mod.py').write_text('pass')
+            (tmp_path / 'node_modules' / 'dep.js').write_text('ignoré')
+            assert wait_for(lambda: 'pkg/mod.py' in changed)
+            assert 'node_modules/dep.js' not in changed
+        finally:
+            watcher.stop()
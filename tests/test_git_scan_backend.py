@@ -0,0 +1,93 @@
+import pytest
+import os
+import shutil
+import subprocess
+from unittest.mock import patch, MagicMock
+from services.git_service import GitService
+from services.file_service import FileService
+
+
+requires_git = pytest.mark.skipif(shutil.which('git') is None, reason="git non installé")
+
+
+class TestGitScanBackend:
+    """Tests de l'énumération des fichiers via l'index git."""
+
+    @pytest.fixture
+    def git_service(self):
+        return GitService({'executable_path': 'git'})
+
+    @pytest.fixture
+    def repo_dir(self, tmp_path):
+        """Dépôt git avec fichiers suivis, non suivis, ignorés et supprimés."""
+        def git(*args):
+            subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+
+        git('init', '-q')
+        (tmp_path / '.gitignore').write_text('*.log\nbuild/\n')
+        (tmp_path / 'src').mkdir()
+        (tmp_path / 'src' / 'app.py').write_text('print(1)')
+        (tmp_path / 'src' / 'removed.py').write_text('pass')
+        (tmp_path / 'src' / 'sub').mkdir()
+        (tmp_path / 'src' / 'sub' / '.gitignore').write_text('*.tmp\n')
+        (tmp_path / 'src' / 'sub' / 'cache.tmp').write_text('tmp')
+        (tmp_path / 'src' / 'sub' / 'util.py').write_text('pass')
+        git('add', '.')
+        (tmp_path / 'src' / 'removed.py').unlink()
+        (tmp_path / 'untracked.py').write_text('x = 1')
+        (tmp_path / 'debug.log').write_text('log')
+        (tmp_path / 'build').mkdir()
+        (tmp_path / 'build' / 'out.js').write_text('out')
+        (tmp_path / '.vscode').mkdir()
+        (tmp_path / '.vscode' / 'settings.json').write_text('{}')
+        return str(tmp_path)
+
+    @patch('subprocess.run')
+    def test_list_project_files_command(self, mock_run, git_service):
+        """La commande utilise l'exécutable configuré et la sortie -z est décodée."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b'a.py\0dir/b c.py\0a.py\0', stderr=b'')
+
+        assert git_service.list_project_files('/repo') == ['a.py', 'dir/b c.py']
+        mock_run.assert_called_once_with(
+            ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard'],
+            cwd='/repo',
+            capture_output=True
+        )
+
+    @patch('subprocess.run')
+    def test_list_project_files_not_a_repo(self, mock_run, git_service):
+        """Hors dépôt ou sans git, None est renvoyé."""
+        mock_run.return_value = MagicMock(returncode=128, stdout=b'', stderr=b'fatal: not a git repository')
+        assert git_service.list_project_files('/tmp') is None
+
+        mock_run.side_effect = FileNotFoundError('git')
+        assert git_service.list_project_files('/tmp') is None
+
+    @requires_git
+    def test_same_records_as_walk(self, repo_dir, git_service):
+        """Le backend git produit les mêmes enregistrements que le parcours."""
+        config = {'global_excludes_file': os.devnull}
+        via_git = FileService({**config, 'scan_backend': 'git'}, git_service=git_service)
+        via_walk = FileService({**config, 'scan_backend': 'walk'}, git_service=git_service)
+
+        git_result = via_git.scan_local_directory(repo_dir)
+        walk_result = via_walk.scan_local_directory(repo_dir)
+
+        assert git_result['response_for_frontend']['debug']['scan_backend'] == 'git'
+        assert walk_result['response_for_frontend']['debug']['scan_backend'] == 'walk'
+        by_path = lambda files: sorted(files, key=lambda f: f['relative_path'])
+        assert by_path(via_git.file_cache) == by_path(via_walk.file_cache)
+        assert sorted(f['relative_path'] for f in via_git.file_cache) == [
+            '.gitignore', 'src/app.py', 'src/sub/.gitignore', 'src/sub/util.py', 'untracked.py'
+        ]
+
+    def test_fallback_for_non_git_directory(self, tmp_path, git_service):
+        """Un répertoire hors dépôt est parcouru normalement."""
+        (tmp_path / 'main.py').write_text('print(1)')
+        service = FileService({'global_excludes_file': os.devnull}, git_service=git_service)
+
+        with patch.object(git_service, 'list_project_files', return_value=None):
+            result = service.scan_local_directory(str(tmp_path))
+
+        assert result['response_for_frontend']['debug']['scan_backend'] == 'walk'
+        assert [f['relative_path'] for f in service.file_cache] == ['main.py']
@@ -0,0 +1,88 @@
+import pytest
+import os
+from services.ignore_rules import (
+    CompiledIgnoreRules, IgnoreRulesCache, HierarchicalIgnoreMatcher
+)
+from services.file_service import FileService
+
+
+class TestIgnoreRules:
+    """Tests du moteur de règles .gitignore hiérarchiques."""
+
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        """Projet avec un .gitignore racine, un .gitignore imbriqué et .git/info/exclude."""
+        (tmp_path / '.gitignore').write_text('*.log\n!keep.log\n')
+        (tmp_path / '.git' / 'info').mkdir(parents=True)
+        (tmp_path / '.git' / 'info' / 'exclude').write_text('secret.txt\n')
+        (tmp_path / 'main.py').write_text('print(1)')
+        (tmp_path / 'keep.log').write_text('kept')
+        (tmp_path / 'debug.log').write_text('ignored')
+        (tmp_path / 'secret.txt').write_text('ignored')
+
+        pkg = tmp_path / 'packages' / 'web'
+        (pkg / 'dist').mkdir(parents=True)
+        (pkg / 'src').mkdir()
+        (pkg / '.gitignore').write_text('/dist/\n*.gen.js\n!keep.log\n')
+        (pkg / 'dist' / 'bundle.js').write_text('bundle')
+        (pkg / 'src' / 'app.js').write_text('app')
+        (pkg / 'src' / 'api.gen.js').write_text('generated')
+        (pkg / 'src' / 'dist').mkdir()
+        (pkg / 'src' / 'dist' / 'nested.js').write_text('not anchored')
+        return str(tmp_path)
+
+    def _matcher(self, root):
+        return HierarchicalIgnoreMatcher(root, IgnoreRulesCache(), global_excludes_file=os.devnull)
+
+    def test_last_matching_pattern_wins(self):
+        """La négation la plus récente l'emporte."""
+        rules = CompiledIgnoreRules(['*.log', '!keep.log', '# commentaire', ''])
+
+        assert rules.decide('debug.log') is True
+        assert rules.decide('keep.log') is False
+        assert rules.decide('main.py') is None
+
+    def test_nested_gitignore(self, project_dir):
+        """Les règles imbriquées s'appliquent relativement à leur répertoire."""
+        matcher = self._matcher(project_dir)
+
+        assert matcher.match_file('debug.log')
+        assert not matcher.match_file('keep.log')
+        assert matcher.match_file('secret.txt')  # .git/info/exclude
+        assert matcher.match_file('.git/')  # règles par défaut
+        assert matcher.match_file('packages/web/dist/')
+        assert not matcher.match_file('packages/web/src/dist/')  # '/dist/' est ancré
+        assert matcher.match_file('packages/web/src/api.gen.js')
+        assert not matcher.match_file('packages/web/src/app.js')
+
+    def test_rules_cached_by_mtime(self, project_dir):
+        """Un .gitignore inchangé n'est pas recompilé ; une modification est prise en compte."""
+        cache = IgnoreRulesCache()
+        path = os.path.join(project_dir, '.gitignore')
+        first = cache.get(path)
+        assert cache.get(path) is first
+
+        with open(path, 'w') as f:
+            f.write('*.py\n')
+        os.utime(path, ns=(0, 10**9))
+        assert cache.get(path) is not first
+        assert cache.get(path).decide('main.py') is True
+
+    def test_scan_prunes_nested_ignored_directories(self, project_dir):
+        """Le scan n'explore pas les répertoires exclus par un .gitignore imbriqué."""
+        service = FileService({'global_excludes_file': os.devnull})
+        result = service.scan_local_directory(project_dir)
+        paths = sorted(f['path'] for f in result['response_for_frontend']['files'])
+
+        assert paths == [
+            '.gitignore', 'keep.log', 'main.py',
+            'packages/web/.gitignore', 'packages/web/src/app.js', 'packages/web/src/dist/nested.js'
+        ]
+
+    def test_root_only_mode(self, project_dir):
+        """hierarchical_gitignore=False conserve l'ancien comportement."""
+        service = FileService({'hierarchical_gitignore': False})
+        result = service.scan_local_directory(project_dir)
+        paths = {f['path'] for f in result['response_for_frontend']['files']}
+
+        assert 'packages/web/dist/bundle.js' in paths
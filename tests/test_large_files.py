@@ -0,0 +1,59 @@
+import pytest
+from services.large_files import LargeFilePolicy, count_lines
+from services.file_service import FileService
+
+
+class TestLargeFilePolicy:
+    """Tests de la lecture des fichiers volumineux."""
+
+    @pytest.fixture
+    def big_file(self, tmp_path):
+        """Fichier de 1000 lignes numérotées (≈ 11 Ko)."""
+        path = tmp_path / 'dump.sql'
+        path.write_bytes(b''.join(b'line %05d\n' % i for i in range(1000)))
+        return path
+
+    def test_count_lines(self):
+        """Comptage sur octets bruts, dernière ligne sans retour à la ligne incluse."""
+        assert count_lines(b'') == 0
+        assert count_lines(b'a\nb\n') == 2
+        assert count_lines(b'a\nb') == 2
+        assert count_lines(b'a\r\nb\r\n') == 2
+
+    def test_mmap_read_matches_text_read(self, tmp_path):
+        """La lecture mmap produit le même texte qu'open() en mode texte."""
+        path = tmp_path / 'mixed.txt'
+        path.write_bytes('héllo\r\nmonde\rfin\n\xff'.encode('utf-8') + b'\xff\xfe')
+        read = LargeFilePolicy(mmap_threshold=0).read(str(path))
+
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            assert read['content'] == f.read()
+        assert read['truncated'] is False
+
+    def test_excerpt_mode(self, big_file):
+        """Au-delà du plafond : début et fin coupés sur des lignes, avec marqueur d'élision."""
+        policy = LargeFilePolicy(mmap_threshold=0, max_file_bytes=1000, head_bytes=25, tail_bytes=25)
+        read = policy.read(str(big_file))
+        lines = read['content'].split('\n')
+
+        assert read['truncated'] is True
+        assert read['line_count'] == 1000
+        assert lines[:2] == ['line 00000', 'line 00001']
+        assert '996 lignes' in lines[2]
+        assert lines[3:] == ['line 00998', 'line 00999', '']
+
+    def test_file_service_policies(self, big_file):
+        """get_file_content applique le plafond, en mode extrait ou ignoré."""
+        file_cache = [{'absolute_path': str(big_file), 'relative_path': 'dump.sql',
+                       'name': 'dump.sql', 'size': big_file.stat().st_size}]
+
+        service = FileService({'mmap_threshold': 4096, 'max_file_bytes': 2048})
+        result = service.get_file_content('dump.sql', str(big_file.parent), file_cache)
+        assert result['success'] is True
+        assert result['truncated'] is True
+        assert result['line_count'] == 1000
+
+        service = FileService({'max_file_bytes': 2048, 'large_file_mode': 'skip'})
+        result = service.get_file_content('dump.sql', str(big_file.parent), file_cache)
+        assert result['success'] is False
+        assert result['skipped'] is True
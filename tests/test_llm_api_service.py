@@ -85,6 +85,14 @@ class TestLlmApiService:
         # Config par défaut du fixture
         assert config['debug'] == False
     
+    def test_get_context_limits(self, llm_service):
+        """La fenêtre de contexte du modèle demandé (ou par défaut) est retournée."""
+        llm_service._llm_models['test-model']['context_window'] = 16000
+        assert llm_service.get_context_limits() == {
+            'llm_id': 'test-model', 'context_window': 16000, 'max_tokens': None
+        }
+        assert llm_service.get_context_limits('unknown')['context_window'] == 16000
+    
     def test_prepare_request_openai(self, llm_service, chat_history):
         """Test de la préparation de requête pour OpenAI."""
         url, headers, payload, ssl_verify = llm_service._prepare_request(chat_history, stream=False)
@@ -269,6 +277,13 @@ class TestLlmApiService:
         long_tokens = llm_service._estimate_tokens(long_text)
         assert long_tokens > tokens  # Plus de tokens pour un texte plus long
     
+    def test_estimate_tokens_without_tokenizer(self, llm_service):
+        """Sans tokeniseur réel, l'heuristique mots/ponctuation est utilisée plutôt que caractères / 4."""
+        from services.tokenizer import CharEstimator
+        with patch('services.llm_api_service.get_tokenizer', return_value=CharEstimator()):
+            # 6 mots + 3 ponctuations // 2 + nombre 123 (2), × 1.3
+            assert llm_service._estimate_tokens("Hello, world! This is test 123.") == 11
+    
     @patch.object(LlmApiService, '_prepare_request')
     def test_send_to_llm_stream_error_handling(self, mock_prepare, llm_service, chat_history):
         """Test de la gestion d'erreur pendant le streaming."""
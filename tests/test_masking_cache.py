@@ -0,0 +1,31 @@
+from services.masking_cache import MaskingCache, _ENTRY_CHARS
+
+
+class TestMaskingCache:
+    """Tests unitaires pour le cache des résultats du masquage."""
+
+    def test_clean_content_stored_as_marker(self):
+        """Un contenu sans secret n'est pas conservé : get() rend le contenu de l'appelant."""
+        cache = MaskingCache()
+        content = 'print("ok")\n' * 100
+        cache.put(('h1', 'mask', 'a.py', 'v1'), content, (content, 0))
+
+        assert cache._chars == _ENTRY_CHARS
+        assert cache.get(('h1', 'mask', 'a.py', 'v1'), content) == (content, 0)
+        assert cache.get(('h1', 'mask', 'a.py', 'v2'), content) is None
+
+    def test_bounded_by_chars(self):
+        """Les résultats les moins récemment utilisés sont oubliés au-delà de max_chars."""
+        cache = MaskingCache(max_chars=2 * (_ENTRY_CHARS + 100))
+        for key in ('a', 'b'):
+            cache.put((key,), 'x', ('m' * 100, 1))
+        cache.get(('a',), 'x')
+        cache.put(('c',), 'x', ('m' * 100, 1))
+
+        assert cache.get(('b',), 'x') is None
+        assert cache.get(('a',), 'x') == ('m' * 100, 1)
+        assert len(cache) == 2
+
+        # Un résultat plus grand que le cache n'est pas conservé
+        cache.put(('d',), 'x', ('m' * 1000, 1))
+        assert cache.get(('d',), 'x') is None
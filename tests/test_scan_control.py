@@ -0,0 +1,65 @@
+import os
+import time
+import pytest
+from services.scan_control import ScanLimits, ScanCancelToken
+from services.file_service import FileService
+
+
+class TestScanLimits:
+    """Tests des limites de scan et des résultats partiels."""
+
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        """10 répertoires de 3 niveaux, 5 fichiers par niveau."""
+        for i in range(10):
+            level = tmp_path / f'pkg{i}'
+            for depth in range(3):
+                level.mkdir()
+                for j in range(5):
+                    (level / f'f{j}.py').write_text('x = 1')
+                level = level / 'sub'
+        (tmp_path / 'main.py').write_text('print(1)')
+        return str(tmp_path)
+
+    def _scan(self, project_dir, **config):
+        service = FileService({'global_excludes_file': os.devnull, **config})
+        return service.scan_local_directory(project_dir)['response_for_frontend']
+
+    def test_complete_scan_not_truncated(self, project_dir):
+        response = self._scan(project_dir)
+        assert response['truncated'] is False
+        assert response['count'] == 151
+
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_max_files(self, project_dir, workers):
+        """Le parcours s'arrête à max_files et le résultat est marqué tronqué."""
+        response = self._scan(project_dir, scan_max_files=20, scan_workers=workers)
+        assert response['truncated'] is True
+        assert response['truncation']['reasons'] == ['max_files']
+        assert response['count'] == 20
+
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_max_depth(self, project_dir, workers):
+        """Les répertoires trop profonds sont élagués."""
+        response = self._scan(project_dir, scan_max_depth=1, scan_workers=workers)
+        paths = [f['path'] for f in response['files']]
+        assert response['truncation']['reasons'] == ['max_depth']
+        assert response['count'] == 51
+        assert max(p.count('/') for p in paths) == 1
+
+    def test_max_seconds(self):
+        """Une fois la durée écoulée, should_stop signale la limite."""
+        token = ScanCancelToken().start(ScanLimits(max_seconds=0.01))
+        assert token.should_stop() is False
+        time.sleep(0.02)
+        assert token.should_stop() is True
+        assert token.truncation()['reasons'] == ['max_seconds']
+
+    def test_partial_scan_keeps_index_entries(self, project_dir, tmp_path_factory):
+        """Un scan tronqué ne supprime pas de l'index les fichiers non visités."""
+        index_dir = str(tmp_path_factory.mktemp('index'))
+        self._scan(project_dir, scan_index_dir=index_dir)
+        response = self._scan(project_dir, scan_index_dir=index_dir, scan_max_files=10)
+
+        assert response['index_stats']['removed'] == 0
+        assert response['index_stats']['unchanged'] == 10
@@ -0,0 +1,82 @@
+import pytest
+import os
+from unittest.mock import patch
+from services.scan_index import ScanIndex
+from services.file_service import FileService
+
+
+class TestScanIndex:
+    """Tests unitaires pour l'index de scan persistant."""
+
+    @pytest.fixture
+    def index_dir(self, tmp_path):
+        """Répertoire de stockage des index."""
+        return str(tmp_path / 'index')
+
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        """Projet de test avec un fichier sans extension connue."""
+        project = tmp_path / 'project'
+        project.mkdir()
+        (project / 'script').write_text('#!/bin/sh\necho hello\n')
+        (project / 'data.bin2').write_bytes(b'\x00\x01\x02')
+        return str(project)
+
+    def test_reconcile_counts(self, index_dir, project_dir):
+        """Test des compteurs inchangés/modifiés/ajoutés/supprimés."""
+        files = [
+            {'relative_path': 'a.py', 'size': 10, 'mtime': 1.0, 'inode': 1},
+            {'relative_path': 'b.py', 'size': 20, 'mtime': 2.0, 'inode': 2},
+        ]
+        index = ScanIndex(index_dir, project_dir).load()
+        assert index.reconcile(files) == {'unchanged': 0, 'modified': 0, 'added': 2, 'removed': 0}
+        index.save()
+
+        reloaded = ScanIndex(index_dir, project_dir).load()
+        files = [
+            {'relative_path': 'a.py', 'size': 10, 'mtime': 1.0, 'inode': 1},
+            {'relative_path': 'c.py', 'size': 5, 'mtime': 3.0, 'inode': 3},
+        ]
+        assert reloaded.reconcile(files) == {'unchanged': 1, 'modified': 0, 'added': 1, 'removed': 1}
+
+    def test_verdict_invalidated_by_signature(self, index_dir, project_dir):
+        """Un verdict n'est réutilisé que si (taille, mtime, inode) est inchangé."""
+        file_info = {'relative_path': 'a.dat', 'size': 10, 'mtime': 1.0, 'inode': 1}
+        index = ScanIndex(index_dir, project_dir).load()
+        index.reconcile([file_info])
+        index.set_verdict(file_info, True)
+
+        assert index.get_verdict(file_info) is True
+        assert index.get_verdict(dict(file_info, mtime=2.0)) is None
+        assert index.get_verdict(dict(file_info, inode=7)) is None
+
+    def test_corrupted_index_is_rebuilt(self, index_dir, project_dir):
+        """Un index illisible est ignoré."""
+        index = ScanIndex(index_dir, project_dir)
+        os.makedirs(index_dir)
+        with open(index.index_path, 'w') as f:
+            f.write('{not json')
+
+        assert index.load().entries == {}
+
+    def test_rescan_skips_content_sniff(self, index_dir, project_dir):
+        """Un second scan ne rouvre pas les fichiers inchangés."""
+        service = FileService({'scan_index_dir': index_dir})
+        first = service.scan_local_directory(project_dir)
+        paths = [f['path'] for f in first['response_for_frontend']['files']]
+        assert paths == ['script']
+        assert first['response_for_frontend']['index_stats']['added'] == 2
+
+        real_open = open
+
+        def guarded_open(path, mode='r', *args, **kwargs):
+            assert mode != 'rb', f"fichier rouvert pour analyse: {path}"
+            return real_open(path, mode, *args, **kwargs)
+
+        with patch('builtins.open', side_effect=guarded_open):
+            second = service.scan_local_directory(project_dir)
+
+        assert [f['path'] for f in second['response_for_frontend']['files']] == ['script']
+        assert second['response_for_frontend']['index_stats'] == {
+            'unchanged': 2, 'modified': 0, 'added': 0, 'removed': 0
+        }
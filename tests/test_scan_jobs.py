@@ -0,0 +1,63 @@
+import os
+import pytest
+from services.scan_jobs import ScanProgress, ScanJob
+from services.file_service import FileService
+from services.exceptions import ScanCancelledException
+
+
+class TestScanJobs:
+    """Tests des scans progressifs."""
+
+    @pytest.fixture
+    def project_dir(self, tmp_path):
+        for i in range(12):
+            sub = tmp_path / f'pkg{i}'
+            sub.mkdir()
+            for j in range(50):
+                (sub / f'm{j}.py').write_text('x = 1')
+        return str(tmp_path)
+
+    def test_progress_batches(self):
+        """Les fichiers sont publiés par lots complets, puis le reste au flush."""
+        batches = []
+        progress = ScanProgress(on_files=batches.append, batch_size=3)
+        progress.files_accepted([{'path': str(i)} for i in range(7)])
+        assert [len(b) for b in batches] == [3, 3]
+
+        progress.flush()
+        assert [len(b) for b in batches] == [3, 3, 1]
+        assert progress.counts['accepted'] == 7
+
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_scan_streams_files(self, project_dir, workers):
+        """Les lots reçus reconstituent exactement la liste du scan."""
+        events = []
+        service = FileService({'scan_workers': workers, 'global_excludes_file': os.devnull})
+        job = ScanJob(project_dir, lambda event, job_id, payload: events.append((event, payload)), batch_size=100)
+        job.start(lambda progress: service.scan_local_directory(project_dir, progress=progress)['response_for_frontend'])
+        job.join(10)
+
+        streamed = [f for event, payload in events if event == 'files' for f in payload]
+        final = events[-1]
+        assert job.status == 'completed'
+        assert final[0] == 'complete'
+        assert streamed == final[1]['files']
+        assert len(streamed) == 600
+        assert any(event == 'progress' for event, _ in events)
+
+    def test_cancel(self, project_dir):
+        """Un scan annulé lève ScanCancelledException et ne modifie pas l'état du service."""
+        service = FileService({'scan_workers': 4, 'global_excludes_file': os.devnull})
+        progress = ScanProgress()
+        progress.cancel()
+        with pytest.raises(ScanCancelledException):
+            service.scan_local_directory(project_dir, progress=progress)
+        assert service.file_cache == []
+
+        events = []
+        job = ScanJob(project_dir, lambda event, job_id, payload: events.append(event))
+        job.cancel()
+        job.start(lambda progress: service.scan_local_directory(project_dir, progress=progress))
+        job.join(10)
+        assert job.status == 'cancelled'
+        assert events[-1] == 'cancelled'
@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+from services.content_hash import hash_text
+from services.file_service import FileService
+from services.secret_findings import SecretFinding, SecretFindingsStore
+from services.secret_masking import MaskingExecutor
+
+
+class TestSecretFindings:
+    """Tests du magasin persistant des secrets détectés et du rapport d'audit."""
+
+    def make_project(self, tmp_path):
+        project = tmp_path / 'project'
+        project.mkdir()
+        (project / 'settings.py').write_text('DEBUG = True\nAPI_KEY = "abcdef0123456789abcdef"\n')
+        (project / 'copy.py').write_text('DEBUG = True\nAPI_KEY = "abcdef0123456789abcdef"\n')
+        (project / 'main.py').write_text('print("ok")\n')
+        config = {'global_excludes_file': os.devnull, 'scan_backend': 'walk',
+                  'scan_index_dir': str(tmp_path / 'index')}
+        return project, config
+
+    def test_store_invalidated_by_detectors_version(self, tmp_path):
+        store = SecretFindingsStore(str(tmp_path), str(tmp_path), 'v1')
+        store.record('a.py', 'h1', [SecretFinding(3, 'api_key', 'regex')])
+        store.save()
+
+        assert SecretFindingsStore(str(tmp_path), str(tmp_path), 'v1').load().get('h1') == [
+            SecretFinding(3, 'api_key', 'regex')]
+        assert SecretFindingsStore(str(tmp_path), str(tmp_path), 'v2').load().get('h1') is None
+
+    def test_scan_and_report(self, tmp_path):
+        """Les secrets sont listés par fichier ; les fichiers sans secret sont connus comme sains."""
+        project, config = self.make_project(tmp_path)
+        service = FileService(config)
+        service.scan_local_directory(str(project))
+
+        result = service.scan_secret_findings()
+        assert result['success'] and result['analysed'] == 2  # copy.py et settings.py ont le même contenu
+
+        report = service.get_secret_findings()
+        assert report['files_with_secrets'] == ['copy.py', 'settings.py']
+        assert report['findings'][0] == {'path': 'copy.py', 'line': 2, 'type': 'api_key', 'detector': 'regex'}
+        assert report['by_type'] == {'api_key': 2}
+        assert report['pending_files'] == []
+        main_text, settings_text = (project / 'main.py').read_text(), (project / 'settings.py').read_text()
+        texts = [('main.py', hash_text(main_text)), ('settings.py', hash_text(settings_text))]
+        assert service.known_clean_texts(texts) == {('main.py', hash_text(main_text))}
+        # Un texte sain n'est connu que sous le chemin où il a été analysé
+        assert service.known_clean_texts([('config.yaml', hash_text(main_text))]) == set()
+
+    def test_results_persist_and_changes_are_pending(self, tmp_path):
+        """Un nouveau service réutilise les résultats ; seul le fichier modifié est réanalysé."""
+        project, config = self.make_project(tmp_path)
+        service = FileService(config)
+        service.scan_local_directory(str(project))
+        service.scan_secret_findings()
+
+        (project / 'main.py').write_text('print("modifié")\n')
+        other = FileService(config)
+        other.scan_local_directory(str(project))
+        assert other.get_secret_findings()['pending_files'] == ['main.py']
+        assert other.known_clean_texts([('main.py', hash_text('print("modifié")\n'))]) == set()
+
+        with patch.object(FileService, 'find_secrets', autospec=True, return_value=[]) as spy:
+            result = other.scan_secret_findings()
+        assert result['analysed'] == 1
+        assert [call.args[2] for call in spy.call_args_list] == ['main.py']
+        assert other.get_secret_findings()['pending_files'] == []
+
+    def test_masking_skipped_only_for_analysed_text(self, tmp_path):
+        """Le masquage n'est évité que pour un texte lu identique au texte analysé sans secret."""
+        project, config = self.make_project(tmp_path)
+        service = FileService(config)
+        service.scan_local_directory(str(project))
+        service.scan_secret_findings()
+        clean_text = (project / 'main.py').read_text()
+
+        # Le fichier a changé depuis l'analyse, sans que l'index le sache encore : le texte lu est masqué
+        leaked = 'print("ok")\nAPI_KEY = "abcdef0123456789abcdef"\n'
+        executor = MaskingExecutor(service, workers=1)
+        analysed = []
+        original = service.mask_secrets
+        with patch.object(service, 'mask_secrets',
+                          side_effect=lambda content, path, mode='mask': analysed.append(path) or original(content, path, mode)):
+            results = executor.mask_all([('main.py', clean_text), ('main.py', leaked), ('other.env', clean_text)])
+
+        assert results[0] == (clean_text, 0)
+        assert results[1][1] == 1 and 'abcdef0123456789' not in results[1][0]
+        # Même texte sous un autre nom : les plugins detect-secrets peuvent différer, il est analysé
+        assert results[2] == (clean_text, 0)
+        assert analysed == ['main.py', 'other.env']
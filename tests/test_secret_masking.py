@@ -0,0 +1,100 @@
+import os
+from unittest.mock import patch
+from services.content_hash import hash_text
+from services.file_service import FileService
+from services.secret_scanner import DEFAULT_SCANNER
+from services.secret_masking import MaskingExecutor
+
+
+def make_files(count):
+    files = []
+    for i in range(count):
+        if i % 3 == 0:
+            content = f'API_KEY = "abcdef0123456789abcdef{i:04d}"\nprint({i})'
+        else:
+            content = f'def f{i}():\n    return {i}'
+        files.append((f'src/f{i}.py', content))
+    return files
+
+
+class TestMaskingExecutor:
+    """Tests du masquage des secrets réparti sur plusieurs processus."""
+
+    def setup_method(self):
+        self.service = FileService({'global_excludes_file': os.devnull})
+
+    def test_parallel_same_results_in_order(self):
+        """Les résultats parallèles sont ceux du masquage en série, dans l'ordre des fichiers."""
+        files = make_files(40)
+        executor = MaskingExecutor(self.service, workers=2, batch_size=3, min_parallel_files=0)
+        try:
+            results = executor.mask_all(files, 'mask')
+        finally:
+            executor.shutdown()
+
+        assert results == [self.service.mask_secrets(content, path) for path, content in files]
+        assert results[0] == ('[LINE CONTAINING SENSITIVE DATA: api_key]\nprint(0)', 1)
+        assert results[1] == (files[1][1], 0)
+
+    def test_parallel_results_kept_in_service_cache(self):
+        """Les résultats des processus sont mémorisés dans l'unique cache du FileService, par version des détecteurs."""
+        files = make_files(12)
+        executor = MaskingExecutor(self.service, workers=2, batch_size=3, min_parallel_files=0)
+        try:
+            results = executor.mask_all(files)
+        finally:
+            executor.shutdown()
+
+        for (path, content), result in zip(files, results):
+            assert self.service.get_cached_masking(content, hash_text(content), path, 'mask') == result
+        path, content = files[0]
+        with patch.object(DEFAULT_SCANNER, 'version', 'autre-version'):
+            assert self.service.get_cached_masking(content, hash_text(content), path, 'mask') is None
+
+    def test_small_selection_stays_serial(self):
+        """Sous le seuil, aucun processus n'est démarré."""
+        executor = MaskingExecutor(self.service, workers=4, min_parallel_files=64)
+        results = executor.mask_all(make_files(5))
+        assert executor._pool is None
+        assert [count for _, count in results] == [1, 0, 0, 1, 0]
+
+    def test_batches_bounded_and_consecutive(self):
+        """Les lots respectent la taille maximale et conservent l'ordre des fichiers."""
+        files = make_files(50)
+        executor = MaskingExecutor(self.service, workers=2, batch_size=4)
+        batches = list(executor._batches(files))
+        assert all(len(batch) <= 4 for batch in batches)
+        assert [item for batch in batches for item in batch] == files
+
+    def test_unchanged_files_served_from_cache(self):
+        """Seuls les fichiers modifiés sont de nouveau analysés."""
+        files = make_files(6)
+        executor = MaskingExecutor(self.service, workers=1)
+        first = executor.mask_all(files)
+
+        analysed = []
+        original = self.service.mask_secrets
+        self.service.mask_secrets = lambda content, path, mode='mask': analysed.append(path) or original(content, path, mode)
+        files[3] = (files[3][0], 'token = "abcdefgh12345678"')
+        second = executor.mask_all(files)
+
+        assert analysed == ['src/f3.py']
+        assert second[:3] == first[:3] and second[4:] == first[4:]
+        assert second[3] == ('[LINE CONTAINING SENSITIVE DATA: token]', 1)
+
+    def test_mask_stream_yields_groups_before_last_read(self):
+        """Les fichiers sont masqués par groupes, dès que chaque groupe est lu."""
+        files = make_files(10)
+        executor = MaskingExecutor(self.service, workers=1, batch_size=1, min_parallel_files=4)
+        consumed = []
+
+        def reads():
+            for item in files:
+                consumed.append(item[0])
+                yield item
+
+        stream = executor.mask_stream(reads())
+        first = next(stream)
+        assert len(consumed) == 4  # Premier groupe seulement
+        results = [first] + list(stream)
+        assert results == [(path, *masked) for (path, _), masked in zip(files, executor.mask_all(files))]
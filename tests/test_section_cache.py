@@ -0,0 +1,151 @@
+import os
+import pytest
+from unittest.mock import patch
+from main_desktop import Api
+from services.section_cache import SectionCache, CachedSection
+
+
+def make_section(text: str) -> CachedSection:
+    return CachedSection(text=text, size=len(text), line_count=1, secrets_count=0)
+
+
+class TestSectionCache:
+    """Tests unitaires pour le cache des sections du contexte."""
+
+    def test_get_put(self):
+        """Une section est retrouvée par sa clé complète uniquement."""
+        cache = SectionCache()
+        cache.put(('a.py', 'h1', 'mask'), make_section('A'))
+
+        assert cache.get(('a.py', 'h1', 'mask')).text == 'A'
+        assert cache.get(('a.py', 'h2', 'mask')) is None
+        assert cache.get(('a.py', 'h1', None)) is None
+
+    def test_lru_bounded_by_chars(self):
+        """Les sections les moins récemment utilisées sont oubliées au-delà de max_chars."""
+        cache = SectionCache(max_chars=10)
+        cache.put(('a', 'h', None), make_section('x' * 4))
+        cache.put(('b', 'h', None), make_section('x' * 4))
+        cache.get(('a', 'h', None))
+        cache.put(('c', 'h', None), make_section('x' * 4))
+
+        assert cache.get(('b', 'h', None)) is None
+        assert cache.get(('a', 'h', None)) is not None
+        assert len(cache) == 2
+
+        # Une section plus grande que le cache n'est pas conservée
+        cache.put(('d', 'h', None), make_section('x' * 11))
+        assert cache.get(('d', 'h', None)) is None
+
+
+class TestIncrementalRegeneration:
+    """Régénération du contexte après modification d'un seul fichier."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        root = tmp_path / 'project'
+        root.mkdir()
+        for i in range(5):
+            (root / f'module_{i}.py').write_text(f"def func_{i}():\n    return {i}\n", encoding='utf-8')
+        (root / 'settings.py').write_text("API_KEY = 'sk-1234567890abcdef1234567890abcdef'\n", encoding='utf-8')
+        return root
+
+    @pytest.fixture
+    def api(self, tmp_path):
+        with patch('main_desktop.SERVICE_CONFIGS', {
+            'git_service': {},
+            'llm_service': {},
+            'file_service': {'scan_index_dir': str(tmp_path / 'index'), 'secrets_precompute': False}
+        }), patch('main_desktop.SELECTION_CACHE_PATH', str(tmp_path / 'selections.json')):
+            api = Api()
+            yield api
+            api.masking_executor.shutdown()
+
+    def test_only_changed_files_are_read(self, api, project):
+        api.scan_local_directory(str(project))
+        selection = sorted(f['relative_path'] for f in api.file_cache)
+        first = api.generate_context_from_selection(selection)
+        assert first['success'] is True
+        assert first['stats']['files_with_secrets'] == ['settings.py']
+
+        edited = project / 'module_2.py'
+        edited.write_text("def func_2():\n    return 'modifié'\n", encoding='utf-8')
+        os.utime(edited, (1, 1))  # Signature modifiée même si le mtime est peu précis
+
+        read_batches = []
+        original = api.file_service.iter_file_contents
+
+        def spy(selected_files, *args, **kwargs):
+            read_batches.append(list(selected_files))
+            return original(selected_files, *args, **kwargs)
+
+        with patch.object(api.file_service, 'iter_file_contents', side_effect=spy):
+            second = api.generate_context_from_selection(selection)
+
+        assert read_batches == [['module_2.py']]
+        assert "return 'modifié'" in second['context']
+        assert second['stats']['files_with_secrets'] == ['settings.py']
+        assert second['stats']['total_lines'] == first['stats']['total_lines']
+
+        # Même contexte qu'une génération complète, sans cache
+        api.section_cache.clear()
+        third = api.generate_context_from_selection(selection)
+        assert third['context'] == second['context']
+        assert third['stats']['estimated_tokens'] == second['stats']['estimated_tokens']
+
+    def test_masking_options_are_part_of_the_key(self, api, project):
+        api.scan_local_directory(str(project))
+        selection = ['settings.py']
+        masked = api.generate_context_from_selection(selection)
+        unmasked = api.generate_context_from_selection(selection, masking_options={'enable_masking': False})
+
+        assert 'sk-1234567890abcdef' not in masked['context']
+        assert 'sk-1234567890abcdef' in unmasked['context']
+
+    def test_section_keyed_on_content_read(self, api, project):
+        """Un fichier modifié entre le calcul de son empreinte et sa lecture n'est pas mémorisé sous l'ancienne empreinte."""
+        api.scan_local_directory(str(project))
+        selection = ['module_1.py']
+        edited = project / 'module_1.py'
+        original_text = edited.read_text(encoding='utf-8')
+        original = api.file_service.iter_file_contents
+
+        def edit_then_read(selected_files, *args, **kwargs):
+            edited.write_text("def func_1():\n    return 'pendant la lecture'\n", encoding='utf-8')
+            return original(selected_files, *args, **kwargs)
+
+        with patch.object(api.file_service, 'iter_file_contents', side_effect=edit_then_read):
+            first = api.generate_context_from_selection(selection)
+        assert "pendant la lecture" in first['context']
+
+        # Retour au contenu dont l'empreinte avait été calculée avant la lecture
+        edited.write_text(original_text, encoding='utf-8')
+        os.utime(edited, (1, 1))
+        second = api.generate_context_from_selection(selection)
+        assert "pendant la lecture" not in second['context']
+        assert "return 1" in second['context']
+
+    def test_crlf_and_undecodable_files_are_reused(self, api, project):
+        """Les fichiers CRLF, non UTF-8 ou lus en extrait sont repris du cache à la génération suivante."""
+        (project / 'windows.py').write_bytes(b"def windows():\r\n    return 'crlf'\r\n")
+        # Octet non UTF-8 après l'échantillon de détection des binaires
+        (project / 'latin1.py').write_bytes(b"value = 1\n" * 2000 + b"# caf\xe9\n")
+        (project / 'big.log').write_bytes(b"ligne\r\n" * 20000)
+        api.file_service.large_file_policy.max_file_bytes = 1000
+        api.scan_local_directory(str(project))
+        selection = ['big.log', 'latin1.py', 'windows.py']
+        first = api.generate_context_from_selection(selection)
+        assert "return 'crlf'" in first['context']
+
+        read_batches = []
+        original = api.file_service.iter_file_contents
+
+        def spy(selected_files, *args, **kwargs):
+            read_batches.append(list(selected_files))
+            return original(selected_files, *args, **kwargs)
+
+        with patch.object(api.file_service, 'iter_file_contents', side_effect=spy):
+            second = api.generate_context_from_selection(selection)
+
+        assert read_batches == [[]]
+        assert second['context'] == first['context']
@@ -0,0 +1,157 @@
+import base64
+import random
+import pytest
+from services import tokenizer as tokenizer_module
+from services.tokenizer import (BpeTokenizer, CharEstimator, TiktokenCounter, HAS_TIKTOKEN,
+                                configure_tokenizer, get_tokenizer, load_tiktoken_ranks)
+
+
+SAMPLE_CODE = '''def compute_total(items, tax_rate=0.2):
+    """Retourne le total TTC des articles."""
+    return sum(item.price for item in items) * (1 + tax_rate)
+
+const session = getSessionFromStorage();  // déjà connecté ? 🚀
+'''
+
+
+@pytest.fixture(scope='module')
+def tokenizer():
+    """
+    Tokeniseur sur un petit vocabulaire construit pour les tests : les octets
+    isolés puis les sous-chaînes (2 à 6 octets) des mots de SAMPLE_CODE, par
+    longueur croissante, chacune étant la fusion de deux tokens précédents.
+    """
+    vocab = [bytes([i]) for i in range(256)]
+    substrings = set()
+    for word in SAMPLE_CODE.encode('utf-8').split():
+        for size in range(2, 7):
+            substrings.update(word[i:i + size] for i in range(len(word) - size + 1))
+    vocab += sorted(substrings, key=lambda token: (len(token), token))
+    return BpeTokenizer({token: rank for rank, token in enumerate(vocab)})
+
+
+class TestBpeTokenizer:
+    """Tests unitaires pour le tokeniseur BPE hors ligne."""
+
+    def test_encode_decode_roundtrip(self, tokenizer):
+        """Le décodage restitue le texte d'origine, accents et emojis compris."""
+        tokens = tokenizer.encode(SAMPLE_CODE)
+        assert tokenizer.decode(tokens) == SAMPLE_CODE
+        assert tokenizer.count(SAMPLE_CODE) == len(tokens)
+        # Le vocabulaire fusionne les mots du code
+        assert len(tokens) < len(SAMPLE_CODE) / 2
+
+    def test_heap_merge_matches_linear_merge(self, tokenizer, monkeypatch):
+        """Les mots longs, fusionnés avec un tas, donnent les mêmes tokens que la recherche linéaire."""
+        rng = random.Random(42)
+        tokens = sorted(tokenizer.ranks, key=tokenizer.ranks.get)[:2000]
+        words = [b''.join(rng.choice(tokens) for _ in range(rng.randint(100, 300))) for _ in range(30)]
+        heap_results = [tokenizer._merge_heap(word) for word in words]
+        monkeypatch.setattr(tokenizer_module, '_HEAP_MERGE_MIN_BYTES', 10 ** 9)
+        assert [tokenizer._merge(word) for word in words] == heap_results
+
+    def test_count_tokens_cached_by_content(self, tokenizer, monkeypatch):
+        """Un contenu déjà compté n'est pas de nouveau tokenisé."""
+        counter = BpeTokenizer(tokenizer.ranks, cache_size=2)
+        content = SAMPLE_CODE * 3
+        expected = counter.count_tokens(content)
+
+        calls = []
+        original = counter.count
+        monkeypatch.setattr(counter, 'count', lambda text: calls.append(text) or original(text))
+        assert counter.count_tokens(content) == expected
+        assert calls == []
+
+        # LRU : le plus ancien contenu est oublié au-delà de cache_size
+        counter.count_tokens(content + "a = 1\n")
+        counter.count_tokens(content + "b = 2\n")
+        counter.count_tokens(content)
+        assert len(calls) == 3
+
+    def test_load_tiktoken_format(self, tmp_path):
+        """Un vocabulaire tiktoken minimal (octets isolés et une fusion) est chargé et appliqué."""
+        vocab = [bytes([i]) for i in range(256)] + [b'ab']
+        path = tmp_path / 'mini.tiktoken'
+        path.write_bytes(b''.join(base64.b64encode(token) + b' %d\n' % rank for rank, token in enumerate(vocab)))
+
+        ranks = load_tiktoken_ranks(str(path))
+        assert ranks[b'ab'] == 256
+        assert BpeTokenizer(ranks).encode('abab') == [256, 256]
+
+    def test_incomplete_vocabulary_rejected(self):
+        """Un vocabulaire sans tous les octets isolés ne permet pas d'encoder tout texte."""
+        with pytest.raises(ValueError):
+            BpeTokenizer({b'a': 0})
+
+    def test_known_counts(self, tokenizer):
+        """Comptes connus : fusions du vocabulaire de test, octets isolés hors vocabulaire."""
+        assert tokenizer.count("items") == 1
+        assert tokenizer.count("total(items)") == 3  # total, (items, )
+        assert tokenizer.count("zz") == 2
+        assert tokenizer.count("🚀") == 1
+        assert tokenizer.count("😀") == 3  # Préfixe UTF-8 commun avec 🚀, puis deux octets isolés
+        assert tokenizer.count_parts(["items", "\n", "items"]) == 3
+
+    def test_configure_falls_back_to_estimate(self, tmp_path, monkeypatch):
+        """Sans tiktoken, et sans vocabulaire lisible, les tokens sont estimés."""
+        monkeypatch.setattr(tokenizer_module, '_default_tokenizer', None)
+        monkeypatch.setattr(tokenizer_module, 'HAS_TIKTOKEN', False)
+        assert isinstance(get_tokenizer(), CharEstimator)
+        shared = configure_tokenizer(str(tmp_path / 'absent.tiktoken'))
+        assert get_tokenizer() is shared
+        assert isinstance(shared, CharEstimator)
+
+    def test_tiktoken_preferred_over_estimate(self, tokenizer, tmp_path, monkeypatch):
+        """tiktoken est utilisé par défaut ; un vocabulaire configuré et lisible reste prioritaire."""
+        class FakeEncoding:
+            name = 'cl100k_base'
+
+            def encode_ordinary(self, text):
+                return text.split()
+
+        class FakeTiktoken:
+            requested = []
+
+            @classmethod
+            def get_encoding(cls, name):
+                cls.requested.append(name)
+                return FakeEncoding()
+
+        monkeypatch.setattr(tokenizer_module, 'tiktoken', FakeTiktoken, raising=False)
+        monkeypatch.setattr(tokenizer_module, 'HAS_TIKTOKEN', True)
+        monkeypatch.setattr(tokenizer_module, '_default_tokenizer', None)
+
+        shared = get_tokenizer()
+        assert isinstance(shared, TiktokenCounter) and shared.exact
+        assert FakeTiktoken.requested == ['cl100k_base']
+        assert shared.count_tokens("un deux trois") == 3
+        assert isinstance(configure_tokenizer(str(tmp_path / 'absent.tiktoken'), encoding_name='o200k_base'),
+                          TiktokenCounter)
+        assert FakeTiktoken.requested[-1] == 'o200k_base'
+
+        vocab = tmp_path / 'mini.tiktoken'
+        vocab.write_bytes(b''.join(base64.b64encode(token) + b' %d\n' % rank
+                                   for token, rank in tokenizer.ranks.items()))
+        assert isinstance(configure_tokenizer(str(vocab)), BpeTokenizer)
+
+    @pytest.mark.skipif(not HAS_TIKTOKEN, reason="tiktoken non installé")
+    def test_tiktoken_known_counts(self):
+        """Comptes connus de l'encodage cl100k_base."""
+        try:
+            counter = TiktokenCounter('cl100k_base')
+        except Exception as e:  # Encodage absent du cache de tiktoken, sans réseau
+            pytest.skip(f"Encodage cl100k_base indisponible : {e}")
+        assert counter.count("hello world") == 2
+        assert counter.count("tiktoken is great!") == 6
+
+
+class TestCharEstimator:
+    """Tests unitaires pour l'estimation à 4 caractères par token."""
+
+    def test_counts(self):
+        """4 caractères par token, arrondi au supérieur, y compris sur des morceaux assemblés."""
+        estimator = CharEstimator()
+        assert estimator.count("") == 0
+        assert estimator.count("abcd") == 1
+        assert estimator.count_tokens("abcde") == 2
+        assert estimator.count_parts(["ab", "\n", "cd"]) == 2
@@ -0,0 +1,75 @@
+from services.tree_renderer import render_tree
+
+
+class TestRenderTree:
+    """Tests unitaires pour l'arbre des fichiers commun aux générateurs de contexte."""
+
+    def test_directories_emitted_once(self):
+        """Chaque répertoire apparaît une fois, avant son contenu, les répertoires avant les fichiers."""
+        paths = ['src/utils.py', 'README.md', 'src/core/app.py', 'src/main.py', 'tests/test_main.py', 'src/main.py']
+        assert render_tree(paths, 'Projet') == [
+            "Projet/",
+            "├── src/",
+            "│   ├── core/",
+            "│   │   └── app.py",
+            "│   ├── main.py",
+            "│   └── utils.py",
+            "├── tests/",
+            "│   └── test_main.py",
+            "└── README.md",
+        ]
+
+    def test_collapse_large_directories(self):
+        """Au-delà de max_files_per_dir, les fichiers d'un répertoire sont résumés."""
+        paths = [f'data/file_{i:04d}.csv' for i in range(1500)] + ['main.py']
+        lines = render_tree(paths, 'Projet', max_files_per_dir=2)
+        assert lines == [
+            "Projet/",
+            "├── data/",
+            "│   ├── file_0000.csv",
+            "│   ├── file_0001.csv",
+            "│   └── … 1 498 autres fichiers",
+            "└── main.py",
+        ]
+
+    def test_depth_cap(self):
+        """Les répertoires au-delà de max_depth ne sont pas développés mais indiquent leur nombre de fichiers."""
+        paths = ['a/b/c/one.py', 'a/b/two.py', 'a/three.py', 'top.py']
+        assert render_tree(paths, 'Projet', max_depth=2) == [
+            "Projet/",
+            "├── a/",
+            "│   ├── b/ (… 2 fichiers)",
+            "│   └── three.py",
+            "└── top.py",
+        ]
+
+    def test_singular_counts(self):
+        """Un seul fichier masqué est annoncé au singulier."""
+        assert render_tree(['a/b/one.py', 'a/two.py'], 'Projet', max_depth=1) == [
+            "Projet/",
+            "└── a/ (… 2 fichiers)",
+        ]
+        assert render_tree(['a/b/one.py', 'top.py'], 'Projet', max_depth=1) == [
+            "Projet/",
+            "├── a/ (… 1 fichier)",
+            "└── top.py",
+        ]
+        assert render_tree(['d/x.py', 'd/y.py'], 'Projet', max_files_per_dir=1) == [
+            "Projet/",
+            "└── d/",
+            "    ├── x.py",
+            "    └── … 1 autre fichier",
+        ]
+
+    def test_case_insensitive_order(self):
+        """Tri sans tenir compte de la casse, le nom exact départageant les homonymes."""
+        assert render_tree(['b.py', 'README', 'a.py', 'readme'], 'Projet')[1:] == [
+            "├── a.py",
+            "├── b.py",
+            "├── README",
+            "└── readme",
+        ]
+
+    def test_empty_components_ignored(self):
+        """Les séparateurs en double ou en tête ne créent pas de nœud vide."""
+        assert render_tree(['/src//main.py', ''], 'Projet') == ["Projet/", "└── src/", "    └── main.py"]
@@ -3,9 +3,9 @@ from flask import Flask, request, jsonify, render_template, Response
 from flask_socketio import SocketIO
 import sys
 import os
+import io
 import logging
 from pathlib import Path
-from collections import defaultdict
 import pathspec
 import re
 import configparser
@@ -15,17 +15,14 @@ import concurrent.futures
 import threading
 import uuid
 import time
-import fnmatch
 
 # Import des services pour centraliser la logique
 from services.file_service import FileService
+from services.secret_masking import MaskingExecutor
 from services.context_builder_service import ContextBuilderService
-
-TEXTCHARS = bytearray({7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x100)) - {0x7f})
-
-def is_binary_string(bytes_to_check: bytes) -> bool:
-    """Checks if a byte string appears to contain non-text characters."""
-    return bool(bytes_to_check.translate(None, TEXTCHARS))
+from services.tree_renderer import render_tree
+# Règle de détection partagée avec le scan local
+from services.binary_detection import BinaryClassifier
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 
@@ -45,6 +42,8 @@ LLM_SERVER_MODEL = None
 LLM_SERVER_ENABLED = False
 LLM_SERVER_API_TYPE = "openai" # Default to openai
 LLM_SERVER_STREAM_RESPONSE = False # Nouvelle variable globale
+LLM_CONTEXT_LIMITS = {} # Identifiant du modèle -> {'context_window', 'max_tokens'} de chaque modèle activé
+LLM_DEFAULT_ID = None # Modèle retenu quand aucun n'est choisi (compression "budget")
 
 # --- Configuration du LLM de Résumé ---
 SUMMARIZER_LLM_URL = None
@@ -70,6 +69,8 @@ BINARY_DETECTION_CONFIG = {}
 
 # --- Configuration de l'exclusion de fichiers ---
 FILE_EXCLUSION_CONFIG = {}
+MASKING_CONFIG = {}  # Répartition du masquage des secrets ([FileService])
+CONTEXT_BUILDER_CONFIG = {}  # Tokeniseur BPE ([Tokens]) et arbre des fichiers ([ContextTree])
 
 # --- État partagé pour les tâches de résumé ---
 progress_tasks = {}
@@ -77,7 +78,9 @@ progress_lock = threading.Lock()
 
 # --- Initialisation des services ---
 file_service = None
+masking_executor = None
 context_builder_service = None
+binary_classifier = BinaryClassifier()  # Niveau 3 de la détection binaire des uploads
 
 
 def fetch_ollama_models(url):
@@ -139,8 +142,9 @@ def fetch_openai_models(url, api_key):
 def load_config():
     global INSTRUCTION_TEXT_1, INSTRUCTION_TEXT_2
     global LLM_SERVER_URL, LLM_SERVER_APIKEY, LLM_SERVER_MODEL, LLM_SERVER_ENABLED, LLM_SERVER_API_TYPE, LLM_SERVER_STREAM_RESPONSE
+    global LLM_CONTEXT_LIMITS, LLM_DEFAULT_ID
     global SUMMARIZER_LLM_URL, SUMMARIZER_LLM_APIKEY, SUMMARIZER_LLM_MODEL, SUMMARIZER_LLM_ENABLED, SUMMARIZER_LLM_API_TYPE, SUMMARIZER_LLM_PROMPT, SUMMARIZER_LLM_TIMEOUT, SUMMARIZER_MAX_WORKERS, SUMMARIZER_LLM_MODELS_LIST
-    global LLM_CONFIG, BINARY_DETECTION_CONFIG, FILE_EXCLUSION_CONFIG # Ajouter cette ligne
+    global LLM_CONFIG, BINARY_DETECTION_CONFIG, FILE_EXCLUSION_CONFIG, MASKING_CONFIG, CONTEXT_BUILDER_CONFIG # Ajouter cette ligne
     config = configparser.ConfigParser()
     try:
         if os.path.exists('config.ini'):
@@ -186,12 +190,37 @@ def load_config():
                 FILE_EXCLUSION_CONFIG['file_blacklist'] = set()
                 FILE_EXCLUSION_CONFIG['pattern_blacklist'] = []
 
+            # Charger le tokeniseur (vocabulaire BPE, sinon tiktoken, sinon estimation)
+            if 'Tokens' in config:
+                CONTEXT_BUILDER_CONFIG['tokenizer_vocab'] = config.get('Tokens', 'vocab_path', fallback='') or None
+                CONTEXT_BUILDER_CONFIG['tokenizer_encoding'] = config.get('Tokens', 'encoding', fallback='') or None
+                CONTEXT_BUILDER_CONFIG['token_cache_size'] = config.getint('Tokens', 'cache_size', fallback=4096)
+
+            # Charger les limites de l'arbre des fichiers (0 = illimité)
+            if 'ContextTree' in config:
+                CONTEXT_BUILDER_CONFIG['tree_max_depth'] = config.getint('ContextTree', 'max_depth', fallback=0)
+                CONTEXT_BUILDER_CONFIG['tree_max_files_per_dir'] = config.getint('ContextTree', 'max_files_per_dir', fallback=0)
+
+            # Charger la répartition du masquage des secrets
+            if 'FileService' in config:
+                for key, default in (('masking_workers', 0), ('masking_batch_size', 32), ('masking_min_files', 64)):
+                    MASKING_CONFIG[key] = config.getint('FileService', key, fallback=default)
+
             # Vérifier d'abord les nouvelles sections [LLM:*]
             llm_models_found = False
+            LLM_CONTEXT_LIMITS, LLM_DEFAULT_ID = {}, None
             for section in config.sections():
                 if section.startswith('LLM:'):
                     if config.getboolean(section, 'enabled', fallback=True):
                         llm_models_found = True
+                        # Limites de chaque modèle, pour la compression "budget" du modèle choisi
+                        llm_id = section[4:].strip()
+                        LLM_CONTEXT_LIMITS[llm_id] = {
+                            'context_window': config.getint(section, 'context_window', fallback=None),
+                            'max_tokens': config.getint(section, 'max_tokens', fallback=None)
+                        }
+                        if LLM_DEFAULT_ID is None or config.getboolean(section, 'default', fallback=False):
+                            LLM_DEFAULT_ID = llm_id
                         # Prendre les paramètres du premier modèle activé pour la compatibilité
                         if not LLM_SERVER_ENABLED:
                             LLM_SERVER_URL = config.get(section, 'url', fallback=None)
@@ -201,7 +230,6 @@ def load_config():
                             LLM_SERVER_API_TYPE = config.get(section, 'api_type', fallback='openai').lower()
                             LLM_SERVER_STREAM_RESPONSE = config.getboolean(section, 'stream_response', fallback=False)
                             app.logger.info(f"Modèles LLM détectés. Configuration multi-modèles activée.")
-                        break
             
             # Fallback sur l'ancienne configuration [LLMServer] si aucun modèle trouvé
             if not llm_models_found and 'LLMServer' in config:
@@ -212,6 +240,11 @@ def load_config():
                 LLM_SERVER_API_TYPE = config.get('LLMServer', 'api_type', fallback='openai').lower()
                 LLM_SERVER_STREAM_RESPONSE = config.getboolean('LLMServer', 'stream_response', fallback=False)
                 if LLM_SERVER_ENABLED:
+                    LLM_CONTEXT_LIMITS = {'Default': {
+                        'context_window': config.getint('LLMServer', 'context_window', fallback=None),
+                        'max_tokens': config.getint('LLMServer', 'max_tokens', fallback=None)
+                    }}
+                    LLM_DEFAULT_ID = 'Default'
                     app.logger.info(f"Configuration du serveur LLM chargée (Type: {LLM_SERVER_API_TYPE}, Streaming: {LLM_SERVER_STREAM_RESPONSE}).")
                 else:
                     app.logger.info("Fonctionnalité LLM désactivée dans config.ini.")
@@ -316,7 +349,7 @@ def load_config():
         app.logger.error(f"Erreur lors de la lecture de config.ini: {e}. Utilisation des instructions par défaut.")
     
     # Initialiser les services avec la configuration chargée
-    global file_service, context_builder_service
+    global file_service, context_builder_service, masking_executor
     
     # Configuration pour FileService
     file_service_config = {
@@ -324,12 +357,16 @@ def load_config():
         'binary_blacklist': BINARY_DETECTION_CONFIG.get('blacklist', set()),
         'binary_whitelist': BINARY_DETECTION_CONFIG.get('whitelist', set()),
         'file_blacklist': FILE_EXCLUSION_CONFIG.get('file_blacklist', set()),
-        'pattern_blacklist': FILE_EXCLUSION_CONFIG.get('pattern_blacklist', [])
+        'pattern_blacklist': FILE_EXCLUSION_CONFIG.get('pattern_blacklist', []),
+        **MASKING_CONFIG
     }
     file_service = FileService(file_service_config)
+    if masking_executor is not None:
+        masking_executor.shutdown()
+    masking_executor = MaskingExecutor.from_service(file_service, app.logger)
     
     # Configuration pour ContextBuilderService
-    context_builder_service = ContextBuilderService({})
+    context_builder_service = ContextBuilderService(CONTEXT_BUILDER_CONFIG)
     
     app.logger.info("Services FileService et ContextBuilderService initialisés")
 
@@ -349,30 +386,10 @@ from pathspec.patterns import GitWildMatchPattern  # Explicit import
 # --- Utility functions to build the tree and context ---
 
 def generate_tree_from_paths(relative_paths, root_name):
-    tree = defaultdict(dict)
-    for rel_path in relative_paths:
-        parts = rel_path.split('/')
-        current_level = tree
-        for i, part in enumerate(parts):
-            if not part:
-                continue
-            if i == len(parts) - 1:
-                current_level[part] = True
-            else:
-                if part not in current_level or not isinstance(current_level[part], dict):
-                    current_level[part] = {}
-                current_level = current_level[part]
-    lines = [f"{root_name}/"]
-    def format_level(level, prefix=""):
-        items = sorted(level.keys(), key=lambda k: (not isinstance(level[k], dict), k.lower()))
-        for i, key in enumerate(items):
-            connector = "└── " if i == len(items)-1 else "├── "
-            lines.append(prefix + connector + key)
-            if isinstance(level[key], dict) and level[key]:
-                new_prefix = prefix + ("    " if i == len(items)-1 else "│   ")
-                format_level(level[key], new_prefix)
-    format_level(tree)
-    return "\n".join(lines)
+    """Arbre des fichiers uploadés (voir services.tree_renderer.render_tree)."""
+    return "\n".join(render_tree(relative_paths, root_name,
+                                 CONTEXT_BUILDER_CONFIG.get('tree_max_depth', 0),
+                                 CONTEXT_BUILDER_CONFIG.get('tree_max_files_per_dir', 0)))
 
 def detect_language(filename):
     ext = Path(filename).suffix.lower()
@@ -394,12 +411,98 @@ def detect_language(filename):
 
 # Les fonctions estimate_tokens et get_model_compatibility sont maintenant dans ContextBuilderService
 
+def get_context_limits(llm_id=None):
+    """
+    Fenêtre de contexte et longueur de réponse d'un modèle (voir LlmApiService.get_context_limits).
+    
+    Args:
+        llm_id: Identifiant du modèle [LLM:*] (défaut ou inconnu : modèle par défaut)
+        
+    Returns:
+        Dict contenant llm_id, context_window et max_tokens (None si non configurés)
+    """
+    target_llm_id = llm_id if llm_id in LLM_CONTEXT_LIMITS else LLM_DEFAULT_ID
+    limits = LLM_CONTEXT_LIMITS.get(target_llm_id, {})
+    return {
+        'llm_id': target_llm_id,
+        'context_window': limits.get('context_window'),
+        'max_tokens': limits.get('max_tokens')
+    }
+
+# Tokens de l'en-tête fixe du contexte uploadé (voir write_uploaded_context)
+_UPLOADED_HEADER_TOKENS = 256
+
+
+def pack_uploaded_files(uploaded_files, root_name, instructions, token_budget):
+    """
+    Ajuste une sélection de fichiers uploadés à un budget de tokens (voir ContextBuilderService.plan_packing).
+    
+    Returns:
+        (fichiers retenus, avec leur contenu complet, compacté ou réduit à leurs
+        signatures ; plan d'inclusion sans les contenus)
+    """
+    paths = [f["path"] for f in uploaded_files]
+    overhead_tokens = (_UPLOADED_HEADER_TOKENS
+                       + context_builder_service.count_tokens(generate_tree_from_paths(paths, root_name))
+                       + context_builder_service.count_tokens(instructions or ""))
+    plan = context_builder_service.plan_packing(uploaded_files, max(0, token_budget - overhead_tokens))
+    packed = [{"path": f["path"], "content": f["content"]} for f in plan["files"] if f["mode"] != "omitted"]
+    for f in plan["files"]:
+        del f["content"]
+    plan["token_budget"] = token_budget
+    plan["overhead_tokens"] = overhead_tokens
+    plan["fits"] = plan["used_tokens"] + overhead_tokens <= token_budget
+    return packed, plan
+
+
+def mask_uploaded_files(uploaded_files, mask_mode="mask"):
+    """
+    Masque les secrets des fichiers uploadés, par groupes bornés (voir MaskingExecutor.mask_stream).
+    
+    Returns:
+        (copies des fichiers au contenu masqué ; nombre de secrets masqués par chemin)
+    """
+    contents = ((f["path"], f["content"]) for f in uploaded_files)
+    masked_files = []
+    secrets_by_path = {}
+    for relative_path, redacted_content, secrets_count in masking_executor.mask_stream(contents, mask_mode):
+        masked_files.append({"path": relative_path, "content": redacted_content})
+        if secrets_count > 0:
+            secrets_by_path[relative_path] = secrets_count
+    return masked_files, secrets_by_path
+
+
 def build_uploaded_context_string(uploaded_files, root_name="Uploaded_Directory", enable_masking=True, mask_mode="mask", instructions=None):
+    """Construit le contexte des fichiers uploadés en une chaîne (voir write_uploaded_context)."""
+    output = io.StringIO()
+    summary = write_uploaded_context(output, uploaded_files, root_name, enable_masking, mask_mode, instructions)
+    return output.getvalue(), summary
+
+
+def write_uploaded_context(sink, uploaded_files, root_name="Uploaded_Directory", enable_masking=True, mask_mode="mask", instructions=None):
+    """
+    Écrit le contexte des fichiers uploadés section par section dans sink (objet avec write).
+    
+    Le contexte n'est jamais assemblé en mémoire : chaque section est écrite
+    dès qu'elle est prête, les nombres de caractères et de tokens étant
+    comptés au passage.
+    
+    Returns:
+        Le résumé (statistiques, secrets masqués, plus gros fichiers)
+    """
+    char_count = 0
+    token_count = 0
+    
+    def write(text):
+        nonlocal char_count, token_count
+        sink.write(text)
+        char_count += len(text)
+        token_count += context_builder_service.count_tokens(text)
+    
     # Generate the tree from relative paths
     relative_paths = [f["path"] for f in uploaded_files]
     tree_string = generate_tree_from_paths(relative_paths, root_name)
     
-    context_parts = []
     # Standard header
     header = (
         "--- START CONTEXT ---\n"
@@ -412,57 +515,50 @@ def build_uploaded_context_string(uploaded_files, root_name="Uploaded_Directory"
         f"Total files included: {len(uploaded_files)}\n"
         "--- END HEADER ---\n\n"
     )
-    context_parts.append(header)
-    context_parts.append("--- START DIRECTORY TREE ---\n" + tree_string + "\n--- END DIRECTORY TREE ---\n\n")
+    write(header)
+    write("--- START DIRECTORY TREE ---\n")
+    write(tree_string)
+    write("\n--- END DIRECTORY TREE ---\n\n")
+    del tree_string
     
     # For each file, add the formatted content
     total_secrets_masked = 0
     files_with_secrets_list = []
     
-    for file_obj in sorted(uploaded_files, key=lambda f: f["path"]):
-        relative_path = file_obj["path"]
-        header_file = f"--- START FILE: {relative_path} ---\n"
-        footer_file = f"--- END FILE: {relative_path} ---\n\n"
+    sorted_files = sorted(uploaded_files, key=lambda f: f["path"])
+    contents = ((f["path"], f["content"].rstrip()) for f in sorted_files)
+    if enable_masking:
+        # Détection et masquage des secrets par groupes bornés, répartis sur plusieurs processus
+        # si la sélection est grande : chaque groupe est écrit avant que le suivant soit préparé
+        masked = masking_executor.mask_stream(contents, mask_mode)
+    else:
+        masked = ((relative_path, content, 0) for relative_path, content in contents)
+    
+    for relative_path, redacted_content, current_file_secrets_masked in masked:
         lang = detect_language(relative_path)
         
-        content = file_obj["content"].rstrip()
-        
-        redacted_content = content
-        secrets_count_ds = 0
-        secrets_count_regex = 0
-        
-        if enable_masking:
-            # Utiliser FileService pour la détection et le masquage des secrets
-            redacted_content, secrets_count_ds = file_service.detect_and_redact_secrets(content, relative_path, mask_mode)
-            # Apply regex on potentially already redacted content if first pass found something.
-            # Or on original if first pass found nothing.
-            final_redacted_content, secrets_count_regex = file_service.detect_and_redact_with_regex(redacted_content, relative_path)
-            if secrets_count_regex > 0 : # if regex found new things
-                 redacted_content = final_redacted_content
-
-        current_file_secrets_masked = secrets_count_ds + secrets_count_regex
         if current_file_secrets_masked > 0:
             app.logger.info(f"Masked {current_file_secrets_masked} secrets in {relative_path}")
             if relative_path not in files_with_secrets_list:
                  files_with_secrets_list.append(relative_path)
             total_secrets_masked += current_file_secrets_masked
         
-        content_to_use = redacted_content
-        
+        # Sections écrites séparément : le contenu n'est pas recopié dans une chaîne intermédiaire
+        write(f"--- START FILE: {relative_path} ---\n")
         if lang:
-            formatted_content = f"```{lang}\n{content_to_use}\n```\n"
+            write(f"```{lang}\n")
+            write(redacted_content)
+            write("\n```\n")
         else:
-            formatted_content = content_to_use + "\n"
-        context_parts.append(header_file + formatted_content + footer_file)
+            write(redacted_content)
+            write("\n")
+        write(f"--- END FILE: {relative_path} ---\n\n")
     
     if instructions:
-        instructions_part = "\n--- INSTRUCTIONS ---\n" + instructions + "\n--- END INSTRUCTIONS ---\n"
-        context_parts.append(instructions_part)
-    
-    full_context = "".join(context_parts)
+        write("\n--- INSTRUCTIONS ---\n" + instructions + "\n--- END INSTRUCTIONS ---\n")
     
     # Utiliser ContextBuilderService pour l'estimation des tokens
-    token_stats = context_builder_service.estimate_tokens(full_context)
+    token_stats = context_builder_service.token_stats(char_count, token_count)
     char_count_val = token_stats['char_count']
     estimated_tokens_val = token_stats['estimated_tokens']
     model_compatibility_val = token_stats['model_compatibility']
@@ -487,7 +583,7 @@ def build_uploaded_context_string(uploaded_files, root_name="Uploaded_Directory"
         "largest_files": largest_files  # NOUVELLE DONNÉE
     }
     
-    return full_context, summary
+    return summary
 
 
 # --- Application routes ---
@@ -508,6 +604,8 @@ def index():
                            summarizer_llm_enabled=SUMMARIZER_LLM_ENABLED,
                            summarizer_llm_models_list=SUMMARIZER_LLM_MODELS_LIST, # Add this
                            summarizer_max_workers=SUMMARIZER_MAX_WORKERS,     # Add this
+                           budget_llm_models=[llm_id for llm_id, limits in LLM_CONTEXT_LIMITS.items() if limits['context_window']],
+                           default_llm_id=LLM_DEFAULT_ID,
                            has_md_files=analysis_cache.get('has_md_files', False))
 
 @app.route('/toolbox')
@@ -548,53 +646,36 @@ def upload_directory():
     # Temporairement stocker le contenu binaire pour l'analyse
     temp_file_contents = {f['path']: f['content'] for f in uploaded_files}
     
+    # Moteur d'exclusion compilé partagé avec le scan local
+    exclusion_rules = file_service.exclusion_rules
+    accepted = []  # Verdict de chaque fichier, dans l'ordre de l'upload (None = analyse de contenu)
+    samples = []   # Échantillons des fichiers à analyser, dans l'ordre
     for file_obj in uploaded_files:
         file_path_str = file_obj['path']
-        ext = os.path.splitext(file_path_str)[1].lower()
         filename = os.path.basename(file_path_str)
         
-        # Vérifier d'abord les exclusions de fichiers spécifiques
-        if filename in FILE_EXCLUSION_CONFIG.get('file_blacklist', set()):
-            binary_files_detected.append(file_path_str)
-            app.logger.debug(f"Fichier exclu (blacklist): {filename}")
-            continue
-        
-        # Vérifier les patterns d'exclusion
-        excluded_by_pattern = False
-        for pattern in FILE_EXCLUSION_CONFIG.get('pattern_blacklist', []):
-            if fnmatch.fnmatch(filename, pattern):
-                binary_files_detected.append(file_path_str)
-                app.logger.debug(f"Fichier exclu (pattern '{pattern}'): {filename}")
-                excluded_by_pattern = True
-                break
-        
-        if excluded_by_pattern:
-            continue
-
-        # Niveau 1: Liste Noire d'extensions (Rejet Immédiat)
-        if ext in BINARY_DETECTION_CONFIG.get('blacklist', set()):
-            binary_files_detected.append(file_path_str)
-            continue
-
-        # Niveau 2: Liste Blanche d'extensions (Acceptation Immédiate)
-        if ext in BINARY_DETECTION_CONFIG.get('whitelist', set()):
+        # Niveaux 1 et 2 : nom ou motif exclu, extension binaire (rejet) ou texte (acceptation)
+        verdict, rule = exclusion_rules.decide(filename)
+        if verdict is False:
+            app.logger.debug(f"Fichier exclu ({rule}): {filename}")
+        elif verdict is None:
+            # Niveau 3 : seuls les premiers caractères du contenu (déjà en mémoire) sont analysés
+            try:
+                samples.append(file_obj['content'][:1024].encode('latin-1', errors='ignore'))
+            except Exception as e:
+                app.logger.warning(f"Could not perform binary check on {file_path_str}, excluding it. Error: {e}")
+                verdict = False
+        accepted.append(verdict)
+    
+    # Niveau 3 : échantillons classés en un seul lot (règle de is_binary_string)
+    content_verdicts = iter(binary_classifier.classify(samples, rule='textchars'))
+    for file_obj, verdict in zip(uploaded_files, accepted):
+        if verdict is None:
+            verdict = not next(content_verdicts)
+        if verdict:
             filtered_by_binary_detection.append(file_obj)
-            continue
-            
-        # Niveau 3: Analyse de contenu pour les cas restants
-        try:
-            # Pour la détection, nous n'avons besoin que des premiers octets.
-            # Le contenu est déjà en mémoire, donc nous l'utilisons directement.
-            # Note: le contenu est une chaîne, nous devons l'encoder pour la vérification.
-            file_content_str = file_obj['content']
-            # On ne vérifie que le début pour la performance, même si tout est en mémoire.
-            if is_binary_string(file_content_str[:1024].encode('latin-1', errors='ignore')):
-                binary_files_detected.append(file_path_str)
-            else:
-                filtered_by_binary_detection.append(file_obj)
-        except Exception as e:
-            app.logger.warning(f"Could not perform binary check on {file_path_str}, excluding it. Error: {e}")
-            binary_files_detected.append(file_path_str)
+        else:
+            binary_files_detected.append(file_obj['path'])
 
     app.logger.info(f"Binary detection complete. Excluded {len(binary_files_detected)} files.")
     uploaded_files = filtered_by_binary_detection # Remplacer la liste par la version filtrée
@@ -774,6 +855,34 @@ def generate_context():
             if file_obj['content']:
                 file_obj['content'] = context_builder_service.compact_code(file_obj['content'])
     
+    elif compression_mode == "budget":
+        limits = get_context_limits(data.get("llm_id"))
+        if not limits['context_window']:
+            return jsonify({"success": False, "error": f"No context_window configured for the LLM model {limits['llm_id']}."}), 400
+        token_budget = context_builder_service.token_budget(limits['context_window'], limits['max_tokens'])
+        app.logger.info(f"Applying 'Fit to model' compression (model: {limits['llm_id']}, budget: {token_budget} tokens).")
+        # Masquage avant l'ajustement : le plan mesure le texte réellement envoyé
+        secrets_by_path = {}
+        if enable_masking:
+            context_files, secrets_by_path = mask_uploaded_files(context_files, mask_mode)
+        context_files, packing = pack_uploaded_files(context_files, "Uploaded_Directory", instructions, token_budget)
+        markdown_context, summary = build_uploaded_context_string(
+            uploaded_files=context_files,
+            root_name="Uploaded_Directory",
+            enable_masking=False,
+            instructions=instructions
+        )
+        packed_paths = {f["path"] for f in context_files}
+        files_with_secrets = sorted(path for path in secrets_by_path if path in packed_paths)
+        summary["secrets_masked"] = sum(secrets_by_path[path] for path in files_with_secrets)
+        summary["files_with_secrets"] = files_with_secrets
+        summary["packing"] = packing
+        return jsonify({
+            "success": True,
+            "markdown": markdown_context,
+            "summary": summary
+        })
+    
     elif compression_mode == "summarize":
         app.logger.info("Applying 'Summarize with AI' compression.")
         